@@ -0,0 +1,51 @@
+"""perf: add indexes for chat history pagination and chat room listing
+
+Revision ID: 3c9e5a7d1f42
+Revises: 671093311f12
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e5a7d1f42'
+down_revision: Union[str, None] = '671093311f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Indexes are built concurrently to avoid locking the tables against writes in production. CREATE INDEX CONCURRENTLY
+# cannot run inside a transaction, hence the autocommit blocks.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_chat_history_room_uuid_sent_at_id',
+            'chat_history',
+            ['room_uuid', 'sent_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_chat_rooms_user_id',
+            'chat_rooms',
+            ['user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_chat_rooms_user_id',
+            table_name='chat_rooms',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_chat_history_room_uuid_sent_at_id',
+            table_name='chat_history',
+            postgresql_concurrently=True,
+        )
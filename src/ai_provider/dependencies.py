@@ -0,0 +1,68 @@
+from typing import Annotated
+
+from fastapi import Depends, Security
+
+from src.shared.service.base import BaseAiService
+
+from src.auth.dependencies import AuthDependency
+from src.redis.dependencies import RedisServiceDependency
+from src.s3.dependencies import S3ServiceDependency
+
+from .registry import api_provider_registry
+
+
+async def get_ai_service(
+    provider: str,
+    s3_service: S3ServiceDependency,
+    redis_service: RedisServiceDependency,
+) -> BaseAiService:
+    """
+    Create the service of the API provider the request is sent to.
+
+    Args:
+        provider (str): The lowercase name of the API provider.
+        s3_service (S3ServiceDependency): The S3 service dependency.
+        redis_service (RedisServiceDependency): The Redis service dependency.
+
+    Raises:
+        HTTPException: Raised with status code 404 if the API provider is not registered.
+
+    Returns:
+        BaseAiService: The service of the API provider.
+    """
+
+    service_class = api_provider_registry.get_service_class(provider)
+    return service_class(s3_service, redis_service)
+
+
+async def get_api_key(
+    provider: str,
+    auth: AuthDependency,
+    redis_service: RedisServiceDependency,
+) -> str:
+    """
+    Retrieve the user's API key for the API provider the request is sent to.
+
+    Args:
+        provider (str): The lowercase name of the API provider.
+        auth (AuthDependency): The authentication dependency.
+        redis_service (RedisServiceDependency): The Redis service dependency.
+
+    Raises:
+        HTTPException: Raised with status code 404 if the API provider is not registered or the user does not have
+            any API keys stored in Redis.
+
+    Returns:
+        str: The decrypted API key if found.
+    """
+
+    definition = api_provider_registry.get_definition(provider)
+
+    return await redis_service.get_user_specific_api_key_from_cache(
+        auth.uuid, definition.lowercase_name
+    )
+
+
+AiServiceDependency = Annotated[BaseAiService, Depends(get_ai_service)]
+
+AiApiKeyDependency = Annotated[str, Security(get_api_key)]
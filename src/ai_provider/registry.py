@@ -0,0 +1,171 @@
+import importlib
+
+from dataclasses import dataclass
+
+from fastapi import HTTPException, status
+
+from src.shared.service.base import BaseAiService
+
+
+@dataclass(frozen=True)
+class ApiProviderDefinition:
+    """
+    The definition of an API provider the chat can be used with.
+
+    Args:
+        name (str): The display name of the API provider.
+        lowercase_name (str): The lowercase name of the API provider used in the URLs and as the API key's name.
+        ai_models (tuple[str, ...]): The names of the AI models the API provider supports.
+        service_path (str): The import path of the provider's `BaseAiService` implementation in the
+            "module:ClassName" format.
+    """
+
+    name: str
+    lowercase_name: str
+    ai_models: tuple[str, ...]
+    service_path: str
+
+
+class ApiProviderRegistry:
+    """
+    A registry of the API providers keyed by their lowercase name.
+
+    The providers' services are imported on first use only, so a worker never imports the SDK of a provider that it
+    does not serve requests for.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the registry.
+
+        Returns:
+            None
+        """
+
+        self._definitions: dict[str, ApiProviderDefinition] = {}
+        self._service_classes: dict[str, type[BaseAiService]] = {}
+
+    @property
+    def definitions(self) -> list[ApiProviderDefinition]:
+        """
+        The definitions of all registered API providers.
+
+        Returns:
+            list[ApiProviderDefinition]: The definitions.
+        """
+
+        return list(self._definitions.values())
+
+    def register(self, definition: ApiProviderDefinition) -> None:
+        """
+        Register an API provider.
+
+        Args:
+            definition (ApiProviderDefinition): The definition of the API provider.
+
+        Raises:
+            ValueError: Raised if an API provider with the same lowercase name is already registered.
+
+        Returns:
+            None
+        """
+
+        if definition.lowercase_name in self._definitions:
+            raise ValueError(
+                f'API provider "{definition.lowercase_name}" is already registered.'
+            )
+
+        self._definitions[definition.lowercase_name] = definition
+
+    def get_definition(self, provider_name: str) -> ApiProviderDefinition:
+        """
+        Get the definition of a registered API provider.
+
+        Args:
+            provider_name (str): The lowercase name of the API provider.
+
+        Raises:
+            HTTPException: Raised with status code 404 if the API provider is not registered.
+
+        Returns:
+            ApiProviderDefinition: The definition of the API provider.
+        """
+
+        definition = self._definitions.get(provider_name)
+
+        if definition is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="API provider not found.",
+            )
+
+        return definition
+
+    def get_service_class(self, provider_name: str) -> type[BaseAiService]:
+        """
+        Get the service class of a registered API provider, importing it on first use.
+
+        Args:
+            provider_name (str): The lowercase name of the API provider.
+
+        Raises:
+            HTTPException: Raised with status code 404 if the API provider is not registered.
+
+        Returns:
+            type[BaseAiService]: The service class of the API provider.
+        """
+
+        service_class = self._service_classes.get(provider_name)
+
+        if service_class is None:
+            definition = self.get_definition(provider_name)
+            module_path, class_name = definition.service_path.split(":")
+            service_class = getattr(
+                importlib.import_module(module_path), class_name
+            )
+            self._service_classes[provider_name] = service_class
+
+        return service_class
+
+    async def close(self) -> None:
+        """
+        Close the clients of the API providers whose services have been loaded.
+
+        Returns:
+            None
+        """
+
+        for service_class in self._service_classes.values():
+            await service_class.close_clients()
+
+
+api_provider_registry = ApiProviderRegistry()
+
+api_provider_registry.register(
+    ApiProviderDefinition(
+        name="OpenAI",
+        lowercase_name="openai",
+        ai_models=(
+            "gpt-4",
+            "gpt-4-turbo",
+            "gpt-4o",
+            "gpt-4o-mini",
+            "gpt-3.5-turbo",
+        ),
+        service_path="src.openai.service:OpenAiService",
+    )
+)
+
+api_provider_registry.register(
+    ApiProviderDefinition(
+        name="Gemini",
+        lowercase_name="gemini",
+        ai_models=(
+            "gemini-1.5-flash",
+            "gemini-1.5-flash-8b",
+            "gemini-1.5-pro",
+            "gemini-1.0-pro",
+        ),
+        service_path="src.gemini.service:GeminiService",
+    )
+)
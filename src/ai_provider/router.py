@@ -0,0 +1,70 @@
+from fastapi import APIRouter, UploadFile
+from fastapi.responses import StreamingResponse
+
+from src.shared.schemas import (
+    ChatHistoryCompletionRequest,
+    ChatHistoryCompletionResponse,
+    ChatHistoryUploadImageResponse,
+)
+
+from src.auth.dependencies import AuthDependency
+from src.chat_room.dependencies import ChatRoomServiceDependency
+from src.chat_history.dependencies import ChatHistoryServiceDependency
+from .dependencies import AiServiceDependency, AiApiKeyDependency
+
+
+router = APIRouter(tags=["ai-provider"])
+
+
+@router.post(
+    "/{provider}/upload-image", response_model=ChatHistoryUploadImageResponse
+)
+async def upload_image(
+    auth: AuthDependency,
+    ai_service: AiServiceDependency,
+    image: UploadFile,
+):
+    """
+    Upload image to S3 and return the URL to use it in the chat message.
+    """
+
+    return await ai_service.upload_image(image)
+
+
+@router.post("/{provider}/chat", response_model=ChatHistoryCompletionResponse)
+async def chat(
+    auth: AuthDependency,
+    api_key: AiApiKeyDependency,
+    ai_service: AiServiceDependency,
+    chat_room_service: ChatRoomServiceDependency,
+    chat_history_service: ChatHistoryServiceDependency,
+    payload: ChatHistoryCompletionRequest,
+):
+    """
+    Send message to the API provider's model and get response from it.
+    """
+
+    return await ai_service.chat(
+        auth.user_id,
+        api_key,
+        chat_room_service,
+        chat_history_service,
+        payload,
+    )
+
+
+@router.post("/{provider}/chat/stream", response_class=StreamingResponse)
+async def chat_stream(
+    auth: AuthDependency,
+    api_key: AiApiKeyDependency,
+    ai_service: AiServiceDependency,
+    chat_room_service: ChatRoomServiceDependency,
+    payload: ChatHistoryCompletionRequest,
+):
+    """
+    Send message to the API provider's model and stream its response as server-sent events.
+    """
+
+    return await ai_service.chat_stream(
+        auth.user_id, api_key, chat_room_service, payload
+    )
@@ -1,14 +1,18 @@
 from fastapi import APIRouter
 
+from src.core.config import settings
+
 from src.auth.router import router as auth_router
 from src.user.router import router as user_router
 from src.api_provider.router import router as api_providers_router
 from src.api_key.router import router as api_key_router
 from src.chat_room.router import router as chat_room_router
 from src.chat_history.router import router as chat_history_router
+from src.s3.router import router as s3_router
+
+from src.ai_provider.router import router as ai_provider_router
 
-from src.openai.router import router as openai_router
-from src.gemini.router import router as gemini_router
+from src.metrics.router import router as metrics_router
 
 
 api_router = APIRouter(prefix="/api")
@@ -19,5 +23,10 @@ api_router.include_router(api_providers_router)
 api_router.include_router(api_key_router)
 api_router.include_router(chat_room_router)
 api_router.include_router(chat_history_router)
-api_router.include_router(openai_router)
-api_router.include_router(gemini_router)
+api_router.include_router(s3_router)
+
+if settings.METRICS_ENABLED:
+    api_router.include_router(metrics_router)
+
+# The provider routes match any first path segment, so they are included last.
+api_router.include_router(ai_provider_router)
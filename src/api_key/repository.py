@@ -1,7 +1,8 @@
 from typing import Sequence
 
 from sqlalchemy import select, insert, update, delete, or_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Depends
 
@@ -17,12 +18,12 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
     Repository for api key database related operations.
     """
 
-    def __init__(self, db: Session = Depends(get_db)) -> None:
+    def __init__(self, db: AsyncSession = Depends(get_db)) -> None:
         """
         Initialize the repository with a database session.
 
         Args:
-            db (Session): Database session.
+            db (AsyncSession): Database session.
 
         Returns:
             None
@@ -30,7 +31,7 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
 
         super().__init__(db, ApiKey)
 
-    def create_bulk(self, api_keys: list[dict]) -> None:
+    async def create_bulk(self, api_keys: list[dict]) -> None:
         """
         Create multiple API keys in the database.
 
@@ -41,10 +42,10 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
             None
         """
 
-        self.db.execute(insert(self.model), api_keys)
-        self.db.commit()
+        await self.db.execute(insert(self.model), api_keys)
+        await self.db.commit()
 
-    def get_all_by_user_id(self, user_id: int) -> Sequence[ApiKey]:
+    async def get_all_by_user_id(self, user_id: int) -> Sequence[ApiKey]:
         """
         Get all user's API keys by user ID.
 
@@ -55,13 +56,15 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
             Sequence[ApiKey]: A sequence of API key objects containing the key, API provider name and lowercase name.
         """
 
-        return self.db.scalars(
-            select(self.model)
-            .options(joinedload(self.model.api_provider))
-            .where(self.model.user_id == user_id)
+        return (
+            await self.db.scalars(
+                select(self.model)
+                .options(joinedload(self.model.api_provider))
+                .where(self.model.user_id == user_id)
+            )
         ).all()
 
-    def update_bulk(self, api_keys: list[dict]) -> None:
+    async def update_bulk(self, api_keys: list[dict]) -> None:
         """
         Update multiple API keys in the database.
 
@@ -72,10 +75,10 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
             None
         """
 
-        self.db.execute(update(self.model), api_keys)
-        self.db.commit()
+        await self.db.execute(update(self.model), api_keys)
+        await self.db.commit()
 
-    def delete_selected_by_user_id(
+    async def delete_selected_by_user_id(
         self, user_id: int, api_keys: list[dict]
     ) -> None:
         """
@@ -97,10 +100,10 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
             .where(or_(*conditions))
         )
 
-        self.db.execute(stmt)
-        self.db.commit()
+        await self.db.execute(stmt)
+        await self.db.commit()
 
-    def delete_all_by_user_id(self, user_id: int) -> None:
+    async def delete_all_by_user_id(self, user_id: int) -> None:
         """
         Delete all user's API keys by user ID.
 
@@ -111,5 +114,7 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
             None
         """
 
-        self.db.execute(delete(self.model).where(self.model.user_id == user_id))
-        self.db.commit()
+        await self.db.execute(
+            delete(self.model).where(self.model.user_id == user_id)
+        )
+        await self.db.commit()
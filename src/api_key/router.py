@@ -28,11 +28,13 @@ async def get_api_keys(
     Verify the user's passphrase and retrieve all user's API keys from the database based on the user's ID.
     """
 
-    fernet_key = auth_service.get_fernet_key(
-        auth.user_id, payload.passphrase.get_secret_value()
+    fernet_key = await auth_service.get_fernet_key(
+        auth.user_id, auth.uuid, payload.passphrase.get_secret_value()
     )
 
-    user_api_keys = api_key_service.get_user_api_keys(auth.user_id, fernet_key)
+    user_api_keys = await api_key_service.get_user_api_keys(
+        auth.user_id, fernet_key
+    )
 
     await redis_service.set_user_api_keys_in_cache(auth.uuid, user_api_keys)
 
@@ -52,18 +54,18 @@ async def update_api_keys(
     Update the user's API keys in the database based on the user's ID.
     """
 
-    fernet_key = auth_service.get_fernet_key(
-        auth.user_id, payload.passphrase.get_secret_value()
+    fernet_key = await auth_service.get_fernet_key(
+        auth.user_id, auth.uuid, payload.passphrase.get_secret_value()
     )
 
-    db_all_api_providers = api_provider_service.get_all()
+    db_all_api_providers = await api_provider_service.get_all()
 
-    updated_user_api_keys = api_key_service.update_user_api_keys(
+    updated_user_api_keys = await api_key_service.update_user_api_keys(
         auth.user_id, fernet_key, db_all_api_providers, payload
     )
 
     if updated_user_api_keys.is_updated:
-        user_api_keys = api_key_service.get_user_api_keys(
+        user_api_keys = await api_key_service.get_user_api_keys(
             auth.user_id, fernet_key
         )
         await redis_service.set_user_api_keys_in_cache(auth.uuid, user_api_keys)
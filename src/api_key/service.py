@@ -36,7 +36,7 @@ class ApiKeyService(BaseService[ApiKeyRepository]):
 
         super().__init__(repository)
 
-    def get_user_api_keys(
+    async def get_user_api_keys(
         self, user_id: int, fernet_key: Fernet
     ) -> ApiKeysResponse:
         """
@@ -52,7 +52,7 @@ class ApiKeyService(BaseService[ApiKeyRepository]):
             ApiKeysResponse: The API keys response containing the user's API keys.
         """
 
-        api_keys = self.repository.get_all_by_user_id(user_id)
+        api_keys = await self.repository.get_all_by_user_id(user_id)
 
         if api_keys:
             api_keys = [
@@ -70,7 +70,7 @@ class ApiKeyService(BaseService[ApiKeyRepository]):
 
         return ApiKeysResponse(api_keys=api_keys)
 
-    def _set_api_key_operation(
+    async def _set_api_key_operation(
         self,
         user_id: int,
         fernet_key: Fernet,
@@ -90,7 +90,7 @@ class ApiKeyService(BaseService[ApiKeyRepository]):
             tuple[list[dict], list[dict], list[dict]]: A tuple containing the API keys to create, update and delete.
         """
 
-        db_api_keys = self.get_user_api_keys(user_id, fernet_key)
+        db_api_keys = await self.get_user_api_keys(user_id, fernet_key)
 
         api_keys_to_create: list[dict] = []
         api_keys_to_update: list[dict] = []
@@ -149,7 +149,7 @@ class ApiKeyService(BaseService[ApiKeyRepository]):
 
         return api_keys_to_create, api_keys_to_update, api_keys_to_delete
 
-    def update_user_api_keys(
+    async def update_user_api_keys(
         self,
         user_id: int,
         fernet_key: Fernet,
@@ -170,18 +170,18 @@ class ApiKeyService(BaseService[ApiKeyRepository]):
         """
 
         api_keys_to_create, api_keys_to_update, api_keys_to_delete = (
-            self._set_api_key_operation(
+            await self._set_api_key_operation(
                 user_id, fernet_key, db_all_api_providers, payload
             )
         )
 
         if api_keys_to_create or api_keys_to_update or api_keys_to_delete:
             if api_keys_to_create:
-                self.repository.create_bulk(api_keys_to_create)
+                await self.repository.create_bulk(api_keys_to_create)
             if api_keys_to_update:
-                self.repository.update_bulk(api_keys_to_update)
+                await self.repository.update_bulk(api_keys_to_update)
             if api_keys_to_delete:
-                self.repository.delete_selected_by_user_id(
+                await self.repository.delete_selected_by_user_id(
                     user_id, api_keys_to_delete
                 )
 
@@ -195,7 +195,7 @@ class ApiKeyService(BaseService[ApiKeyRepository]):
                 is_updated=False,
             )
 
-    def delete_user_api_keys(self, user_id: int) -> None:
+    async def delete_user_api_keys(self, user_id: int) -> None:
         """
         Delete all API keys associated with the user by their ID.
 
@@ -206,4 +206,4 @@ class ApiKeyService(BaseService[ApiKeyRepository]):
             None
         """
 
-        self.repository.delete_all_by_user_id(user_id)
+        await self.repository.delete_all_by_user_id(user_id)
@@ -1,7 +1,8 @@
 from typing import Sequence
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm import load_only
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Depends
 
@@ -17,12 +18,12 @@ class ApiProviderRepository(BaseRepository[ApiProvider]):
     Repository for api provider database related operations.
     """
 
-    def __init__(self, db: Session = Depends(get_db)) -> None:
+    def __init__(self, db: AsyncSession = Depends(get_db)) -> None:
         """
         Initialize the repository with a database session.
 
         Args:
-            db (Session): Database session.
+            db (AsyncSession): Database session.
 
         Returns:
             None
@@ -30,7 +31,7 @@ class ApiProviderRepository(BaseRepository[ApiProvider]):
 
         super().__init__(db, ApiProvider)
 
-    def get_all(self) -> Sequence[ApiProvider]:
+    async def get_all(self) -> Sequence[ApiProvider]:
         """
         Get all API providers.
 
@@ -38,8 +39,12 @@ class ApiProviderRepository(BaseRepository[ApiProvider]):
             Sequence[ApiProvider]: A sequence of API provider objects containing the name of the provider.
         """
 
-        return self.db.scalars(
-            select(self.model).options(
-                load_only(self.model.id, self.model.name, self.model.ai_models)
+        return (
+            await self.db.scalars(
+                select(self.model).options(
+                    load_only(
+                        self.model.id, self.model.name, self.model.ai_models
+                    )
+                )
             )
         ).all()
@@ -18,7 +18,7 @@ async def get_api_providers_names(
     Get all API providers names and their IDs.
     """
 
-    return api_provider_service.get_all()
+    return await api_provider_service.get_all()
 
 
 @router.get("/{api_provider_id}", response_model=ApiProviderResponse)
@@ -29,4 +29,4 @@ async def get_api_provider_by_id(
     Get full information about an API provider by its ID.
     """
 
-    return api_provider_service.get_one_by_id(api_provider_id)
+    return await api_provider_service.get_one_by_id(api_provider_id)
@@ -28,7 +28,7 @@ class ApiProviderService(BaseService[ApiProviderRepository]):
 
         super().__init__(repository)
 
-    def get_all(self) -> ApiProvidersResponse:
+    async def get_all(self) -> ApiProvidersResponse:
         """
         Get all API providers.
 
@@ -39,6 +39,6 @@ class ApiProviderService(BaseService[ApiProviderRepository]):
             ApiProvidersResponse: A list of all available API providers.
         """
 
-        api_providers = self.repository.get_all()
+        api_providers = await self.repository.get_all()
 
         return ApiProvidersResponse(api_providers=api_providers)
@@ -23,7 +23,7 @@ async def login_user(
     Login user and return access token.
     """
 
-    return auth_service.get_authenticated(payload)
+    return await auth_service.get_authenticated(payload)
 
 
 @router.post("/register", response_model=AuthRegisterResponse)
@@ -35,4 +35,4 @@ async def register_user(
     Register user and return message containing instructions for email verification.
     """
 
-    return auth_service.create(payload)
+    return await auth_service.create(payload)
@@ -1,4 +1,4 @@
-from typing import Annotated, Self
+from typing import Annotated
 
 from pydantic import (
     BaseModel,
@@ -7,11 +7,8 @@ from pydantic import (
     Field,
     ValidationInfo,
     field_validator,
-    model_validator,
 )
 
-from src.shared.utils.hash import hash_util
-
 
 class AuthCurrentUser(BaseModel):
     user_id: int
@@ -21,7 +18,7 @@ class AuthCurrentUser(BaseModel):
 class AuthRegisterRequest(BaseModel):
     email: EmailStr
     name: Annotated[str, Field(min_length=1, max_length=50)]
-    password: Annotated[SecretStr | str, Field(min_length=8)]
+    password: Annotated[SecretStr, Field(min_length=8)]
     password_2: Annotated[
         SecretStr, Field(min_length=8, validation_alias="password2")
     ]
@@ -39,11 +36,6 @@ class AuthRegisterRequest(BaseModel):
             raise ValueError("Passwords do not match")
         return value
 
-    @model_validator(mode="after")
-    def hash_password(self) -> Self:
-        self.password = hash_util.create_hash(self.password.get_secret_value())
-        return self
-
 
 class AuthLoginResponse(BaseModel):
     access_token: str
@@ -7,16 +7,16 @@ from cryptography.fernet import Fernet
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 
-from jose import jwt, JWTError
-
 from src.shared.utils.hash import hash_util
 from src.shared.utils.passphrase import passphrase_util
 from src.shared.service.base import BaseService
 
 from src.user.repository import UserRepository
+from src.redis.dependencies import RedisServiceDependency
 
 from src.core.config import settings
 
+from .token import jwt_util, token_cache
 from .schemas import (
     AuthCurrentUser,
     AuthRegisterRequest,
@@ -33,12 +33,15 @@ class AuthService(BaseService[UserRepository]):
     _oauth2_bearer = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
     def __init__(
-        self, repository: UserRepository = Depends(UserRepository)
+        self,
+        redis_service: RedisServiceDependency,
+        repository: UserRepository = Depends(UserRepository),
     ) -> None:
         """
         Initializes the service with the repository.
 
         Args:
+            redis_service (RedisService): The service to use for caching keys derived from passphrases.
             repository (UserRepository): The repository to use for user operations.
 
         Returns:
@@ -46,6 +49,7 @@ class AuthService(BaseService[UserRepository]):
         """
 
         super().__init__(repository)
+        self.redis_service = redis_service
 
     @staticmethod
     def _create_access_token(user_id: int) -> str:
@@ -65,9 +69,7 @@ class AuthService(BaseService[UserRepository]):
         )
         encode.update({"exp": expires})
 
-        return jwt.encode(
-            encode, settings.JWT_AUTH_SECRET_KEY, settings.ALGORITHM
-        )
+        return jwt_util.encode(encode)
 
     @staticmethod
     async def get_current_user(
@@ -75,6 +77,7 @@ class AuthService(BaseService[UserRepository]):
     ) -> AuthCurrentUser:
         """
         Retrieves the current user from the token.
+        Tokens that were already validated are served from the cache until they expire.
 
         Args:
             token (str): The user's token.
@@ -86,26 +89,32 @@ class AuthService(BaseService[UserRepository]):
             HTTPException: Raised with a 401 status code if the user cannot be authenticated or the token has expired.
         """
 
-        try:
-            payload = jwt.decode(
-                token, settings.JWT_AUTH_SECRET_KEY, settings.ALGORITHM
-            )
-            user_id: str = payload.get("sub")
-            redis_uuid: str = payload.get("uuid")
-
-            if user_id is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Could not authenticate user.",
-                )
-            return AuthCurrentUser(user_id=int(user_id), uuid=redis_uuid)
-        except JWTError:
+        current_user = token_cache.get(token)
+
+        if current_user:
+            return current_user
+
+        payload = jwt_util.decode(token)
+        user_id: str = payload.get("sub")
+        redis_uuid: str = payload.get("uuid")
+
+        if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Your session has expired. Please log in again.",
+                detail="Could not authenticate user.",
             )
 
-    def create(self, payload: AuthRegisterRequest) -> AuthRegisterResponse:
+        current_user = AuthCurrentUser(user_id=int(user_id), uuid=redis_uuid)
+
+        # Tokens without an expiry are never cached, so they are always verified again.
+        if payload.get("exp") is not None:
+            token_cache.set(token, current_user, payload["exp"])
+
+        return current_user
+
+    async def create(
+        self, payload: AuthRegisterRequest
+    ) -> AuthRegisterResponse:
         """
         Creates a user.
 
@@ -117,15 +126,26 @@ class AuthService(BaseService[UserRepository]):
                 Message can be customized, but defaults to the one in the schema.
         """
 
-        user = self.repository.get_one_with_selected_attributes_by_condition(
-            ["id"], "email", payload.email
+        # The password is hashed before checking the email, so the response time does not reveal existing accounts.
+        hashed_password = await hash_util.create_hash_async(
+            payload.password.get_secret_value()
+        )
+        user = (
+            await self.repository.get_one_with_selected_attributes_by_condition(
+                ["id"], "email", payload.email
+            )
         )
 
         if not user:
-            self.repository.create(payload.model_dump(exclude={"password_2"}))
+            await self.repository.create(
+                {
+                    **payload.model_dump(exclude={"password", "password_2"}),
+                    "password": hashed_password,
+                }
+            )
         return AuthRegisterResponse()
 
-    def get_authenticated(
+    async def get_authenticated(
         self, payload: OAuth2PasswordRequestForm
     ) -> AuthLoginResponse:
         """
@@ -141,11 +161,13 @@ class AuthService(BaseService[UserRepository]):
             AuthLoginResponse: The access token and token type.
         """
 
-        user = self.repository.get_one_with_selected_attributes_by_condition(
-            ["id", "password"], "email", payload.username
+        user = (
+            await self.repository.get_one_with_selected_attributes_by_condition(
+                ["id", "password"], "email", payload.username
+            )
         )
 
-        if not user or not hash_util.verify_hash(
+        if not user or not await hash_util.verify_hash_async(
             payload.password, user.password
         ):
             raise HTTPException(
@@ -156,33 +178,53 @@ class AuthService(BaseService[UserRepository]):
         token = self._create_access_token(user.id)
         return AuthLoginResponse(access_token=token, token_type="bearer")
 
-    def get_fernet_key(self, user_id: int, passphrase: str) -> Fernet:
+    async def get_fernet_key(
+        self, user_id: int, user_uuid: str, passphrase: str
+    ) -> Fernet:
         """
         Verify the user's passphrase and generate a Fernet key.
+        The generated key is cached for the user's session, so unlocking the API keys again with the same passphrase
+        skips both the verification and the key derivation.
 
         Args:
             user_id (int): The user's ID.
+            user_uuid (str): The user's UUID.
             passphrase (str): The user's passphrase.
 
         Raises:
             HTTPException: Raised with a 400 status code if the passphrase is incorrect.
+            HTTPException: Raised with a 503 status code if too many passphrases are being verified or keys derived.
 
         Returns:
             Fernet: The Fernet key.
         """
 
-        user = self.repository.get_one_with_selected_attributes_by_condition(
-            ["passphrase", "passphrase_salt"], "id", user_id
+        user = (
+            await self.repository.get_one_with_selected_attributes_by_condition(
+                ["passphrase", "passphrase_salt"], "id", user_id
+            )
+        )
+
+        derived_key = await self.redis_service.get_user_derived_key_from_cache(
+            user_uuid, passphrase, user.passphrase_salt
         )
 
-        if not hash_util.verify_hash(passphrase, user.passphrase):
+        if derived_key:
+            return Fernet(derived_key)
+
+        if not await hash_util.verify_hash_async(passphrase, user.passphrase):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Please check your passphrase and try again.",
             )
 
-        fernet_key = passphrase_util.generate_fernet_key(
+        derived_key = await passphrase_util.derive_key_async(
             passphrase.encode(),
             passphrase_util.convert_hex_to_bytes(user.passphrase_salt),
         )
-        return fernet_key
+
+        await self.redis_service.set_user_derived_key_in_cache(
+            user_uuid, passphrase, user.passphrase_salt, derived_key
+        )
+
+        return Fernet(derived_key)
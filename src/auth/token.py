@@ -0,0 +1,182 @@
+import time
+import hashlib
+import importlib
+
+from typing import Any, Literal
+
+from cachetools import LRUCache
+
+from fastapi import HTTPException, status
+
+from src.core.config import settings
+
+from .schemas import AuthCurrentUser
+
+
+type JwtBackend = Literal["jose", "pyjwt"]
+
+
+class JwtUtil:
+    """
+    A utility class for encoding and decoding JSON Web Tokens with a configurable backend.
+
+    The "jose" backend (python-jose) is the default. The "pyjwt" backend is faster at decoding, but PyJWT is an
+    optional dependency, so it is only imported when selected.
+    """
+
+    def __init__(self, backend: JwtBackend, secret_key: str, algorithm: str):
+        """
+        Initializes the utility class with the backend and the signing parameters.
+
+        Args:
+            backend (JwtBackend): The name of the JWT library to use.
+            secret_key (str): The secret key used to sign the tokens.
+            algorithm (str): The algorithm used to sign the tokens.
+
+        Raises:
+            RuntimeError: Raised if the "pyjwt" backend is selected, but PyJWT is not installed.
+
+        Returns:
+            None
+        """
+
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+        if backend == "pyjwt":
+            try:
+                self._jwt = importlib.import_module("jwt")
+            except ImportError as e:
+                raise RuntimeError(
+                    'The "pyjwt" JWT backend requires the PyJWT package to be installed.'
+                ) from e
+            self._jwt_error = self._jwt.PyJWTError
+        else:
+            self._jwt = importlib.import_module("jose.jwt")
+            self._jwt_error = importlib.import_module("jose").JWTError
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        """
+        Encodes and signs the claims.
+
+        Args:
+            claims (dict[str, Any]): The claims of the token.
+
+        Returns:
+            str: The token.
+        """
+
+        return self._jwt.encode(claims, self.secret_key, self.algorithm)
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """
+        Verifies the token's signature and expiry and decodes its claims.
+
+        Args:
+            token (str): The token.
+
+        Raises:
+            HTTPException: Raised with a 401 status code if the token is invalid or has expired.
+
+        Returns:
+            dict[str, Any]: The claims of the token.
+        """
+
+        try:
+            return self._jwt.decode(
+                token, self.secret_key, algorithms=[self.algorithm]
+            )
+        except self._jwt_error:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Your session has expired. Please log in again.",
+            )
+
+
+class TokenCache:
+    """
+    A bounded, LRU-evicted cache of already validated tokens and the users they belong to.
+
+    Only tokens that passed the signature verification are cached, and each one is cached no longer than until its
+    expiry, so a cache hit is as good as decoding the token again.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): The maximum number of cached tokens.
+
+        Returns:
+            None
+        """
+
+        self._tokens: LRUCache[str, tuple[AuthCurrentUser, float]] = LRUCache(
+            maxsize=maxsize
+        )
+
+    @staticmethod
+    def _get_cache_key(token: str) -> str:
+        """
+        Creates a cache key from a token, so the raw token is not used as a dictionary key.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            str: The cache key.
+        """
+
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> AuthCurrentUser | None:
+        """
+        Get the user of a cached token that has not expired yet.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            AuthCurrentUser | None: The user or None if the token is not cached or has expired.
+        """
+
+        cache_key = self._get_cache_key(token)
+        cached = self._tokens.get(cache_key)
+
+        if cached is None:
+            return None
+
+        current_user, expires_at = cached
+
+        if expires_at <= time.time():
+            self._tokens.pop(cache_key, None)
+            return None
+
+        return current_user
+
+    def set(
+        self, token: str, current_user: AuthCurrentUser, expires_at: float
+    ) -> None:
+        """
+        Cache the user of a validated token until the token expires.
+
+        Args:
+            token (str): The token.
+            current_user (AuthCurrentUser): The user the token belongs to.
+            expires_at (float): The token's expiry as a UNIX timestamp.
+
+        Returns:
+            None
+        """
+
+        self._tokens[self._get_cache_key(token)] = (current_user, expires_at)
+
+
+jwt_util = JwtUtil(
+    backend=settings.JWT_BACKEND,
+    secret_key=settings.JWT_AUTH_SECRET_KEY,
+    algorithm=settings.ALGORITHM,
+)
+
+token_cache = TokenCache(maxsize=settings.JWT_CACHE_SIZE)
@@ -2,7 +2,7 @@ import uuid
 import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, DateTime, func
+from sqlalchemy import ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -15,6 +15,11 @@ from src.shared.enums import RoleEnum, AiModelEnum
 
 class ChatHistory(Base):
     __tablename__ = "chat_history"
+    __table_args__ = (
+        Index(
+            "ix_chat_history_room_uuid_sent_at_id", "room_uuid", "sent_at", "id"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     room_uuid: Mapped[uuid.UUID] = mapped_column(
@@ -1,8 +1,9 @@
+import datetime
 from uuid import UUID
 from typing import Sequence
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Depends
 
@@ -10,6 +11,8 @@ from src.core.database import get_db
 
 from src.shared.repository.base import BaseRepository
 
+from src.chat_room.models import ChatRoom
+
 from .models import ChatHistory
 
 
@@ -18,12 +21,12 @@ class ChatHistoryRepository(BaseRepository[ChatHistory]):
     Repository for chat history database related operations.
     """
 
-    def __init__(self, db: Session = Depends(get_db)) -> None:
+    def __init__(self, db: AsyncSession = Depends(get_db)) -> None:
         """
         Initialize the repository with a database session.
 
         Args:
-            db (Session): Database session.
+            db (AsyncSession): Database session.
 
         Returns:
             None
@@ -31,19 +34,58 @@ class ChatHistoryRepository(BaseRepository[ChatHistory]):
 
         super().__init__(db, ChatHistory)
 
-    def get_chat_history_by_room_uuid(
-        self, room_uuid: UUID
+    async def create_bulk_with_chat_rooms(
+        self, chat_rooms: list[dict], chat_histories: list[dict]
+    ) -> None:
+        """
+        Create new chat rooms and multiple chat history records in a single transaction.
+
+        Args:
+            chat_rooms (list[dict]): A list of chat room dictionaries to create before the chat history, can be empty.
+            chat_histories (list[dict]): A list of chat history dictionaries.
+
+        Returns:
+            None
+        """
+
+        if chat_rooms:
+            await self.db.execute(insert(ChatRoom), chat_rooms)
+
+        await self.db.execute(insert(self.model), chat_histories)
+        await self.db.commit()
+
+    async def get_chat_history_page_by_room_uuid(
+        self,
+        room_uuid: UUID,
+        limit: int,
+        before: tuple[datetime.datetime, int] | None = None,
     ) -> Sequence[ChatHistory]:
         """
-        Get the chat history based on the room's UUID.
+        Get a page of the chat history based on the room's UUID, ordered from the newest to the oldest message.
+
+        Messages are paginated by the (sent_at, id) keyset, so every page is fetched with an index range scan
+        instead of an offset.
 
         Args:
             room_uuid (UUID): The UUID of the room to get the chat history from.
+            limit (int): The maximum number of messages to get.
+            before (tuple[datetime.datetime, int] | None): The (sent_at, id) of the oldest message on the previous
+                page. Only messages older than it are returned. Defaults to None, which means the newest messages.
 
         Returns:
             Sequence[ChatHistory]: A sequence of chat history objects.
         """
 
-        return self.db.scalars(
-            select(self.model).where(self.model.room_uuid == room_uuid)
-        ).all()
+        stmt = (
+            select(self.model)
+            .where(self.model.room_uuid == room_uuid)
+            .order_by(self.model.sent_at.desc(), self.model.id.desc())
+            .limit(limit)
+        )
+
+        if before:
+            stmt = stmt.where(
+                tuple_(self.model.sent_at, self.model.id) < tuple_(*before)
+            )
+
+        return (await self.db.scalars(stmt)).all()
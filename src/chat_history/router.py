@@ -1,6 +1,9 @@
 from uuid import UUID
+from typing import Annotated
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+
+from src.core.config import settings
 
 from src.auth.dependencies import AuthDependency
 from src.chat_room.dependencies import ChatRoomServiceDependency
@@ -18,11 +21,16 @@ async def get_chat_history(
     auth: AuthDependency,
     chat_room_service: ChatRoomServiceDependency,
     chat_history_service: ChatHistoryServiceDependency,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.CHAT_HISTORY_MAX_PAGE_SIZE)
+    ] = settings.CHAT_HISTORY_PAGE_SIZE,
+    cursor: str | None = None,
 ):
     """
-    Get the chat history of a specified chat room associated with the user.
+    Get a page of the chat history of a specified chat room associated with the user.
+    The first page contains the newest messages, pass the returned 'nextCursor' to get the older ones.
     """
 
-    return chat_history_service.get_user_chat_history(
-        auth.user_id, room_uuid, chat_room_service
+    return await chat_history_service.get_user_chat_history(
+        auth.user_id, room_uuid, chat_room_service, limit, cursor
     )
@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import Annotated
 
-from pydantic import BaseModel, Field, PastDatetime, field_serializer
+from pydantic import BaseModel, Field, PastDatetime
 
 from src.shared.enums import RoleEnum, AiModelEnum
 
@@ -35,12 +35,6 @@ class ChatHistoryResponse(BaseModel):
         str, Field(serialization_alias="customInstructions")
     ]
     messages: list[ChatHistoryMessage]
-
-    @field_serializer("messages")
-    def serialize_messages_ascending(self, messages: list[ChatHistoryMessage]):
-        """
-        Sort the messages by 'sent_at' date in ascending order.
-        """
-
-        messages.sort(key=lambda messages: messages.sent_at)
-        return messages
+    next_cursor: Annotated[
+        str | None, Field(serialization_alias="nextCursor", default=None)
+    ]
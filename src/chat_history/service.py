@@ -1,14 +1,20 @@
+import datetime
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
+
+from src.core.config import settings
 
 from src.shared.service.base import BaseService
 from src.shared.enums import RoleEnum
+from src.shared.utils.cursor import cursor_util
 from src.shared.schemas import ChatHistoryCompletionRequest
 
 from src.chat_room.dependencies import ChatRoomServiceDependency
+from src.chat_room.schemas import ChatRoomInDb
 
 from .repository import ChatHistoryRepository
+from .writer import chat_history_writer
 from .schemas import (
     ChatHistoryMessage,
     ChatHistoryResponse,
@@ -36,45 +42,82 @@ class ChatHistoryService(BaseService[ChatHistoryRepository]):
 
         super().__init__(repository)
 
-    def create(self, payload: ChatHistoryInDb) -> None:
-        """
-        Create a new chat history record in the database.
-
-        Args:
-            payload (ChatHistoryInDb): The payload containing the chat history data.
-
-        Returns:
-            None
-        """
-
-        self.repository.create(payload.model_dump())
-
-    def get_user_chat_history(
+    async def get_user_chat_history(
         self,
         user_id: int,
         room_uuid: UUID,
         chat_room_service: ChatRoomServiceDependency,
+        limit: int,
+        cursor: str | None = None,
     ) -> ChatHistoryResponse:
         """
-        Get a user's chat history for a specific chat room.
+        Get a page of a user's chat history for a specific chat room.
+
+        Pages go from the newest to the oldest messages, while the messages within a page are in ascending order.
+        The AI model and custom instructions are taken from the newest message on the page.
 
         Args:
             user_id (int): The ID of the user.
             room_uuid (UUID): The UUID of the chat room.
             chat_room_service (ChatRoomServiceDependency): The chat room service dependency.
+            limit (int): The maximum number of messages on the page.
+            cursor (str | None): The cursor returned with the previous page. Defaults to None.
+
+        Raises:
+            HTTPException: Raised with status code 404 if there are no messages on the page.
 
         Returns:
-            ChatHistoryResponse: The chat history response object.
+            ChatHistoryResponse: The chat history response object with the cursor to the next page if there is one.
         """
 
-        chat_room_service.verify_chat_room_exists(user_id, room_uuid)
+        await chat_room_service.verify_chat_room_exists(user_id, room_uuid)
+
+        # The user's own chat turns that are still queued are written first, so they are always on the page.
+        if settings.CHAT_HISTORY_WRITE_BEHIND:
+            await chat_history_writer.wait_for_chat_room(room_uuid)
 
-        chat_histories = self.repository.get_chat_history_by_room_uuid(
-            room_uuid
+        before = None
+
+        if cursor:
+            sent_at, chat_history_id = cursor_util.decode_cursor(cursor, 2)
+
+            try:
+                before = (
+                    datetime.datetime.fromisoformat(sent_at),
+                    int(chat_history_id),
+                )
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor.",
+                )
+
+        # Fetch one extra message to find out whether there is another page without a separate count query.
+        chat_histories = list(
+            await self.repository.get_chat_history_page_by_room_uuid(
+                room_uuid, limit + 1, before
+            )
         )
 
-        ai_model = chat_histories[-1].ai_model
-        custom_instructions = chat_histories[-1].custom_instructions
+        if not chat_histories:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Chat history not found.",
+            )
+
+        next_cursor = None
+
+        if len(chat_histories) > limit:
+            chat_histories = chat_histories[:limit]
+            next_cursor = cursor_util.encode_cursor(
+                [
+                    chat_histories[-1].sent_at.isoformat(),
+                    str(chat_histories[-1].id),
+                ]
+            )
+
+        ai_model = chat_histories[0].ai_model
+        custom_instructions = chat_histories[0].custom_instructions
         messages = [
             ChatHistoryMessage(
                 message=chat_history.message,
@@ -87,7 +130,7 @@ class ChatHistoryService(BaseService[ChatHistoryRepository]):
                 ),
                 sent_at=chat_history.sent_at,
             )
-            for chat_history in chat_histories
+            for chat_history in reversed(chat_histories)
         ]
 
         return ChatHistoryResponse(
@@ -95,19 +138,25 @@ class ChatHistoryService(BaseService[ChatHistoryRepository]):
             ai_model=ai_model,
             custom_instructions=custom_instructions,
             messages=messages,
+            next_cursor=next_cursor,
         )
 
-    def store_chat_history(
+    async def store_chat_history(
         self,
         assistant_message: str,
         payload: ChatHistoryCompletionRequest,
+        chat_room: ChatRoomInDb | None = None,
     ) -> None:
         """
         Store the chat history for both the user and the assistant.
+        The chat room, if it is a new one, and both messages are written in a single transaction.
+        In write-behind mode they are queued instead and written in the background.
 
         Args:
             assistant_message (str): The message from the assistant.
             payload (ChatHistoryCompletionRequest): The payload containing the chat history data.
+            chat_room (ChatRoomInDb | None): The new chat room to create along with the chat history. Defaults to
+                None, which means the chat room already exists.
 
         Returns:
             None
@@ -135,5 +184,15 @@ class ChatHistoryService(BaseService[ChatHistoryRepository]):
             RoleEnum.assistant, assistant_message
         )
 
-        self.create(user_chat_history)
-        self.create(assistant_chat_history)
+        if settings.CHAT_HISTORY_WRITE_BEHIND:
+            return await chat_history_writer.enqueue(
+                chat_room, [user_chat_history, assistant_chat_history]
+            )
+
+        await self.repository.create_bulk_with_chat_rooms(
+            [chat_room.model_dump()] if chat_room else [],
+            [
+                user_chat_history.model_dump(),
+                assistant_chat_history.model_dump(),
+            ],
+        )
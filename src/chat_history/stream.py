@@ -0,0 +1,136 @@
+import logging
+
+from typing import AsyncGenerator
+
+from pydantic import BaseModel
+
+from fastapi import HTTPException
+
+from src.core.database import SessionLocal
+from src.shared.schemas import (
+    ChatHistoryCompletionChunk,
+    ChatHistoryCompletionRequest,
+    ChatHistoryCompletionResponse,
+    ChatHistoryCompletionStreamError,
+)
+
+from src.chat_room.repository import ChatRoomRepository
+from src.chat_room.service import ChatRoomService
+
+from .repository import ChatHistoryRepository
+from .service import ChatHistoryService
+
+
+logger = logging.getLogger(__name__)
+
+
+def format_sse_event(data: BaseModel, event: str | None = None) -> str:
+    """
+    Format a payload as a server-sent event.
+
+    Args:
+        data (BaseModel): The payload of the event.
+        event (str | None): The name of the event. Unnamed events are received as "message" events by the client.
+
+    Returns:
+        str: The formatted server-sent event.
+    """
+
+    formatted_event = f"event: {event}\n" if event else ""
+    return f"{formatted_event}data: {data.model_dump_json(by_alias=True)}\n\n"
+
+
+async def stream_chat_completion(
+    user_id: int,
+    chunks: AsyncGenerator[str, None],
+    payload: ChatHistoryCompletionRequest,
+) -> AsyncGenerator[str, None]:
+    """
+    Forward the chunks of an AI model's response as server-sent events and store the chat history once the stream
+    ends.
+
+    Request-scoped database sessions are already closed when the response is being streamed, so the chat history is
+    stored using a session owned by the generator.
+
+    Each chunk is sent as a "message" event. The stream is closed with a "done" event containing the full response
+    or with an "error" event if the API provider fails in the middle of the stream or the chat history cannot be
+    stored. Nothing is stored if the API provider fails.
+
+    The chunks are closed when the stream ends for any reason, including the client disconnecting, so the API
+    provider's stream does not outlive the response.
+
+    Args:
+        user_id (int): The user's ID.
+        chunks (AsyncGenerator[str, None]): The text chunks of the AI model's response.
+        payload (ChatHistoryCompletionRequest): The request payload.
+
+    Yields:
+        str: The formatted server-sent events.
+    """
+
+    message_parts: list[str] = []
+
+    try:
+        try:
+            async for chunk in chunks:
+                message_parts.append(chunk)
+                yield format_sse_event(
+                    ChatHistoryCompletionChunk(message=chunk)
+                )
+        except HTTPException as e:
+            yield format_sse_event(
+                ChatHistoryCompletionStreamError(detail=e.detail), "error"
+            )
+            return
+        except Exception as e:
+            logger.error(f"Streaming chat completion failed. Error: {str(e)}")
+            yield format_sse_event(
+                ChatHistoryCompletionStreamError(
+                    detail="Something went wrong while streaming the response."
+                ),
+                "error",
+            )
+            return
+
+        assistant_message = "".join(message_parts)
+
+        try:
+            async with SessionLocal() as db:
+                chat_room_service = ChatRoomService(ChatRoomRepository(db))
+                chat_history_service = ChatHistoryService(
+                    ChatHistoryRepository(db)
+                )
+
+                payload, chat_room = await chat_room_service.handle_room_uuid(
+                    user_id, payload
+                )
+                await chat_history_service.store_chat_history(
+                    assistant_message, payload, chat_room
+                )
+        except HTTPException as e:
+            yield format_sse_event(
+                ChatHistoryCompletionStreamError(detail=e.detail), "error"
+            )
+            return
+        except Exception as e:
+            logger.error(
+                f"Storing streamed chat completion failed. Error: {str(e)}"
+            )
+            yield format_sse_event(
+                ChatHistoryCompletionStreamError(
+                    detail="Something went wrong while saving the response."
+                ),
+                "error",
+            )
+            return
+
+        yield format_sse_event(
+            ChatHistoryCompletionResponse(
+                message=assistant_message,
+                room_uuid=payload.room_uuid,
+                api_provider_id=payload.api_provider_id,
+            ),
+            "done",
+        )
+    finally:
+        await chunks.aclose()
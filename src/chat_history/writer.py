@@ -0,0 +1,391 @@
+import asyncio
+import logging
+
+from uuid import UUID
+
+from sqlalchemy.exc import (
+    DBAPIError,
+    InterfaceError,
+    OperationalError,
+    TimeoutError as PoolTimeoutError,
+)
+
+from src.core.config import settings
+from src.core.database import SessionLocal
+
+from src.chat_room.schemas import ChatRoomInDb
+
+from .repository import ChatHistoryRepository
+from .schemas import ChatHistoryInDb
+
+
+logger = logging.getLogger(__name__)
+
+
+type ChatTurn = tuple[ChatRoomInDb | None, list[ChatHistoryInDb]]
+
+
+class ChatHistoryWriter:
+    """
+    Write-behind queue for chat history persistence.
+
+    Chat turns are put on an in-process queue and a background worker writes them to the database in batches,
+    so the chat endpoints do not have to wait for the commit. The queue is drained on shutdown, for at most the
+    shutdown timeout, so an unavailable database cannot keep the process from stopping. The chat turns that are not
+    written by then are logged.
+
+    Chat turns are acknowledged to the clients before they are written, so while the process is running they are never
+    dropped because of a transient database error. Such writes are retried with an exponential backoff, which makes
+    the queue fill up and the chat endpoints wait if the database stays unavailable. If a batch fails for any other reason, it is split and
+    written again, so only the chat turns that can never be written (e.g. of a chat room deleted in the meantime)
+    are dropped.
+
+    The queue is kept in the memory of the worker process that received the chat turns. Until they are written,
+    only that process treats their new chat rooms as existing, while other workers respond as if the chat rooms do
+    not exist yet.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_queue_size: int,
+        retry_max_delay: float,
+        shutdown_timeout: float,
+        retry_base_delay: float = 0.5,
+    ) -> None:
+        """
+        Initializes the writer.
+
+        Args:
+            batch_size (int): The maximum number of chat turns written in a single transaction.
+            flush_interval (float): The maximum time in seconds a chat turn waits in the queue for a batch to fill up.
+            max_queue_size (int): The maximum number of queued chat turns. Enqueuing waits when the queue is full.
+            retry_max_delay (float): The maximum time in seconds to wait before retrying a failed write.
+            shutdown_timeout (float): The maximum time in seconds to spend writing the queued chat turns on shutdown.
+            retry_base_delay (float): The time in seconds to wait before the first retry of a failed write. The delay
+                doubles with every next retry. Defaults to 0.5.
+
+        Returns:
+            None
+        """
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_max_delay = retry_max_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.retry_base_delay = retry_base_delay
+        self._queue: asyncio.Queue[ChatTurn | None] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self._pending_chat_rooms: dict[UUID, int] = {}
+        self._pending_turns: dict[UUID, int] = {}
+        self._written = asyncio.Condition()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Start the background worker.
+
+        Returns:
+            None
+        """
+
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background worker after writing every queued chat turn.
+
+        If the chat turns are not written within the shutdown timeout (e.g. because the database is unavailable), the
+        worker is cancelled and the chat turns that were not written are logged.
+
+        Returns:
+            None
+        """
+
+        if self._task is None:
+            return
+
+        try:
+            async with asyncio.timeout(self.shutdown_timeout):
+                await self._queue.put(None)
+                await self._task
+
+                remaining: list[ChatTurn] = []
+
+                while not self._queue.empty():
+                    chat_turn = self._queue.get_nowait()
+
+                    if chat_turn is not None:
+                        remaining.append(chat_turn)
+
+                if remaining:
+                    await self._flush(remaining)
+        except TimeoutError:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            logger.error(
+                f"Stopped writing the chat history after {self.shutdown_timeout} seconds, "
+                f"{sum(self._pending_turns.values())} chat turn(s) were not written. "
+                f"Chat rooms: {', '.join(str(room_uuid) for room_uuid in self._pending_turns)}"
+            )
+        finally:
+            self._task = None
+
+    async def enqueue(
+        self,
+        chat_room: ChatRoomInDb | None,
+        chat_histories: list[ChatHistoryInDb],
+    ) -> None:
+        """
+        Queue a chat turn to be written to the database.
+
+        Args:
+            chat_room (ChatRoomInDb | None): The new chat room to create along with the chat history or None.
+            chat_histories (list[ChatHistoryInDb]): The chat history records of the turn.
+
+        Returns:
+            None
+        """
+
+        room_uuid = self._get_room_uuid((chat_room, chat_histories))
+
+        if chat_room:
+            self._pending_chat_rooms[room_uuid] = chat_room.user_id
+
+        self._pending_turns[room_uuid] = (
+            self._pending_turns.get(room_uuid, 0) + 1
+        )
+        await self._queue.put((chat_room, chat_histories))
+
+    def is_chat_room_pending(self, room_uuid: UUID, user_id: int) -> bool:
+        """
+        Check if a chat room of the user is queued but not written to the database yet.
+
+        Args:
+            room_uuid (UUID): The chat room's UUID.
+            user_id (int): The user's ID.
+
+        Returns:
+            bool: True if the chat room is waiting in the queue, False otherwise.
+        """
+
+        return self._pending_chat_rooms.get(room_uuid) == user_id
+
+    async def wait_for_chat_room(self, room_uuid: UUID) -> None:
+        """
+        Wait until every chat turn of the chat room queued by this process is written to the database or dropped.
+
+        The wait is bounded by the flush interval, unless the database is unavailable.
+
+        Args:
+            room_uuid (UUID): The chat room's UUID.
+
+        Returns:
+            None
+        """
+
+        async with self._written:
+            await self._written.wait_for(
+                lambda: room_uuid not in self._pending_turns
+            )
+
+    async def _run(self) -> None:
+        """
+        Collect queued chat turns into batches and write them until the stop signal is received.
+
+        Returns:
+            None
+        """
+
+        loop = asyncio.get_running_loop()
+        is_stopping = False
+
+        while not is_stopping:
+            chat_turn = await self._queue.get()
+
+            if chat_turn is None:
+                break
+
+            batch = [chat_turn]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+
+                if timeout <= 0:
+                    break
+
+                try:
+                    chat_turn = await asyncio.wait_for(
+                        self._queue.get(), timeout
+                    )
+                except TimeoutError:
+                    break
+
+                if chat_turn is None:
+                    is_stopping = True
+                    break
+
+                batch.append(chat_turn)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[ChatTurn]) -> None:
+        """
+        Write a batch of chat turns to the database and mark them as no longer pending.
+
+        Args:
+            batch (list[ChatTurn]): The chat turns to write.
+
+        Returns:
+            None
+        """
+
+        try:
+            await self._write_or_split(batch)
+        finally:
+            # A write cancelled because stopping took too long keeps its chat turns pending, so they are logged as
+            # not written.
+            if not asyncio.current_task().cancelling():
+                await self._mark_as_written(batch)
+
+    async def _mark_as_written(self, batch: list[ChatTurn]) -> None:
+        """
+        Mark written or dropped chat turns as no longer pending and wake up the tasks waiting for their chat rooms.
+
+        Args:
+            batch (list[ChatTurn]): The chat turns.
+
+        Returns:
+            None
+        """
+
+        async with self._written:
+            for chat_turn in batch:
+                room_uuid = self._get_room_uuid(chat_turn)
+                pending_turns = self._pending_turns.pop(room_uuid, 1) - 1
+
+                if pending_turns:
+                    self._pending_turns[room_uuid] = pending_turns
+                else:
+                    self._pending_chat_rooms.pop(room_uuid, None)
+
+            self._written.notify_all()
+
+    async def _write_or_split(self, batch: list[ChatTurn]) -> None:
+        """
+        Write a batch of chat turns in a single transaction. If the batch cannot be written, its halves are written
+        separately, in order, until the chat turn that cannot be written is found and dropped.
+
+        Args:
+            batch (list[ChatTurn]): The chat turns to write.
+
+        Returns:
+            None
+        """
+
+        error = await self._write(batch)
+
+        if error is None:
+            return
+
+        if len(batch) == 1:
+            logger.error(
+                f"Dropped a chat turn of chat room {self._get_room_uuid(batch[0])} that cannot be written. "
+                f"Error: {str(error)}"
+            )
+            return
+
+        middle = len(batch) // 2
+        await self._write_or_split(batch[:middle])
+        await self._write_or_split(batch[middle:])
+
+    async def _write(self, batch: list[ChatTurn]) -> Exception | None:
+        """
+        Write a batch of chat turns to the database in a single transaction, retrying transient errors until it
+        succeeds.
+
+        Args:
+            batch (list[ChatTurn]): The chat turns to write.
+
+        Returns:
+            Exception | None: The error that prevents the batch from being written or None if it was written.
+        """
+
+        chat_rooms = [
+            chat_room.model_dump() for chat_room, _ in batch if chat_room
+        ]
+        chat_histories = [
+            chat_history.model_dump()
+            for _, turn_histories in batch
+            for chat_history in turn_histories
+        ]
+        delay = self.retry_base_delay
+
+        while True:
+            try:
+                async with SessionLocal() as db:
+                    await ChatHistoryRepository(db).create_bulk_with_chat_rooms(
+                        chat_rooms, chat_histories
+                    )
+                return None
+            except Exception as e:
+                if not self._is_transient_error(e):
+                    return e
+
+                logger.error(
+                    f"Failed to write {len(batch)} chat turn(s), retrying in {delay} seconds. Error: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.retry_max_delay)
+
+    @staticmethod
+    def _is_transient_error(error: Exception) -> bool:
+        """
+        Check if an error is caused by the database being temporarily unavailable, so the write can be retried.
+
+        Args:
+            error (Exception): The error raised while writing.
+
+        Returns:
+            bool: True if the write can succeed when retried, False otherwise.
+        """
+
+        if isinstance(error, DBAPIError):
+            return error.connection_invalidated or isinstance(
+                error, (OperationalError, InterfaceError)
+            )
+
+        return isinstance(error, (PoolTimeoutError, OSError, TimeoutError))
+
+    @staticmethod
+    def _get_room_uuid(chat_turn: ChatTurn) -> UUID:
+        """
+        Get the UUID of the chat room a chat turn belongs to.
+
+        Args:
+            chat_turn (ChatTurn): The chat turn.
+
+        Returns:
+            UUID: The chat room's UUID.
+        """
+
+        chat_room, chat_histories = chat_turn
+
+        return chat_room.room_uuid if chat_room else chat_histories[0].room_uuid
+
+
+chat_history_writer = ChatHistoryWriter(
+    batch_size=settings.CHAT_HISTORY_WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=settings.CHAT_HISTORY_WRITE_BEHIND_FLUSH_INTERVAL_IN_SEC,
+    max_queue_size=settings.CHAT_HISTORY_WRITE_BEHIND_MAX_QUEUE_SIZE,
+    retry_max_delay=settings.CHAT_HISTORY_WRITE_BEHIND_RETRY_MAX_DELAY_IN_SEC,
+    shutdown_timeout=settings.CHAT_HISTORY_WRITE_BEHIND_SHUTDOWN_TIMEOUT_IN_SEC,
+)
@@ -17,7 +17,7 @@ class ChatRoom(Base):
     room_uuid: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
 
     chat_history: Mapped[list["ChatHistory"]] = relationship(
         back_populates="chat_room",
@@ -1,8 +1,9 @@
 import uuid
+import datetime
 from typing import Sequence
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Depends
 
@@ -10,6 +11,8 @@ from src.core.database import get_db
 
 from src.shared.repository.base import BaseRepository
 
+from src.chat_history.models import ChatHistory
+
 from .models import ChatRoom
 
 
@@ -18,12 +21,12 @@ class ChatRoomRepository(BaseRepository[ChatRoom]):
     Repository for chat room database related operations.
     """
 
-    def __init__(self, db: Session = Depends(get_db)) -> None:
+    def __init__(self, db: AsyncSession = Depends(get_db)) -> None:
         """
         Initialize the repository with a database session.
 
         Args:
-            db (Session): Database session.
+            db (AsyncSession): Database session.
 
         Returns:
             None
@@ -31,43 +34,61 @@ class ChatRoomRepository(BaseRepository[ChatRoom]):
 
         super().__init__(db, ChatRoom)
 
-    def create(self, payload: dict) -> uuid.UUID:
+    async def get_page_by_user_id(
+        self,
+        user_id: int,
+        limit: int,
+        before: tuple[datetime.datetime, uuid.UUID] | None = None,
+    ) -> Sequence[Row]:
         """
-        Create a new record in the database. The method is overridden from the base repository to return the UUID of the
-        chat room.
-
-        Args:
-            payload (dict): Payload containing the data to be created.
+        Get a page of the user's chat rooms along with the last message of each room, ordered from the most
+        recently active room.
 
-        Returns:
-            uuid.UUID: The UUID of the chat room.
-        """
-
-        chat_room = self.model(**payload)
-
-        self.db.add(chat_room)
-        self.db.commit()
-
-        return chat_room.room_uuid
-
-    def get_all_by_user_id(self, user_id: int) -> Sequence[ChatRoom]:
-        """
-        Get all chat rooms by user ID.
+        Only the last message of every room is fetched by a lateral subquery instead of loading the whole chat
+        history. Rooms are paginated by the (last message's sent_at, room_uuid) keyset.
 
         Args:
             user_id (int): The user's ID.
+            limit (int): The maximum number of chat rooms to get.
+            before (tuple[datetime.datetime, uuid.UUID] | None): The (sent_at, room_uuid) of the last room on the
+                previous page. Defaults to None, which means the most recently active rooms.
 
         Returns:
-            Sequence[ChatRoom]: List of chat rooms.
+            Sequence[Row]: Rows containing the room UUID with the last message, the time it was sent and the API
+            provider's ID.
         """
 
-        return (
-            self.db.execute(
-                select(self.model)
-                .options(joinedload(self.model.chat_history))
-                .where(self.model.user_id == user_id)
+        last_message = (
+            select(
+                ChatHistory.message,
+                ChatHistory.sent_at,
+                ChatHistory.api_provider_id,
+            )
+            .where(ChatHistory.room_uuid == self.model.room_uuid)
+            .order_by(ChatHistory.sent_at.desc(), ChatHistory.id.desc())
+            .limit(1)
+            .lateral()
+        )
+
+        stmt = (
+            select(
+                self.model.room_uuid,
+                last_message.c.message,
+                last_message.c.sent_at,
+                last_message.c.api_provider_id,
             )
-            .unique()
-            .scalars()
-            .all()
+            .join(last_message, true())
+            .where(self.model.user_id == user_id)
+            .order_by(
+                last_message.c.sent_at.desc(), self.model.room_uuid.desc()
+            )
+            .limit(limit)
         )
+
+        if before:
+            stmt = stmt.where(
+                tuple_(last_message.c.sent_at, self.model.room_uuid)
+                < tuple_(*before)
+            )
+
+        return (await self.db.execute(stmt)).all()
@@ -1,6 +1,9 @@
 import uuid
+from typing import Annotated
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+
+from src.core.config import settings
 
 from src.auth.dependencies import AuthDependency
 from .dependencies import ChatRoomServiceDependency
@@ -13,13 +16,21 @@ router = APIRouter(prefix="/chat-room", tags=["chat-room"])
 
 @router.get("/all", response_model=UserChatRoomsResponse)
 async def get_all_chat_rooms(
-    auth: AuthDependency, chat_room_service: ChatRoomServiceDependency
+    auth: AuthDependency,
+    chat_room_service: ChatRoomServiceDependency,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.CHAT_ROOMS_MAX_PAGE_SIZE)
+    ] = settings.CHAT_ROOMS_PAGE_SIZE,
+    cursor: str | None = None,
 ):
     """
-    Get all chat rooms associated with the user.
+    Get a page of chat rooms associated with the user, starting from the most recently active one.
+    Pass the returned 'nextCursor' to get the next page.
     """
 
-    return chat_room_service.get_all_by_user_id(auth.user_id)
+    return await chat_room_service.get_all_by_user_id(
+        auth.user_id, limit, cursor
+    )
 
 
 @router.delete("/{room_uuid}")
@@ -32,4 +43,4 @@ async def delete_chat_room(
     Delete a chat room associated with the user by its UUID.
     """
 
-    return chat_room_service.delete_chat_room(auth.user_id, room_uuid)
+    return await chat_room_service.delete_chat_room(auth.user_id, room_uuid)
@@ -5,6 +5,11 @@ from uuid import UUID
 from pydantic import BaseModel, PastDatetime, field_validator, Field
 
 
+class ChatRoomInDb(BaseModel):
+    room_uuid: UUID
+    user_id: int
+
+
 class ChatRoom(BaseModel):
     room_uuid: Annotated[UUID, Field(serialization_alias="roomUuid")]
     last_message: Annotated[str, Field(serialization_alias="lastMessage")]
@@ -31,14 +36,6 @@ class UserChatRoomsResponse(BaseModel):
     chat_rooms: Annotated[
         list[ChatRoom], Field(serialization_alias="chatRooms")
     ]
-
-    @field_validator("chat_rooms")
-    @classmethod
-    def sort_descending(cls, value: list[ChatRoom]):
-        """
-        Sort the chat rooms by 'last_message_sent_at' date in descending order.
-        """
-
-        if value:
-            value.sort(key=lambda x: x.last_message_sent_at, reverse=True)
-        return value
+    next_cursor: Annotated[
+        str | None, Field(serialization_alias="nextCursor", default=None)
+    ]
@@ -1,12 +1,18 @@
 import uuid
+import datetime
 
 from fastapi import Depends, HTTPException, status
 
+from src.core.config import settings
+
 from src.shared.service.base import BaseService
 from src.shared.schemas import ChatHistoryCompletionRequest
+from src.shared.utils.cursor import cursor_util
+
+from src.chat_history.writer import chat_history_writer
 
 from .repository import ChatRoomRepository
-from .schemas import ChatRoom, UserChatRoomsResponse
+from .schemas import ChatRoom, ChatRoomInDb, UserChatRoomsResponse
 
 
 class ChatRoomService(BaseService[ChatRoomRepository]):
@@ -29,24 +35,13 @@ class ChatRoomService(BaseService[ChatRoomRepository]):
 
         super().__init__(repository)
 
-    def create(self, user_id: int) -> uuid.UUID:
-        """
-        Create a new chat room for a user and return the UUID of the chat room.
-
-        Args:
-            user_id (int): The user's ID.
-
-        Returns:
-            uuid.UUID: The UUID of the newly created chat room.
-        """
-
-        return self.repository.create({"user_id": user_id})
-
-    def verify_chat_room_exists(
+    async def verify_chat_room_exists(
         self, user_id: int, room_uuid: uuid.UUID
     ) -> None:
         """
         Verify if a chat room exists and belongs to a user.
+        In write-behind mode, chat rooms still waiting in this process' queue are treated as existing. Other worker
+        processes only find them once they are written (see `ChatHistoryWriter`).
 
         TODO: Consider using this method as a dependency.
 
@@ -61,8 +56,14 @@ class ChatRoomService(BaseService[ChatRoomRepository]):
             None
         """
 
+        if (
+            settings.CHAT_HISTORY_WRITE_BEHIND
+            and chat_history_writer.is_chat_room_pending(room_uuid, user_id)
+        ):
+            return
+
         chat_room = (
-            self.repository.get_one_with_selected_attributes_by_condition(
+            await self.repository.get_one_with_selected_attributes_by_condition(
                 ["user_id"],
                 "room_uuid",
                 str(room_uuid),
@@ -75,69 +76,136 @@ class ChatRoomService(BaseService[ChatRoomRepository]):
                 detail="Chat room with the provided UUID does not belong to the user.",
             )
 
-    def handle_room_uuid(
+    @staticmethod
+    def is_new_room(payload: ChatHistoryCompletionRequest) -> bool:
+        """
+        Check if the payload starts a new conversation, which requires creating a new chat room.
+
+        Args:
+            payload (ChatHistoryCompletionRequest): The payload containing the chat history data.
+
+        Returns:
+            bool: True if a new chat room should be created, False otherwise.
+        """
+
+        return not payload.room_uuid and len(payload.messages) == 1
+
+    async def handle_room_uuid(
         self, user_id: int, payload: ChatHistoryCompletionRequest
-    ) -> ChatHistoryCompletionRequest:
+    ) -> tuple[ChatHistoryCompletionRequest, ChatRoomInDb | None]:
         """
         Handle the room UUID in the payload.
 
+        A new chat room is not written to the database here. Its UUID is generated up front and the room is returned,
+        so that it can be stored in the same transaction as the chat history.
+
         Args:
             user_id (int): The ID of the user.
             payload (ChatHistoryCompletionRequest): The payload containing the chat history data.
 
         Returns:
-            ChatHistoryCompletionRequest: The payload with the room UUID.
+            tuple[ChatHistoryCompletionRequest, ChatRoomInDb | None]: The payload with the room UUID and the chat room
+            to create or None if the room already exists.
         """
 
-        if not payload.room_uuid and len(payload.messages) == 1:
-            chat_room_uuid = self.create(user_id)
+        if self.is_new_room(payload):
+            chat_room = ChatRoomInDb(room_uuid=uuid.uuid4(), user_id=user_id)
 
             payload: ChatHistoryCompletionRequest = payload.model_copy(
-                update={"room_uuid": chat_room_uuid}
+                update={"room_uuid": chat_room.room_uuid}
             )
-        else:
-            self.verify_chat_room_exists(user_id, payload.room_uuid)
+            return payload, chat_room
+
+        await self.verify_chat_room_exists(user_id, payload.room_uuid)
 
-        return payload
+        return payload, None
 
-    def get_all_by_user_id(self, user_id: int) -> UserChatRoomsResponse:
+    async def get_all_by_user_id(
+        self, user_id: int, limit: int, cursor: str | None = None
+    ) -> UserChatRoomsResponse:
         """
-        Get all chat rooms associated with a user.
+        Get a page of chat rooms associated with a user, ordered from the most recently active one.
 
         Args:
             user_id (int): The user's ID.
+            limit (int): The maximum number of chat rooms on the page.
+            cursor (str | None): The cursor returned with the previous page. Defaults to None.
+
+        Raises:
+            HTTPException: Raised with status code 400 if the cursor is malformed.
 
         Returns:
             UserChatRoomsResponse: Response containing a list of chat rooms with the last message
-            and the time it was sent.
+            and the time it was sent along with the cursor to the next page if there is one.
         """
 
-        chat_rooms = self.repository.get_all_by_user_id(user_id)
+        before = None
+
+        if cursor:
+            sent_at, room_uuid = cursor_util.decode_cursor(cursor, 2)
 
-        if chat_rooms:
-            chat_rooms = [
+            try:
+                before = (
+                    datetime.datetime.fromisoformat(sent_at),
+                    uuid.UUID(room_uuid),
+                )
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor.",
+                )
+
+        # Fetch one extra room to find out whether there is another page without a separate count query.
+        chat_rooms = list(
+            await self.repository.get_page_by_user_id(
+                user_id, limit + 1, before
+            )
+        )
+        next_cursor = None
+
+        if len(chat_rooms) > limit:
+            chat_rooms = chat_rooms[:limit]
+            next_cursor = cursor_util.encode_cursor(
+                [
+                    chat_rooms[-1].sent_at.isoformat(),
+                    str(chat_rooms[-1].room_uuid),
+                ]
+            )
+
+        return UserChatRoomsResponse(
+            chat_rooms=[
                 ChatRoom(
                     room_uuid=chat_room.room_uuid,
-                    last_message=chat_room.chat_history[-1].message,
-                    last_message_sent_at=chat_room.chat_history[-1].sent_at,
-                    api_provider_id=chat_room.chat_history[-1].api_provider_id,
+                    last_message=chat_room.message,
+                    last_message_sent_at=chat_room.sent_at,
+                    api_provider_id=chat_room.api_provider_id,
                 )
                 for chat_room in chat_rooms
-            ]
-
-        return UserChatRoomsResponse(chat_rooms=chat_rooms)
+            ],
+            next_cursor=next_cursor,
+        )
 
-    def delete_chat_room(self, user_id: int, room_uuid: uuid.UUID) -> None:
+    async def delete_chat_room(
+        self, user_id: int, room_uuid: uuid.UUID
+    ) -> None:
         """
         Delete a chat room associated with a user by its UUID.
+        In write-behind mode, the chat room's queued chat turns are written first, so they are deleted along with it.
 
         Args:
             user_id (int): The user's ID.
             room_uuid (uuid.UUID): The chat room's UUID.
 
+        Raises:
+            HTTPException: Raised with a 404 status code if the chat room does not exist or does not belong to the user.
+
         Returns:
             None
         """
 
-        self.verify_chat_room_exists(user_id, room_uuid)
-        self.repository.delete_by_id(room_uuid)
+        await self.verify_chat_room_exists(user_id, room_uuid)
+
+        if settings.CHAT_HISTORY_WRITE_BEHIND:
+            await chat_history_writer.wait_for_chat_room(room_uuid)
+
+        await self.delete_by_id(room_uuid)
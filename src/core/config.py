@@ -1,6 +1,7 @@
-from pathlib import Path
+from typing import Literal
 from functools import lru_cache
 
+from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,19 +11,61 @@ class Settings(BaseSettings):
     """
 
     DATABASE_URL: str
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT_IN_SEC: float = 30
+    DATABASE_POOL_RECYCLE_IN_SEC: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
     REDIS_SERVER_HOST: str
     REDIS_SERVER_PORT: int
+    REDIS_KEY_PREFIX: str = "chat"
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_IN_SEC: float = 5
+    REDIS_SOCKET_TIMEOUT_IN_SEC: float = 5
+    REDIS_SOCKET_CONNECT_TIMEOUT_IN_SEC: float = 2
+    REDIS_HEALTH_CHECK_INTERVAL_IN_SEC: int = 30
+    REDIS_RETRY_ON_TIMEOUT: bool = True
     ALLOWED_ORIGIN: str
     JWT_AUTH_SECRET_KEY: str
     FERNET_MASTER_KEY: str
     ALGORITHM: str = "HS256"
+    JWT_BACKEND: Literal["jose", "pyjwt"] = "jose"
+    JWT_CACHE_SIZE: int = 1024
     ACCESS_TOKEN_EXPIRE_IN_MINUTES: int = 180
     REDIS_API_KEYS_EXPIRE_IN_SEC: int = 900
+    REDIS_DERIVED_KEY_EXPIRE_IN_SEC: int = 900
+    PBKDF2_MAX_WORKERS: int = 4
+    PBKDF2_MAX_PENDING: int = 16
+    BCRYPT_MAX_WORKERS: int = 2
+    BCRYPT_MAX_PENDING: int = 32
+    REDIS_API_KEYS_LOCAL_CACHE_SIZE: int = 1024
+    REDIS_API_KEYS_LOCAL_CACHE_TTL_IN_SEC: float = 5
+    CHAT_HISTORY_PAGE_SIZE: int = 50
+    CHAT_HISTORY_MAX_PAGE_SIZE: int = 200
+    CHAT_ROOMS_PAGE_SIZE: int = 50
+    CHAT_ROOMS_MAX_PAGE_SIZE: int = 200
+    CHAT_HISTORY_WRITE_BEHIND: bool = False
+    CHAT_HISTORY_WRITE_BEHIND_BATCH_SIZE: int = 100
+    CHAT_HISTORY_WRITE_BEHIND_FLUSH_INTERVAL_IN_SEC: float = 0.5
+    CHAT_HISTORY_WRITE_BEHIND_MAX_QUEUE_SIZE: int = 10000
+    CHAT_HISTORY_WRITE_BEHIND_RETRY_MAX_DELAY_IN_SEC: float = 30
+    CHAT_HISTORY_WRITE_BEHIND_SHUTDOWN_TIMEOUT_IN_SEC: float = 10
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
     AWS_REGION: str
     AWS_S3_BUCKET_NAME: str
-    AWS_S3_DOWNLOAD_PATH: str = str(Path("src/s3/tmp/"))
+    AWS_S3_MAX_UPLOAD_SIZE_IN_BYTES: int = 10 * 1024 * 1024
+    AWS_S3_MULTIPART_CHUNK_SIZE_IN_BYTES: int = 8 * 1024 * 1024
+    AWS_S3_PRESIGNED_UPLOAD_EXPIRE_IN_SEC: int = 300
+    OPENAI_CLIENT_CACHE_SIZE: int = 128
+    OPENAI_TIMEOUT_IN_SEC: float = 120
+    GEMINI_CLIENT_CACHE_SIZE: int = 128
+    GEMINI_FILE_CACHE_EXPIRE_IN_SEC: int = 47 * 60 * 60
+    GEMINI_MISSING_FILE_CACHE_EXPIRE_IN_SEC: int = 300
+    GEMINI_IMAGE_RESOLUTION_CONCURRENCY: int = 8
+    GEMINI_IMAGE_RESOLUTION_TIMEOUT_IN_SEC: float = 30
+    METRICS_ENABLED: bool = False
+    METRICS_AUTH_TOKEN: SecretStr | None = None
 
     model_config = SettingsConfigDict(
         case_sensitive=True,
@@ -1,34 +1,88 @@
-from typing import Generator
+import time
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import AsyncGenerator
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 
+from src.metrics.service import metrics
+
 from .config import settings
 
 
-engine = create_engine(settings.DATABASE_URL)
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that measures how long it takes to check out a connection, including the time spent waiting for
+    a free one when the pool is exhausted.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            metrics.counter("db.pool.checkout_timeouts").inc()
+            raise
+        finally:
+            metrics.timer("db.pool.checkout_latency").observe(
+                time.perf_counter() - start
+            )
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    poolclass=MonitoredQueuePool,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT_IN_SEC,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE_IN_SEC,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+)
+
+
+# The overflow gauge is only updated on checkout, its peak shows how far a burst went beyond the pool size.
+@event.listens_for(engine.sync_engine, "checkout")
+def on_pool_checkout(dbapi_connection, connection_record, connection_proxy):
+    metrics.gauge("db.pool.in_use").inc()
+    metrics.gauge("db.pool.overflow").set(
+        max(engine.sync_engine.pool.overflow(), 0)
+    )
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def on_pool_checkin(dbapi_connection, connection_record):
+    metrics.gauge("db.pool.in_use").dec()
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects are not expired on commit, otherwise accessing their attributes afterwards would trigger an implicit
+# (and in async context forbidden) lazy load.
+SessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
 
-def get_db() -> Generator:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Get a database connection.
 
-    This function is a generator that manages the database session.
+    This function is an asynchronous generator that manages the database session.
     It initializes a session before performing operations on the database and
     ensures that the session is closed after the operations are completed,
     regardless of whether the operations succeed or fail.
 
     Yields:
-        Session: A database connection session object.
+        AsyncSession: A database connection session object.
     """
 
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
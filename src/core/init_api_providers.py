@@ -1,11 +1,12 @@
+import asyncio
 import logging
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.core.database import get_db
+from src.core.database import SessionLocal, engine
 from src.api_provider.models import ApiProvider
+from src.ai_provider.registry import api_provider_registry
 from src.logger.logger import init_logging
 
 
@@ -13,36 +14,12 @@ init_logging()
 logger = logging.getLogger(__name__)
 
 
-OpenAiProvider = ApiProvider(
-    name="OpenAI",
-    lowercase_name="openai",
-    ai_models=[
-        "gpt-4",
-        "gpt-4-turbo",
-        "gpt-4o",
-        "gpt-4o-mini",
-        "gpt-3.5-turbo",
-    ],
-)
-
-GeminiProvider = ApiProvider(
-    name="Gemini",
-    lowercase_name="gemini",
-    ai_models=[
-        "gemini-1.5-flash",
-        "gemini-1.5-flash-8b",
-        "gemini-1.5-pro",
-        "gemini-1.0-pro",
-    ],
-)
-
-
-def create_api_providers() -> None:
+async def create_api_providers() -> None:
     """
     Initializes the database with predefined API providers.
 
-    This function inserts a set of predefined API providers into the database. Each provider is associated
-    with a list of AI models it supports. It is intended to be run only once during the application's
+    This function inserts the API providers registered in `src.ai_provider.registry` into the database. Each provider
+    is associated with a list of AI models it supports. It is intended to be run only once during the application's
     first-time setup to ensure that the necessary data exists in the database.
 
     IMPORTANT: Before running this function, ensure that:
@@ -54,30 +31,39 @@ def create_api_providers() -> None:
         None
     """
 
-    db: Session = next(get_db())
-    api_providers = [OpenAiProvider, GeminiProvider]
-
-    try:
-        new_providers = [
-            provider
-            for provider in api_providers
-            if not db.scalar(
-                select(ApiProvider).where(
-                    ApiProvider.lowercase_name == provider.lowercase_name
+    api_providers = [
+        ApiProvider(
+            name=definition.name,
+            lowercase_name=definition.lowercase_name,
+            ai_models=list(definition.ai_models),
+        )
+        for definition in api_provider_registry.definitions
+    ]
+
+    async with SessionLocal() as db:
+        try:
+            new_providers = [
+                provider
+                for provider in api_providers
+                if not await db.scalar(
+                    select(ApiProvider).where(
+                        ApiProvider.lowercase_name == provider.lowercase_name
+                    )
                 )
-            )
-        ]
+            ]
+
+            if new_providers:
+                db.add_all(new_providers)
+                await db.commit()
+                logger.info("API providers created successfully.")
+            else:
+                logger.info("API providers already exist in the database.")
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"An error occurred while creating API providers: {e}")
 
-        if new_providers:
-            db.add_all(new_providers)
-            db.commit()
-            logger.info("API providers created successfully.")
-        else:
-            logger.info("API providers already exist in the database.")
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.error(f"An error occurred while creating API providers: {e}")
+    await engine.dispose()
 
 
 if __name__ == "__main__":
-    create_api_providers()
+    asyncio.run(create_api_providers())
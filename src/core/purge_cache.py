@@ -0,0 +1,59 @@
+import asyncio
+import logging
+
+from redis.exceptions import RedisError
+
+from src.redis.client import create_redis_client
+from src.redis.keys import get_redis_key
+from src.logger.logger import init_logging
+
+
+init_logging()
+logger = logging.getLogger(__name__)
+
+
+PURGE_BATCH_SIZE = 500
+
+
+async def purge_cache() -> None:
+    """
+    Deletes every key in the application's Redis namespace.
+
+    The keys are found with SCAN instead of KEYS, so Redis is not blocked while a large keyspace is traversed, and
+    are deleted in batches with UNLINK, so the memory is reclaimed in the background. Keys outside the namespace
+    are left alone.
+
+    Users whose API keys are purged have to provide their passphrase again. Workers that are running might keep
+    serving API keys from their local cache for a few more seconds.
+
+    Returns:
+        None
+    """
+
+    redis_client = create_redis_client()
+    purged_keys_count = 0
+
+    try:
+        batch: list[str] = []
+
+        async for key in redis_client.scan_iter(
+            match=get_redis_key("*"), count=PURGE_BATCH_SIZE
+        ):
+            batch.append(key)
+
+            if len(batch) >= PURGE_BATCH_SIZE:
+                purged_keys_count += await redis_client.unlink(*batch)
+                batch = []
+
+        if batch:
+            purged_keys_count += await redis_client.unlink(*batch)
+
+        logger.info(f"Purged {purged_keys_count} key(s) from the cache.")
+    except RedisError as e:
+        logger.error(f"An error occurred while purging the cache: {e}")
+    finally:
+        await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(purge_cache())
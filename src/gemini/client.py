@@ -0,0 +1,260 @@
+import hashlib
+import threading
+
+from io import IOBase
+from typing import AsyncIterable
+
+from cachetools import LRUCache
+
+import google.ai.generativelanguage as glm
+
+from google.generativeai.client import FileServiceClient
+from google.generativeai.types import File, AsyncGenerateContentResponse
+from google.generativeai.types import content_types
+
+from src.core.config import settings
+
+
+class GeminiClient:
+    """
+    The Gemini API clients of a single API key.
+
+    Unlike `genai.configure`, which sets the API key for the whole process, the clients only ever use their own API
+    key, so requests of different users can run concurrently.
+    """
+
+    def __init__(self, api_key: str) -> None:
+        """
+        Initializes the clients.
+
+        Args:
+            api_key (str): The Gemini API key.
+
+        Returns:
+            None
+        """
+
+        client_options = {"api_key": api_key}
+
+        self.generative_client = glm.GenerativeServiceAsyncClient(
+            client_options=client_options
+        )
+        self.file_client = FileServiceClient(client_options=client_options)
+        # Uploads go through a shared HTTP connection that is not thread-safe.
+        self._upload_lock = threading.Lock()
+
+    @staticmethod
+    def _get_request(
+        model_name: str,
+        contents: list[dict],
+        system_instruction: str | None = None,
+    ) -> glm.GenerateContentRequest:
+        """
+        Build the request to generate content with an AI model.
+
+        Args:
+            model_name (str): The name of the AI model.
+            contents (list[dict]): The messages to send to the AI model.
+            system_instruction (str | None): The custom instructions for the AI model. Defaults to None.
+
+        Returns:
+            glm.GenerateContentRequest: The request.
+        """
+
+        if "/" not in model_name:
+            model_name = f"models/{model_name}"
+
+        return glm.GenerateContentRequest(
+            model=model_name,
+            contents=content_types.to_contents(contents),
+            system_instruction=(
+                content_types.to_content(system_instruction)
+                if system_instruction
+                else None
+            ),
+        )
+
+    async def generate_content(
+        self,
+        model_name: str,
+        contents: list[dict],
+        system_instruction: str | None = None,
+    ) -> AsyncGenerateContentResponse:
+        """
+        Generate content with an AI model.
+
+        Args:
+            model_name (str): The name of the AI model.
+            contents (list[dict]): The messages to send to the AI model.
+            system_instruction (str | None): The custom instructions for the AI model. Defaults to None.
+
+        Returns:
+            AsyncGenerateContentResponse: The response of the AI model.
+        """
+
+        response = await self.generative_client.generate_content(
+            self._get_request(model_name, contents, system_instruction)
+        )
+
+        return AsyncGenerateContentResponse.from_response(response)
+
+    async def stream_generate_content(
+        self,
+        model_name: str,
+        contents: list[dict],
+        system_instruction: str | None = None,
+    ) -> AsyncIterable[glm.GenerateContentResponse]:
+        """
+        Generate content with an AI model, streaming the response.
+
+        Args:
+            model_name (str): The name of the AI model.
+            contents (list[dict]): The messages to send to the AI model.
+            system_instruction (str | None): The custom instructions for the AI model. Defaults to None.
+
+        Returns:
+            AsyncIterable[glm.GenerateContentResponse]: The streaming call, which yields the response's chunks and is
+                cancelled with its `cancel` method.
+        """
+
+        return await self.generative_client.stream_generate_content(
+            self._get_request(model_name, contents, system_instruction)
+        )
+
+    def get_file(self, name: str, timeout: float | None = None) -> File:
+        """
+        Get a file uploaded to Gemini.
+
+        Args:
+            name (str): The name of the file.
+            timeout (float | None): The timeout of the request in seconds. Defaults to None, in which case the
+                client's default timeout is used.
+
+        Returns:
+            File: The file.
+        """
+
+        if "/" not in name:
+            name = f"files/{name}"
+
+        return File(self.file_client.get_file(name=name, timeout=timeout))
+
+    def upload_file(
+        self,
+        file: IOBase,
+        mime_type: str,
+        name: str | None = None,
+        display_name: str | None = None,
+    ) -> File:
+        """
+        Upload a file to Gemini.
+
+        Args:
+            file (IOBase): The file's content.
+            mime_type (str): The file's MIME type.
+            name (str | None): The name of the file. Defaults to None, in which case a name is generated.
+            display_name (str | None): The display name of the file. Defaults to None.
+
+        Returns:
+            File: The uploaded file.
+        """
+
+        if name is not None and "/" not in name:
+            name = f"files/{name}"
+
+        with self._upload_lock:
+            return File(
+                self.file_client.create_file(
+                    file,
+                    mime_type=mime_type,
+                    name=name,
+                    display_name=display_name,
+                )
+            )
+
+    async def close(self) -> None:
+        """
+        Close the clients' connections.
+
+        Returns:
+            None
+        """
+
+        await self.generative_client.transport.close()
+        self.file_client.transport.close()
+
+
+class GeminiClientCache:
+    """
+    A bounded, LRU-evicted cache of Gemini clients keyed by API key.
+
+    Reusing the clients per API key keeps their connections alive between requests.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): The maximum number of clients kept in the cache.
+
+        Returns:
+            None
+        """
+
+        self._clients: LRUCache[str, GeminiClient] = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def _get_cache_key(api_key: str) -> str:
+        """
+        Creates a cache key from an API key, so the raw key is not used as a dictionary key.
+
+        Args:
+            api_key (str): The Gemini API key.
+
+        Returns:
+            str: The cache key.
+        """
+
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    def get_client(self, api_key: str) -> GeminiClient:
+        """
+        Get a cached client for the API key or create a new one if it does not exist yet.
+
+        Evicted clients are not closed explicitly, because they might still be used by in-flight requests. Their
+        connections are released once they are garbage collected.
+
+        Args:
+            api_key (str): The Gemini API key.
+
+        Returns:
+            GeminiClient: The Gemini client.
+        """
+
+        cache_key = self._get_cache_key(api_key)
+        client = self._clients.get(cache_key)
+
+        if client is None:
+            client = GeminiClient(api_key)
+            self._clients[cache_key] = client
+
+        return client
+
+    async def close(self) -> None:
+        """
+        Close all cached clients and clear the cache.
+
+        Returns:
+            None
+        """
+
+        for client in list(self._clients.values()):
+            await client.close()
+
+        self._clients.clear()
+
+
+gemini_client_cache = GeminiClientCache(
+    maxsize=settings.GEMINI_CLIENT_CACHE_SIZE
+)
@@ -1,20 +1,33 @@
+import asyncio
+import logging
+import mimetypes
+
+from pathlib import Path
+
+from typing import AsyncGenerator, AsyncIterable
+from datetime import datetime, UTC
+
 from fastapi import status, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from google import generativeai as genai
-from google.generativeai.types import File
+from google.generativeai.types import AsyncGenerateContentResponse
 from google.api_core.exceptions import (
     InvalidArgument,
     NotFound,
     PermissionDenied,
 )
 
+from src.core.config import settings
+
 from src.shared.service.base import BaseAiService
 
-from src.auth.dependencies import AuthDependency
-from src.redis.dependencies import RedisServiceDependency
+from src.redis.service import RedisGeminiFile
 from src.chat_room.dependencies import ChatRoomServiceDependency
 from src.chat_history.dependencies import ChatHistoryServiceDependency
-from src.s3.dependencies import S3ServiceDependency
+from src.chat_history.stream import stream_chat_completion
+
+from .client import gemini_client_cache
 
 from src.shared.enums import RoleEnum
 from src.shared.schemas import (
@@ -25,47 +38,24 @@ from src.shared.schemas import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 class GeminiService(BaseAiService):
     """
     Service for Google Gemini related operations.
     """
 
-    def __init__(self, s3_service: S3ServiceDependency) -> None:
+    @staticmethod
+    async def close_clients() -> None:
         """
-        Initializes the service.
+        Close the cached Gemini clients.
 
         Returns:
             None
         """
 
-        super().__init__()
-        self.s3_service = s3_service
-
-    @staticmethod
-    async def get_api_key(
-        auth: AuthDependency,
-        redis_service: RedisServiceDependency,
-        api_provider_name: str = "gemini",
-    ) -> str:
-        """
-        Retrieve an API key for a user based on the API provider name.
-
-        Args:
-            auth (AuthDependency): The authentication dependency.
-            redis_service (RedisServiceDependency): The Redis service dependency.
-            api_provider_name (str): The name of the API provider.
-
-        Raises:
-            HTTPException: Raised with status code 404 if the user does not have any API keys stored in Redis.
-
-        Returns:
-            str: The decrypted API key if found.
-        """
-
-        api_key = await redis_service.get_user_specific_api_key_from_cache(
-            auth.uuid, api_provider_name
-        )
-        return api_key
+        await gemini_client_cache.close()
 
     async def upload_image(
         self, image: UploadFile
@@ -111,78 +101,350 @@ class GeminiService(BaseAiService):
         """
 
         try:
-            genai.configure(api_key=api_key)
+            response = await self._generate_content(api_key, payload)
 
-            model = genai.GenerativeModel(
-                model_name=payload.ai_model,
-                system_instruction=payload.custom_instructions,
+            payload, chat_room = await chat_room_service.handle_room_uuid(
+                user_id, payload
             )
-
-            response = await model.generate_content_async(
-                self._format_messages(payload.messages)
+            await chat_history_service.store_chat_history(
+                response.text, payload, chat_room
             )
 
-            payload = chat_room_service.handle_room_uuid(user_id, payload)
-            chat_history_service.store_chat_history(response.text, payload)
-
             return ChatHistoryCompletionResponse(
                 message=response.text,
                 room_uuid=payload.room_uuid,
                 api_provider_id=payload.api_provider_id,
             )
-        except InvalidArgument as e:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Invalid Gemini API key: {e}",
+        except (InvalidArgument, NotFound) as e:
+            raise self._get_http_exception(e)
+
+    async def chat_stream(
+        self,
+        user_id: int,
+        api_key: str,
+        chat_room_service: ChatRoomServiceDependency,
+        payload: ChatHistoryCompletionRequest,
+    ) -> StreamingResponse:
+        """
+        Send message to Google Gemini's model and stream its response as server-sent events. The chat history is
+        stored once the stream ends.
+
+        Args:
+            user_id (int): The user's ID.
+            api_key (str): The Gemini API key.
+            chat_room_service (ChatRoomServiceDependency): The chat room service dependency.
+            payload (ChatHistoryCompletionRequest): The request payload containing the AI model name, optional custom
+             instructions for the AI model and the message history containing the role and content.
+
+        Raises:
+            HTTPException: Raised with status code 404 if the chat room does not belong to the user.
+            HTTPException: Raised with status code 403 if the Gemini API key is invalid.
+
+        Returns:
+            StreamingResponse: The server-sent events stream of the AI model's response.
+        """
+
+        if not chat_room_service.is_new_room(payload):
+            await chat_room_service.verify_chat_room_exists(
+                user_id, payload.room_uuid
             )
-        except NotFound:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Gemini model not found.",
+
+        try:
+            response, stream = await self._stream_generate_content(
+                api_key, payload
             )
+        except (InvalidArgument, NotFound) as e:
+            raise self._get_http_exception(e)
+
+        return StreamingResponse(
+            stream_chat_completion(
+                user_id, self._iterate_stream(response, stream), payload
+            ),
+            media_type="text/event-stream",
+        )
+
+    async def _generate_content(
+        self, api_key: str, payload: ChatHistoryCompletionRequest
+    ) -> AsyncGenerateContentResponse:
+        """
+        Generate content with the AI model selected in the payload.
+
+        Args:
+            api_key (str): The Gemini API key.
+            payload (ChatHistoryCompletionRequest): The request payload.
+
+        Returns:
+            AsyncGenerateContentResponse: The response of the AI model.
+        """
+
+        return await gemini_client_cache.get_client(api_key).generate_content(
+            model_name=payload.ai_model,
+            contents=await self._format_messages(api_key, payload.messages),
+            system_instruction=payload.custom_instructions,
+        )
+
+    async def _stream_generate_content(
+        self, api_key: str, payload: ChatHistoryCompletionRequest
+    ) -> tuple[AsyncGenerateContentResponse, AsyncIterable]:
+        """
+        Generate content with the AI model selected in the payload, streaming the response.
+
+        The first chunk is awaited, so an invalid API key or model is reported before the stream starts.
+
+        Args:
+            api_key (str): The Gemini API key.
+            payload (ChatHistoryCompletionRequest): The request payload.
+
+        Returns:
+            tuple[AsyncGenerateContentResponse, AsyncIterable]: The streamed response of the AI model and the streaming
+                call it reads from.
+        """
+
+        stream = await gemini_client_cache.get_client(
+            api_key
+        ).stream_generate_content(
+            model_name=payload.ai_model,
+            contents=await self._format_messages(api_key, payload.messages),
+            system_instruction=payload.custom_instructions,
+        )
+
+        try:
+            response = await AsyncGenerateContentResponse.from_aiterator(stream)
+        except BaseException:
+            stream.cancel()
+            raise
+
+        return response, stream
+
+    async def _iterate_stream(
+        self, response: AsyncGenerateContentResponse, stream: AsyncIterable
+    ) -> AsyncGenerator[str, None]:
+        """
+        Iterate over the text chunks of a streamed response.
 
-    def _format_messages(
+        The streaming call is cancelled once the iteration stops, so a client that disconnects does not keep the
+        response generating.
+
+        Args:
+            response (AsyncGenerateContentResponse): The streamed response of the AI model.
+            stream (AsyncIterable): The streaming call the response reads from.
+
+        Raises:
+            HTTPException: Raised if Gemini API fails in the middle of the stream.
+
+        Yields:
+            str: The text chunks of the AI model's response.
+        """
+
+        try:
+            async for chunk in response:
+                if chunk.parts:
+                    yield chunk.text
+        except (InvalidArgument, NotFound) as e:
+            raise self._get_http_exception(e)
+        finally:
+            stream.cancel()
+
+    @staticmethod
+    def _get_http_exception(error: InvalidArgument | NotFound) -> HTTPException:
+        """
+        Map a Gemini API error to an HTTP exception.
+
+        Args:
+            error (InvalidArgument | NotFound): The error raised by Gemini's client.
+
+        Returns:
+            HTTPException: The HTTP exception to raise.
+        """
+
+        if isinstance(error, InvalidArgument):
+            return HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Invalid Gemini API key: {error}",
+            )
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Gemini model not found.",
+        )
+
+    async def _format_messages(
         self,
+        api_key: str,
         messages: list[ChatHistoryCompletionMessage],
     ) -> list[dict]:
         """
         Format the messages to be sent to Gemini's API.
+        The images of all messages are resolved concurrently, up to the configured limit at a time. Once resolving one
+        image fails, resolving the others is cancelled.
+
+        A cancelled or timed out image is no longer awaited, but the blocking SDK and boto3 call it was waiting for in
+        the thread pool cannot be interrupted and runs to completion in the background. Its result is discarded: the
+        Redis entries are written by the cancelled coroutine, so nothing is cached after the 504. An upload to Gemini
+        that was in flight still creates the Gemini file, which a later request finds by its name instead of uploading
+        the image again. The Gemini file lookups are limited to the same timeout, so they do not outlive the request
+        by long.
 
         Args:
+            api_key (str): The Gemini API key.
             messages (list[ChatHistoryCompletionMessage]): The list of messages to format.
 
+        Raises:
+            HTTPException: Raised with status code 504 if resolving an image takes too long.
+
         Returns:
             list[dict]: The formatted messages.
         """
 
+        semaphore = asyncio.Semaphore(
+            settings.GEMINI_IMAGE_RESOLUTION_CONCURRENCY
+        )
+
+        async def resolve_image(image_url: str) -> RedisGeminiFile:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._get_gemini_file(api_key, image_url),
+                        settings.GEMINI_IMAGE_RESOLUTION_TIMEOUT_IN_SEC,
+                    )
+                except TimeoutError:
+                    raise HTTPException(
+                        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                        detail="Preparing the chat images took too long. Please try again.",
+                    )
+
+        # An image repeated in the history is resolved only once.
+        image_urls = list(
+            dict.fromkeys(msg.image_url for msg in messages if msg.image_url)
+        )
+
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = {
+                    image_url: task_group.create_task(resolve_image(image_url))
+                    for image_url in image_urls
+                }
+        except ExceptionGroup as e:
+            # The first error is raised as it is, so an HTTP error keeps its status code.
+            raise e.exceptions[0]
+
+        gemini_files = {
+            image_url: task.result() for image_url, task in tasks.items()
+        }
+
         formatted_messages = []
 
         for msg in messages:
             role = msg.role if msg.role == RoleEnum.user else "model"
-            message_parts: dict[str, list[str | File]] = {
+            message_parts: dict[str, list[str | dict]] = {
                 "role": role,
                 "parts": [msg.message],
             }
 
-            if msg.image_url:
-                clean_filename = self.s3_service.get_clean_filename_from_url(
-                    msg.image_url
+            if msg.image_url and (gemini_file := gemini_files[msg.image_url]):
+                message_parts["parts"].append(
+                    {
+                        "file_data": {
+                            "mime_type": gemini_file["mime_type"],
+                            "file_uri": gemini_file["uri"],
+                        }
+                    }
                 )
 
-                try:
-                    image_file = genai.get_file(clean_filename)
-                except PermissionDenied:
-                    s3_key = self.s3_service.extract_s3_key_from_url(
-                        msg.image_url
-                    )
-                    local_path = self.s3_service.download_file_to_local(s3_key)
-                    image_file = genai.upload_file(
-                        path=local_path, name=clean_filename
-                    )
-                    self.s3_service.delete_local_file(local_path)
-
-                message_parts["parts"].append(image_file)
-
             formatted_messages.append(message_parts)
 
         return formatted_messages
+
+    async def _get_gemini_file(
+        self, api_key: str, image_url: str
+    ) -> RedisGeminiFile:
+        """
+        Get the Gemini file of an image stored in S3, uploading the image to Gemini if it is not there yet.
+
+        Both found and missing images are cached in Redis, so images that were already resolved skip the Gemini
+        lookup and the S3 download. Found images are cached until shortly before Gemini deletes the file.
+
+        Args:
+            api_key (str): The Gemini API key.
+            image_url (str): The URL of the image in S3.
+
+        Raises:
+            HTTPException: Raised with status code 413 if the image is larger than the maximum upload size.
+            HTTPException: Raised with status code 415 if the image's MIME type is unknown or not an image type.
+            HTTPException: Raised with status code 500 if the image cannot be downloaded from S3.
+
+        Returns:
+            RedisGeminiFile: The Gemini file's URI and MIME type, or an empty dictionary if the image does not exist.
+        """
+
+        s3_key = self.s3_service.extract_s3_key_from_url(image_url)
+        gemini_file = await self.redis_service.get_gemini_file_from_cache(
+            api_key, s3_key
+        )
+
+        if gemini_file is not None:
+            return gemini_file
+
+        gemini_client = gemini_client_cache.get_client(api_key)
+        clean_filename = self.s3_service.get_clean_filename_from_url(image_url)
+
+        # The SDK and boto3 calls are blocking, so they are run in the thread pool.
+        try:
+            image_file = await run_in_threadpool(
+                gemini_client.get_file,
+                clean_filename,
+                timeout=settings.GEMINI_IMAGE_RESOLUTION_TIMEOUT_IN_SEC,
+            )
+        except PermissionDenied:
+            try:
+                image_content, content_type = await run_in_threadpool(
+                    self.s3_service.download_file_to_memory, s3_key
+                )
+            except HTTPException as e:
+                if e.status_code != status.HTTP_404_NOT_FOUND:
+                    raise
+
+                logger.warning(f"Image {s3_key} not found in S3, skipping it.")
+                await self.redis_service.set_gemini_file_in_cache(
+                    api_key,
+                    s3_key,
+                    {},
+                    settings.GEMINI_MISSING_FILE_CACHE_EXPIRE_IN_SEC,
+                )
+                return {}
+
+            # The content type stored with the image is preferred. Images stored without one are guessed from the key.
+            if not content_type or not content_type.startswith("image/"):
+                content_type, _ = mimetypes.guess_type(s3_key)
+
+            if not content_type or not content_type.startswith("image/"):
+                raise HTTPException(
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail="The image's format is not supported.",
+                )
+
+            image_file = await run_in_threadpool(
+                gemini_client.upload_file,
+                image_content,
+                mime_type=content_type,
+                name=clean_filename,
+                display_name=Path(s3_key).name,
+            )
+
+        gemini_file = {
+            "uri": image_file.uri,
+            "mime_type": image_file.mime_type,
+        }
+        expire_in_sec = min(
+            settings.GEMINI_FILE_CACHE_EXPIRE_IN_SEC,
+            int(
+                (image_file.expiration_time - datetime.now(UTC)).total_seconds()
+            )
+            - 60,
+        )
+
+        if expire_in_sec > 0:
+            await self.redis_service.set_gemini_file_in_cache(
+                api_key, s3_key, gemini_file, expire_in_sec
+            )
+
+        return gemini_file
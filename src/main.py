@@ -1,19 +1,30 @@
+import asyncio
+
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from redis import asyncio as redis
-
 from .api import api_router
 from .core.config import settings
+from .ai_provider.registry import api_provider_registry
+from .chat_history.writer import chat_history_writer
+from .redis.cache import listen_for_api_keys_invalidations
+from .redis.client import create_redis_client
+from .s3.middleware import UploadSizeLimitMiddleware
+from .shared.utils.hash import hash_util
+from .shared.utils.passphrase import passphrase_util
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Context manager to manage the lifespan of the application.
-    Connects to Redis on startup and closes the connection on shutdown.
+    Connects to Redis on startup and closes the connection on shutdown along with the clients of the API providers that were used.
+    The cached data is shared by all workers, so it is left in Redis on shutdown (see `src.core.purge_cache`).
+    Listens for API keys invalidations from other workers while the application is running.
+    Waits for the running key derivations and password hashing to finish on shutdown.
+    In write-behind mode, starts the chat history writer on startup and writes all queued chat turns on shutdown.
 
     Args:
         app (FastAPI): The FastAPI application instance.
@@ -25,16 +36,29 @@ async def lifespan(app: FastAPI):
         None
     """
 
-    redis_client = redis.Redis(
-        host=settings.REDIS_SERVER_HOST,
-        port=settings.REDIS_SERVER_PORT,
-        db=0,
-        decode_responses=True,
-    )
+    redis_client = create_redis_client()
     app.state.redis_client = redis_client
+    invalidations_listener = asyncio.create_task(
+        listen_for_api_keys_invalidations(redis_client)
+    )
+
+    if settings.CHAT_HISTORY_WRITE_BEHIND:
+        chat_history_writer.start()
+
     yield
-    await redis_client.flushdb()
-    await redis_client.close()
+
+    invalidations_listener.cancel()
+
+    try:
+        await invalidations_listener
+    except asyncio.CancelledError:
+        pass
+
+    await chat_history_writer.stop()
+    await redis_client.aclose()
+    await api_provider_registry.close()
+    passphrase_util.executor.shutdown()
+    hash_util.executor.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -47,4 +71,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_file_size=settings.AWS_S3_MAX_UPLOAD_SIZE_IN_BYTES,
+)
+
 app.include_router(api_router)
@@ -0,0 +1,46 @@
+import secrets
+
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.core.config import settings
+
+
+_metrics_bearer = HTTPBearer(auto_error=False)
+
+
+async def verify_metrics_token(
+    credentials: Annotated[
+        HTTPAuthorizationCredentials | None, Depends(_metrics_bearer)
+    ],
+) -> None:
+    """
+    Verify that the request carries the metrics token as a bearer token.
+
+    The metrics expose the internals of the worker, so they are never served when no token is configured.
+
+    Args:
+        credentials (HTTPAuthorizationCredentials | None): The bearer token from the Authorization header, if any.
+
+    Raises:
+        HTTPException: Raised with a 401 status code if the token is missing, invalid or not configured.
+
+    Returns:
+        None
+    """
+
+    if (
+        settings.METRICS_AUTH_TOKEN is None
+        or credentials is None
+        or not secrets.compare_digest(
+            credentials.credentials.encode(),
+            settings.METRICS_AUTH_TOKEN.get_secret_value().encode(),
+        )
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
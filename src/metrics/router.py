@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+
+from .dependencies import verify_metrics_token
+from .service import metrics
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(verify_metrics_token)],
+)
+
+
+@router.get("")
+async def get_metrics():
+    """
+    Get a snapshot of the in-process metrics of the worker that handles the request.
+    Requires the configured metrics token as a bearer token.
+    """
+
+    return metrics.snapshot()
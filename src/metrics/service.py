@@ -0,0 +1,232 @@
+import threading
+
+
+class Gauge:
+    """
+    A metric holding a value that can go up and down. The highest value ever observed is kept as well.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the gauge.
+
+        Returns:
+            None
+        """
+
+        self._lock = threading.Lock()
+        self.value = 0
+        self.peak = 0
+
+    def set(self, value: int) -> None:
+        """
+        Set the gauge to a given value.
+
+        Args:
+            value (int): The new value.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self.value = value
+            self.peak = max(self.peak, value)
+
+    def inc(self, amount: int = 1) -> None:
+        """
+        Increase the gauge.
+
+        Args:
+            amount (int): The amount to increase the gauge by. Defaults to 1.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self.value += amount
+            self.peak = max(self.peak, self.value)
+
+    def dec(self, amount: int = 1) -> None:
+        """
+        Decrease the gauge.
+
+        Args:
+            amount (int): The amount to decrease the gauge by. Defaults to 1.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self.value -= amount
+
+    def snapshot(self) -> dict:
+        """
+        Get the current state of the gauge.
+
+        Returns:
+            dict: The current and the peak value.
+        """
+
+        return {"value": self.value, "peak": self.peak}
+
+
+class Counter:
+    """
+    A metric holding a monotonically increasing value.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the counter.
+
+        Returns:
+            None
+        """
+
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount (int): The amount to increase the counter by. Defaults to 1.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self) -> dict:
+        """
+        Get the current state of the counter.
+
+        Returns:
+            dict: The current value.
+        """
+
+        return {"value": self.value}
+
+
+class Timer:
+    """
+    A metric aggregating observed durations in seconds.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the timer.
+
+        Returns:
+            None
+        """
+
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Record a single duration.
+
+        Args:
+            seconds (float): The observed duration in seconds.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict:
+        """
+        Get the current state of the timer.
+
+        Returns:
+            dict: The number of observations with the average and the maximum duration in milliseconds.
+        """
+
+        average = self.total / self.count if self.count else 0.0
+
+        return {
+            "count": self.count,
+            "avg_ms": round(average * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process registry of named metrics.
+
+    Metrics are created on first access, so modules can register them at import time without any setup.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the registry.
+
+        Returns:
+            None
+        """
+
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Gauge | Counter | Timer] = {}
+
+    def _get_or_create[
+        T: (Gauge, Counter, Timer)
+    ](self, name: str, metric_type: type[T]) -> T:
+        """
+        Get a metric by its name or create it if it does not exist yet.
+
+        Args:
+            name (str): The name of the metric.
+            metric_type (type[T]): The type of the metric.
+
+        Returns:
+            T: The metric.
+        """
+
+        with self._lock:
+            metric = self._metrics.get(name)
+
+            if metric is None:
+                metric = metric_type()
+                self._metrics[name] = metric
+
+        return metric
+
+    def gauge(self, name: str) -> Gauge:
+        return self._get_or_create(name, Gauge)
+
+    def counter(self, name: str) -> Counter:
+        return self._get_or_create(name, Counter)
+
+    def timer(self, name: str) -> Timer:
+        return self._get_or_create(name, Timer)
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Get the current state of all registered metrics.
+
+        Returns:
+            dict[str, dict]: The metrics' state keyed by their names.
+        """
+
+        return {
+            name: metric.snapshot()
+            for name, metric in sorted(self._metrics.items())
+        }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,86 @@
+import hashlib
+
+from cachetools import LRUCache
+
+from openai import AsyncOpenAI
+
+from src.core.config import settings
+
+
+class OpenAiClientCache:
+    """
+    A bounded, LRU-evicted cache of asynchronous OpenAI clients keyed by API key.
+
+    Reusing a client per API key keeps its underlying HTTP connection pool alive between requests instead of opening
+    a new connection for every chat completion.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): The maximum number of clients kept in the cache.
+
+        Returns:
+            None
+        """
+
+        self._clients: LRUCache[str, AsyncOpenAI] = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def _get_cache_key(api_key: str) -> str:
+        """
+        Creates a cache key from an API key, so the raw key is not used as a dictionary key.
+
+        Args:
+            api_key (str): The OpenAI API key.
+
+        Returns:
+            str: The cache key.
+        """
+
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    def get_client(self, api_key: str) -> AsyncOpenAI:
+        """
+        Get a cached client for the API key or create a new one if it does not exist yet.
+
+        Evicted clients are not closed explicitly, because they might still be used by in-flight requests. Their
+        connections are released once they are garbage collected.
+
+        Args:
+            api_key (str): The OpenAI API key.
+
+        Returns:
+            AsyncOpenAI: The asynchronous OpenAI client.
+        """
+
+        cache_key = self._get_cache_key(api_key)
+        client = self._clients.get(cache_key)
+
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key, timeout=settings.OPENAI_TIMEOUT_IN_SEC
+            )
+            self._clients[cache_key] = client
+
+        return client
+
+    async def close(self) -> None:
+        """
+        Close all cached clients and clear the cache.
+
+        Returns:
+            None
+        """
+
+        for client in list(self._clients.values()):
+            await client.close()
+
+        self._clients.clear()
+
+
+openai_client_cache = OpenAiClientCache(
+    maxsize=settings.OPENAI_CLIENT_CACHE_SIZE
+)
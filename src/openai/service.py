@@ -1,14 +1,21 @@
+from typing import AsyncGenerator
+
 from fastapi import HTTPException, status, UploadFile
+from fastapi.responses import StreamingResponse
 
-from openai import OpenAI, AuthenticationError, NotFoundError, OpenAIError
+from openai import (
+    AsyncStream,
+    AuthenticationError,
+    NotFoundError,
+    OpenAIError,
+)
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
 
 from src.shared.service.base import BaseAiService
 
-from src.auth.dependencies import AuthDependency
-from src.redis.dependencies import RedisServiceDependency
 from src.chat_room.dependencies import ChatRoomServiceDependency
 from src.chat_history.dependencies import ChatHistoryServiceDependency
-from src.s3.dependencies import S3ServiceDependency
+from src.chat_history.stream import stream_chat_completion
 
 from src.shared.schemas import (
     ChatHistoryCompletionRequest,
@@ -17,48 +24,24 @@ from src.shared.schemas import (
     ChatHistoryCompletionMessage,
 )
 
+from .client import openai_client_cache
+
 
 class OpenAiService(BaseAiService):
     """
     Service for OpenAI related operations.
     """
 
-    def __init__(self, s3_service: S3ServiceDependency) -> None:
-        """
-        Initializes the service.
-
-        Returns:
-            None
-        """
-
-        super().__init__()
-        self.s3_service = s3_service
-
     @staticmethod
-    async def get_api_key(
-        auth: AuthDependency,
-        redis_service: RedisServiceDependency,
-        api_provider_name: str = "openai",
-    ) -> str:
+    async def close_clients() -> None:
         """
-        Retrieve an API key for a user based on the API provider name.
-
-        Args:
-            auth (AuthDependency): The authentication dependency.
-            redis_service (RedisServiceDependency): The Redis service dependency.
-            api_provider_name (str): The name of the API provider.
-
-        Raises:
-            HTTPException: Raised with status code 404 if the user does not have any API keys stored in Redis.
+        Close the cached OpenAI clients.
 
         Returns:
-            str: The decrypted API key if found.
+            None
         """
 
-        api_key = await redis_service.get_user_specific_api_key_from_cache(
-            auth.uuid, api_provider_name
-        )
-        return api_key
+        await openai_client_cache.close()
 
     async def upload_image(
         self, image: UploadFile
@@ -106,25 +89,14 @@ class OpenAiService(BaseAiService):
         """
 
         try:
-            client: OpenAI = OpenAI(api_key=api_key)
+            response = await self._create_completion(api_key, payload)
 
-            messages = self._format_messages(payload.messages)
-
-            response = client.chat.completions.create(
-                model=payload.ai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": payload.custom_instructions,
-                    },
-                    *messages,
-                ],
+            payload, chat_room = await chat_room_service.handle_room_uuid(
+                user_id, payload
             )
 
-            payload = chat_room_service.handle_room_uuid(user_id, payload)
-
-            chat_history_service.store_chat_history(
-                response.choices[0].message.content, payload
+            await chat_history_service.store_chat_history(
+                response.choices[0].message.content, payload, chat_room
             )
 
             return ChatHistoryCompletionResponse(
@@ -132,21 +104,140 @@ class OpenAiService(BaseAiService):
                 room_uuid=payload.room_uuid,
                 api_provider_id=payload.api_provider_id,
             )
-        except AuthenticationError:
-            raise HTTPException(
+        except OpenAIError as e:
+            raise self._get_http_exception(e)
+
+    async def chat_stream(
+        self,
+        user_id: int,
+        api_key: str,
+        chat_room_service: ChatRoomServiceDependency,
+        payload: ChatHistoryCompletionRequest,
+    ) -> StreamingResponse:
+        """
+        Send message to OpenAI's model and stream its response as server-sent events. The chat history is stored
+        once the stream ends.
+
+        Args:
+            user_id (int): The user's ID.
+            api_key (str): The OpenAI API key.
+            chat_room_service (ChatRoomServiceDependency): The chat room service dependency.
+            payload (ChatHistoryCompletionRequest): The payload containing the AI model name, optional custom
+            instructions for the AI model and the message history containing the role and content.
+
+        Raises:
+            HTTPException: Raised with status code 404 if the chat room does not belong to the user.
+            HTTPException: Raised with status code 403 if the OpenAI API key is invalid.
+
+        Returns:
+            StreamingResponse: The server-sent events stream of the AI model's response.
+        """
+
+        if not chat_room_service.is_new_room(payload):
+            await chat_room_service.verify_chat_room_exists(
+                user_id, payload.room_uuid
+            )
+
+        try:
+            stream = await self._create_completion(
+                api_key, payload, stream=True
+            )
+        except OpenAIError as e:
+            raise self._get_http_exception(e)
+
+        return StreamingResponse(
+            stream_chat_completion(
+                user_id, self._iterate_stream(stream), payload
+            ),
+            media_type="text/event-stream",
+        )
+
+    async def _create_completion(
+        self,
+        api_key: str,
+        payload: ChatHistoryCompletionRequest,
+        stream: bool = False,
+    ) -> ChatCompletion | AsyncStream[ChatCompletionChunk]:
+        """
+        Create a chat completion using the cached client for the API key.
+
+        Args:
+            api_key (str): The OpenAI API key.
+            payload (ChatHistoryCompletionRequest): The request payload.
+            stream (bool): Whether to stream the response. Defaults to False.
+
+        Returns:
+            ChatCompletion | AsyncStream[ChatCompletionChunk]: The completion or the stream of its chunks.
+        """
+
+        client = openai_client_cache.get_client(api_key)
+
+        messages = self._format_messages(payload.messages)
+
+        return await client.chat.completions.create(
+            model=payload.ai_model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": payload.custom_instructions,
+                },
+                *messages,
+            ],
+            stream=stream,
+        )
+
+    async def _iterate_stream(
+        self, stream: AsyncStream[ChatCompletionChunk]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Iterate over the text chunks of a streamed chat completion.
+        The stream's connection is closed when the iteration ends, including when it is closed early.
+
+        Args:
+            stream (AsyncStream[ChatCompletionChunk]): The stream of the chat completion's chunks.
+
+        Raises:
+            HTTPException: Raised if OpenAI API fails in the middle of the stream.
+
+        Yields:
+            str: The text chunks of the AI model's response.
+        """
+
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except OpenAIError as e:
+            raise self._get_http_exception(e)
+        finally:
+            await stream.close()
+
+    @staticmethod
+    def _get_http_exception(error: OpenAIError) -> HTTPException:
+        """
+        Map an OpenAI error to an HTTP exception.
+
+        Args:
+            error (OpenAIError): The error raised by OpenAI's client.
+
+        Returns:
+            HTTPException: The HTTP exception to raise.
+        """
+
+        if isinstance(error, AuthenticationError):
+            return HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid OpenAI API key.",
             )
-        except NotFoundError:
-            raise HTTPException(
+        if isinstance(error, NotFoundError):
+            return HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="OpenAI model not found.",
             )
-        except OpenAIError:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Something went wrong with OpenAI API. Please try again later.",
-            )
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Something went wrong with OpenAI API. Please try again later.",
+        )
 
     @staticmethod
     def _format_messages(
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+
+from cachetools import TTLCache
+from redis import asyncio as redis
+
+from src.core.config import settings
+
+from .keys import get_redis_key
+
+
+logger = logging.getLogger(__name__)
+
+
+API_KEYS_INVALIDATION_CHANNEL = get_redis_key("api-keys", "invalidate")
+
+
+class ApiKeyLocalCache:
+    """
+    A small, bounded in-process cache of the user's API keys that sits in front of Redis.
+
+    The cache stores the same master-key encrypted tokens as Redis, keyed by the user's UUID and the API provider's
+    name. Entries live only for a few seconds, which also bounds how long a worker can serve a stale key when an
+    invalidation message is missed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): The maximum number of cached API keys.
+            ttl (float): The time in seconds after which a cached API key expires.
+
+        Returns:
+            None
+        """
+
+        self._cache: TTLCache[tuple[str, str], str] = TTLCache(
+            maxsize=maxsize, ttl=ttl
+        )
+
+    def get(self, user_uuid: str, provider_name: str) -> str | None:
+        """
+        Get the user's encrypted API key for the API provider.
+
+        Args:
+            user_uuid (str): The user's UUID.
+            provider_name (str): The lowercase name of the API provider.
+
+        Returns:
+            str | None: The encrypted API key or None if it is not cached.
+        """
+
+        return self._cache.get((user_uuid, provider_name))
+
+    def set(self, user_uuid: str, provider_name: str, api_key: str) -> None:
+        """
+        Cache the user's encrypted API key for the API provider.
+
+        Args:
+            user_uuid (str): The user's UUID.
+            provider_name (str): The lowercase name of the API provider.
+            api_key (str): The encrypted API key.
+
+        Returns:
+            None
+        """
+
+        self._cache[(user_uuid, provider_name)] = api_key
+
+    def invalidate(self, user_uuid: str) -> None:
+        """
+        Remove all cached API keys of the user.
+
+        Args:
+            user_uuid (str): The user's UUID.
+
+        Returns:
+            None
+        """
+
+        for key in [key for key in self._cache.keys() if key[0] == user_uuid]:
+            self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all cached API keys.
+
+        Returns:
+            None
+        """
+
+        self._cache.clear()
+
+
+api_key_local_cache = ApiKeyLocalCache(
+    maxsize=settings.REDIS_API_KEYS_LOCAL_CACHE_SIZE,
+    ttl=settings.REDIS_API_KEYS_LOCAL_CACHE_TTL_IN_SEC,
+)
+
+
+async def listen_for_api_keys_invalidations(redis_client: redis.Redis) -> None:
+    """
+    Invalidate the local API keys cache whenever any worker publishes a change of the user's API keys.
+
+    The subscription is re-established if the connection to Redis is lost. The whole cache is cleared after
+    (re)subscribing, because invalidation messages sent in the meantime are lost.
+
+    Args:
+        redis_client (redis.Redis): The Redis client.
+
+    Returns:
+        None
+    """
+
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(API_KEYS_INVALIDATION_CHANNEL)
+                api_key_local_cache.clear()
+
+                # Waiting with an explicit timeout keeps an idle subscription from tripping the socket timeout,
+                # and lets the client run its periodic health checks.
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=settings.REDIS_HEALTH_CHECK_INTERVAL_IN_SEC,
+                    )
+
+                    if message and message["type"] == "message":
+                        api_key_local_cache.invalidate(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                f"Lost the API keys invalidation subscription. Error: {str(e)}"
+            )
+            await asyncio.sleep(1)
@@ -0,0 +1,107 @@
+import time
+
+from redis import asyncio as redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.core.config import settings
+from src.metrics.service import metrics
+
+
+class MonitoredConnectionPool(redis.BlockingConnectionPool):
+    """
+    Blocking connection pool that reports how many connections are in use and how long it takes to check one out,
+    including the time spent waiting for a free one when the pool is exhausted.
+    """
+
+    async def get_connection(self, command_name, *keys, **options):
+        start = time.perf_counter()
+
+        try:
+            connection = await super().get_connection(
+                command_name, *keys, **options
+            )
+        except RedisConnectionError:
+            metrics.counter("redis.pool.checkout_errors").inc()
+            raise
+        finally:
+            metrics.timer("redis.pool.checkout_latency").observe(
+                time.perf_counter() - start
+            )
+
+        metrics.gauge("redis.pool.in_use").set(len(self._in_use_connections))
+
+        return connection
+
+    async def release(self, connection):
+        await super().release(connection)
+        metrics.gauge("redis.pool.in_use").set(len(self._in_use_connections))
+
+
+class MonitoredPipeline(Pipeline):
+    """
+    Pipeline that measures the latency of a whole pipelined round trip.
+    """
+
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            metrics.timer("redis.pipeline.latency").observe(
+                time.perf_counter() - start
+            )
+
+
+class MonitoredRedis(redis.Redis):
+    """
+    Redis client that measures the latency of every command and pipeline, including the connection checkout.
+    """
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            metrics.timer("redis.command.latency").observe(
+                time.perf_counter() - start
+            )
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: str | None = None
+    ) -> MonitoredPipeline:
+        return MonitoredPipeline(
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+        )
+
+
+def create_redis_client() -> MonitoredRedis:
+    """
+    Create a Redis client with a bounded connection pool.
+
+    Every command is bounded by the socket timeouts, and waiting for a free connection is bounded by the pool timeout,
+    so a stalled Redis server fails requests instead of hanging them.
+
+    Returns:
+        MonitoredRedis: The Redis client.
+    """
+
+    connection_pool = MonitoredConnectionPool(
+        host=settings.REDIS_SERVER_HOST,
+        port=settings.REDIS_SERVER_PORT,
+        db=0,
+        decode_responses=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_IN_SEC,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_IN_SEC,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_IN_SEC,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_IN_SEC,
+        retry_on_timeout=settings.REDIS_RETRY_ON_TIMEOUT,
+    )
+
+    return MonitoredRedis.from_pool(connection_pool)
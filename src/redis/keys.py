@@ -0,0 +1,18 @@
+from src.core.config import settings
+
+
+def get_redis_key(*parts: str) -> str:
+    """
+    Build a Redis key in the application's namespace.
+
+    Every key and channel used by the application starts with the configured prefix, so the application's data can
+    be told apart from (and purged without touching) anything else stored in the same Redis database.
+
+    Args:
+        *parts (str): The parts of the key (e.g. "user" and the user's UUID).
+
+    Returns:
+        str: The namespaced key (e.g. "chat:user:<uuid>").
+    """
+
+    return ":".join((settings.REDIS_KEY_PREFIX, *parts))
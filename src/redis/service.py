@@ -1,3 +1,7 @@
+import hmac
+import json
+import hashlib
+
 from typing import TypedDict, Dict
 
 from redis import asyncio as redis
@@ -5,13 +9,18 @@ from redis.commands.json.path import Path
 
 from fastapi import Depends, Request, HTTPException, status
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 
 from src.core.config import settings
 
 from src.api_key.schemas import ApiKey, ApiKeysResponse
 
-from src.shared.utils.passphrase import passphrase_util
+from .keys import get_redis_key
+from .cache import api_key_local_cache, API_KEYS_INVALIDATION_CHANNEL
+
+
+# Parsing the master key once, instead of on every call, keeps it off the hot chat path.
+master_fernet_key = Fernet(settings.FERNET_MASTER_KEY)
 
 
 async def get_redis(request: Request) -> redis.Redis:
@@ -35,6 +44,17 @@ class RedisApiKeys(TypedDict):
     apiKeys: Dict[str, RedisApiKey]
 
 
+class RedisDerivedKey(TypedDict):
+    key: str
+    passphrase_salt: str
+    passphrase_digest: str
+
+
+class RedisGeminiFile(TypedDict, total=False):
+    uri: str
+    mime_type: str
+
+
 class RedisService:
     """
     Service for Redis related operations.
@@ -67,32 +87,36 @@ class RedisService:
             return await self.delete_user_api_keys_from_cache(user_uuid)
 
         user_data: RedisApiKeys = {"apiKeys": {}}
-        redis_key = f"user:{user_uuid}"
-        fernet_key = Fernet(settings.FERNET_MASTER_KEY)
+        redis_key = get_redis_key("user", user_uuid)
 
+        # Fernet tokens are already URL-safe base64, so they are stored as they are.
         for api_key_obj in api_keys_list:
             user_data["apiKeys"][api_key_obj.api_provider_lowercase_name] = {
-                "key": passphrase_util.convert_bytes_to_hex(
-                    fernet_key.encrypt(api_key_obj.key.encode())
-                ),
+                "key": master_fernet_key.encrypt(
+                    api_key_obj.key.encode()
+                ).decode(),
                 "api_provider_id": api_key_obj.api_provider_id,
                 "api_provider_name": api_key_obj.api_provider_name,
             }
 
-        await self.redis_client.json().set(
-            redis_key, Path.root_path(), user_data
-        )
-        await self.redis_client.expire(
-            redis_key, settings.REDIS_API_KEYS_EXPIRE_IN_SEC
-        )
+        api_key_local_cache.invalidate(user_uuid)
+
+        # All commands are sent in a single MULTI/EXEC round trip, so the keys can never be stored without expiry.
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.json().set(redis_key, Path.root_path(), user_data)
+            pipe.expire(redis_key, settings.REDIS_API_KEYS_EXPIRE_IN_SEC)
+            pipe.publish(API_KEYS_INVALIDATION_CHANNEL, user_uuid)
+            await pipe.execute()
 
     async def get_user_specific_api_key_from_cache(
         self, user_uuid: str, provider_name: str
     ) -> str:
         """
         Retrieve a specific API key for a user based on the API provider name.
-        When the API key is found, extend the lifetime of all user keys in Redis to the expiry time constant set
-        in the settings.
+        Extend the lifetime of all user keys in Redis to the expiry time constant set in the settings.
+
+        Only the provider's entry is fetched, and the lifetime is extended in the same pipelined round trip.
+        The key is served from the local cache if it was fetched recently, in which case Redis is not queried at all.
 
         Args:
             user_uuid (str): The user's UUID.
@@ -105,35 +129,37 @@ class RedisService:
             str: The decrypted API key if found.
         """
 
-        redis_key = f"user:{user_uuid}"
+        provider_name = provider_name.lower()
+        api_key = api_key_local_cache.get(user_uuid, provider_name)
+
+        if api_key is not None:
+            return master_fernet_key.decrypt(api_key).decode()
+
+        redis_key = get_redis_key("user", user_uuid)
 
-        if not await self.is_redis_key_present(redis_key):
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.json().get(redis_key, f"$.apiKeys.{provider_name}")
+            pipe.expire(redis_key, settings.REDIS_API_KEYS_EXPIRE_IN_SEC)
+            api_key_objs, _ = await pipe.execute()
+
+        # JSONPath queries return None if the key does not exist and an empty list if the path does not match.
+        if api_key_objs is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Please provide a passphrase to continue.",
             )
 
-        api_keys: RedisApiKeys = await self.redis_client.json().get(redis_key)
-
-        api_key_obj = api_keys["apiKeys"].get(provider_name.lower())
-
-        if not api_key_obj:
+        if not api_key_objs:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="API key not found.",
             )
 
+        api_key_obj: RedisApiKey = api_key_objs[0]
         api_key = api_key_obj.get("key")
+        api_key_local_cache.set(user_uuid, provider_name, api_key)
 
-        await self.redis_client.expire(
-            redis_key, settings.REDIS_API_KEYS_EXPIRE_IN_SEC
-        )
-
-        fernet_key = Fernet(settings.FERNET_MASTER_KEY)
-
-        decrypted_api_key = fernet_key.decrypt(
-            passphrase_util.convert_hex_to_bytes(api_key)
-        ).decode()
+        decrypted_api_key = master_fernet_key.decrypt(api_key).decode()
 
         return decrypted_api_key
 
@@ -148,23 +174,187 @@ class RedisService:
             None
         """
 
-        redis_key = f"user:{user_uuid}"
+        api_key_local_cache.invalidate(user_uuid)
+
+        # Deleting a key that does not exist is a no-op, so there is no need to check for it first.
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(get_redis_key("user", user_uuid))
+            pipe.publish(API_KEYS_INVALIDATION_CHANNEL, user_uuid)
+            await pipe.execute()
+
+    @staticmethod
+    def _get_passphrase_digest(passphrase: str, passphrase_salt: str) -> str:
+        """
+        Create a digest of the passphrase, keyed by its salt, so a cached derived key can be matched against the
+        passphrase without storing the passphrase itself.
+
+        Args:
+            passphrase (str): The user's passphrase.
+            passphrase_salt (str): The passphrase's salt in hexadecimal.
+
+        Returns:
+            str: The digest in hexadecimal.
+        """
+
+        return hmac.new(
+            passphrase_salt.encode(), passphrase.encode(), hashlib.sha256
+        ).hexdigest()
+
+    async def set_user_derived_key_in_cache(
+        self,
+        user_uuid: str,
+        passphrase: str,
+        passphrase_salt: str,
+        derived_key: bytes,
+    ) -> None:
+        """
+        Set the key derived from the user's passphrase in Redis for the user's session.
+        The entry is encrypted with the master key and is not extended on use.
+
+        Args:
+            user_uuid (str): The user's UUID.
+            passphrase (str): The user's passphrase.
+            passphrase_salt (str): The passphrase's salt in hexadecimal.
+            derived_key (bytes): The key derived from the passphrase.
+
+        Returns:
+            None
+        """
+
+        user_data: RedisDerivedKey = {
+            "key": derived_key.decode(),
+            "passphrase_salt": passphrase_salt,
+            "passphrase_digest": self._get_passphrase_digest(
+                passphrase, passphrase_salt
+            ),
+        }
+
+        await self.redis_client.set(
+            get_redis_key("derived-key", user_uuid),
+            master_fernet_key.encrypt(json.dumps(user_data).encode()).decode(),
+            ex=settings.REDIS_DERIVED_KEY_EXPIRE_IN_SEC,
+        )
+
+    async def get_user_derived_key_from_cache(
+        self, user_uuid: str, passphrase: str, passphrase_salt: str
+    ) -> bytes | None:
+        """
+        Retrieve the key derived from the user's passphrase for the user's session.
+
+        The key is only returned if it was derived from the same passphrase and salt, so a changed passphrase (e.g. in
+        another session) makes the cached key unusable.
+
+        Args:
+            user_uuid (str): The user's UUID.
+            passphrase (str): The user's passphrase.
+            passphrase_salt (str): The passphrase's current salt in hexadecimal.
+
+        Returns:
+            bytes | None: The derived key or None if it is not cached or does not match the passphrase.
+        """
+
+        encrypted_user_data = await self.redis_client.get(
+            get_redis_key("derived-key", user_uuid)
+        )
+
+        if encrypted_user_data is None:
+            return None
+
+        try:
+            user_data: RedisDerivedKey = json.loads(
+                master_fernet_key.decrypt(encrypted_user_data)
+            )
+        except InvalidToken:
+            return None
+
+        if not hmac.compare_digest(
+            user_data["passphrase_salt"], passphrase_salt
+        ) or not hmac.compare_digest(
+            user_data["passphrase_digest"],
+            self._get_passphrase_digest(passphrase, passphrase_salt),
+        ):
+            return None
+
+        return user_data["key"].encode()
+
+    async def delete_user_derived_key_from_cache(self, user_uuid: str) -> None:
+        """
+        Delete the key derived from the user's passphrase from Redis.
+
+        Args:
+            user_uuid (str): The user's UUID.
+
+        Returns:
+            None
+        """
+
+        await self.redis_client.delete(get_redis_key("derived-key", user_uuid))
+
+    async def set_gemini_file_in_cache(
+        self,
+        api_key: str,
+        s3_key: str,
+        gemini_file: RedisGeminiFile,
+        expire_in_sec: int,
+    ) -> None:
+        """
+        Set the Gemini file uploaded from an S3 object in Redis.
+        Gemini files are only visible to the project of the API key that uploaded them, so the entry is stored per API
+        key. An empty entry records that the S3 object does not exist.
+
+        Args:
+            api_key (str): The Gemini API key that uploaded the file.
+            s3_key (str): The S3 key of the uploaded object.
+            gemini_file (RedisGeminiFile): The Gemini file's URI and MIME type, or an empty dictionary.
+            expire_in_sec (int): The time in seconds after which the entry expires.
+
+        Returns:
+            None
+        """
+
+        await self.redis_client.set(
+            self._get_gemini_file_redis_key(api_key, s3_key),
+            json.dumps(gemini_file),
+            ex=expire_in_sec,
+        )
 
-        if not await self.is_redis_key_present(redis_key):
-            return
+    async def get_gemini_file_from_cache(
+        self, api_key: str, s3_key: str
+    ) -> RedisGeminiFile | None:
+        """
+        Retrieve the Gemini file uploaded from an S3 object by the API key.
 
-        await self.redis_client.delete(redis_key)
+        Args:
+            api_key (str): The Gemini API key.
+            s3_key (str): The S3 key of the object.
 
-    async def is_redis_key_present(self, redis_key: str) -> bool:
+        Returns:
+            RedisGeminiFile | None: The Gemini file's URI and MIME type, an empty dictionary if the S3 object is known
+                not to exist, or None if nothing is cached.
         """
-        Checks if a given key exists in Redis.
+
+        gemini_file = await self.redis_client.get(
+            self._get_gemini_file_redis_key(api_key, s3_key)
+        )
+
+        if gemini_file is None:
+            return None
+
+        return json.loads(gemini_file)
+
+    @staticmethod
+    def _get_gemini_file_redis_key(api_key: str, s3_key: str) -> str:
+        """
+        Build the Redis key of a Gemini file, so the raw API key is not stored in Redis.
 
         Args:
-            redis_key (str): The Redis key to check for existence.
+            api_key (str): The Gemini API key.
+            s3_key (str): The S3 key of the object.
 
         Returns:
-            bool: True if the key exists, False otherwise.
+            str: The Redis key.
         """
 
-        # Redis `exists` command returns 1 if the key exists or 0 if it does not.
-        return await self.redis_client.exists(redis_key) == 1
+        return get_redis_key(
+            "gemini-file", hashlib.sha256(api_key.encode()).hexdigest(), s3_key
+        )
@@ -0,0 +1,98 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+
+
+# The multipart boundaries and the headers of the form's parts are sent along with the file.
+MULTIPART_OVERHEAD_IN_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects file uploads above the maximum upload size with 413 while their request bodies are received.
+
+    FastAPI parses (and spools to disk) the whole multipart body before the route runs, so the size check of the
+    uploaded file comes too late to protect the server. A request whose Content-Length is too large is rejected before
+    its body is read, and a body sent without Content-Length is counted while it is received.
+    """
+
+    def __init__(self, app: ASGIApp, max_file_size: int) -> None:
+        """
+        Initializes the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            max_file_size (int): The maximum size of an uploaded file in bytes.
+
+        Returns:
+            None
+        """
+
+        self.app = app
+        self.max_file_size = max_file_size
+        self.max_body_size = max_file_size + MULTIPART_OVERHEAD_IN_BYTES
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """
+        Pass the request on to the application, limiting the size of multipart request bodies.
+
+        Args:
+            scope (Scope): The connection's scope.
+            receive (Receive): The channel the request body is received from.
+            send (Send): The channel the response is sent to.
+
+        Returns:
+            None
+        """
+
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+
+        if not headers.get("content-type", "").startswith(
+            "multipart/form-data"
+        ):
+            return await self.app(scope, receive, send)
+
+        detail = (
+            "The file is too large. The maximum size is "
+            f"{self.max_file_size // (1024 * 1024)} MB."
+        )
+        content_length = headers.get("content-length", "")
+
+        if (
+            content_length.isdigit()
+            and int(content_length) > self.max_body_size
+        ):
+            response = JSONResponse(
+                {"detail": detail},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                headers={"Connection": "close"},
+            )
+            return await response(scope, receive, send)
+
+        received_size = 0
+
+        async def receive_with_limit() -> Message:
+            nonlocal received_size
+
+            message = await receive()
+
+            if message["type"] == "http.request":
+                received_size += len(message.get("body", b""))
+
+                # Raised inside the route while the form is parsed, so it is turned into a response like any other.
+                if received_size > self.max_body_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=detail,
+                    )
+
+            return message
+
+        await self.app(scope, receive_with_limit, send)
@@ -0,0 +1,46 @@
+from fastapi import APIRouter
+
+from src.auth.dependencies import AuthDependency
+from .dependencies import S3ServiceDependency
+
+from .schemas import (
+    S3PresignedUploadRequest,
+    S3PresignedUploadResponse,
+    S3ConfirmUploadRequest,
+    S3ConfirmUploadResponse,
+)
+
+
+router = APIRouter(prefix="/s3", tags=["s3"])
+
+
+@router.post("/presigned-upload", response_model=S3PresignedUploadResponse)
+async def create_presigned_upload(
+    auth: AuthDependency,
+    s3_service: S3ServiceDependency,
+    payload: S3PresignedUploadRequest,
+):
+    """
+    Create a presigned POST to upload an image directly to S3.
+    Once the image is uploaded, it has to be confirmed to get its URL.
+    """
+
+    return s3_service.create_presigned_upload(auth.user_id, payload)
+
+
+@router.post("/confirm-upload", response_model=S3ConfirmUploadResponse)
+async def confirm_upload(
+    auth: AuthDependency,
+    s3_service: S3ServiceDependency,
+    payload: S3ConfirmUploadRequest,
+):
+    """
+    Confirm that a chat image was uploaded directly to S3 and return the URL to use it in the chat message.
+    Avatars are confirmed with `/user/confirm-avatar-upload` instead.
+    """
+
+    file_url = await s3_service.confirm_upload(
+        auth.user_id, payload.key, ("openai-images", "gemini-images")
+    )
+
+    return S3ConfirmUploadResponse(file_url=file_url)
@@ -0,0 +1,32 @@
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+
+S3UploadFolder = Literal["avatars", "openai-images", "gemini-images"]
+
+S3UploadContentType = Literal[
+    "image/png", "image/jpeg", "image/webp", "image/gif"
+]
+
+
+class S3PresignedUploadRequest(BaseModel):
+    folder: S3UploadFolder
+    filename: Annotated[str, Field(min_length=1, max_length=255)]
+    content_type: Annotated[
+        S3UploadContentType, Field(validation_alias="contentType")
+    ]
+
+
+class S3PresignedUploadResponse(BaseModel):
+    url: str
+    fields: dict[str, str]
+    key: str
+
+
+class S3ConfirmUploadRequest(BaseModel):
+    key: Annotated[str, Field(min_length=1, max_length=1024)]
+
+
+class S3ConfirmUploadResponse(BaseModel):
+    file_url: Annotated[str, Field(serialization_alias="fileUrl")]
@@ -1,25 +1,48 @@
+import io
 import os
 import uuid
 import boto3
 import logging
 import urllib.parse
 
+from typing import BinaryIO
 from pathlib import Path
 
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import (
+    ClientError,
     NoCredentialsError,
     PartialCredentialsError,
     NoRegionError,
 )
 
 from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from src.core.config import settings
 
+from .schemas import (
+    S3UploadFolder,
+    S3PresignedUploadRequest,
+    S3PresignedUploadResponse,
+)
+
 
 logger = logging.getLogger(__name__)
 
 
+# Files above the chunk size are uploaded in parts, so at most a few chunks are held in memory at a time.
+transfer_config = TransferConfig(
+    multipart_threshold=settings.AWS_S3_MULTIPART_CHUNK_SIZE_IN_BYTES,
+    multipart_chunksize=settings.AWS_S3_MULTIPART_CHUNK_SIZE_IN_BYTES,
+    max_concurrency=4,
+)
+# boto3 does not accept the limit of the chunks read ahead into memory as an argument, and it defaults to 10 chunks.
+transfer_config.max_in_memory_upload_chunks = (
+    transfer_config.max_request_concurrency
+)
+
+
 class S3Service:
     """
     Service for AWS S3 related operations.
@@ -41,29 +64,59 @@ class S3Service:
         """
         Upload a file to AWS S3.
 
+        The file is streamed from its spooled temporary file in chunks in a worker thread, instead of being read into
+        memory on the event loop, and stored with its content type. Files above the maximum upload size are rejected
+        before anything is sent to S3. Request bodies that are too large are already rejected by
+        `UploadSizeLimitMiddleware` while they are received, so they are never spooled in full.
+
         Args:
             file (UploadFile): The file to upload.
             folder (str): The folder to upload the file to.
 
+        Raises:
+            HTTPException: Raised with status code 413 if the file is larger than the maximum upload size.
+            HTTPException: Raised with status code 500 if the upload fails.
+
         Returns:
             str: The URL of the uploaded file.
         """
 
-        try:
-            file_content = await file.read()
+        file_size = (
+            file.size
+            if file.size is not None
+            else await run_in_threadpool(self._get_file_size, file.file)
+        )
+
+        if file_size > settings.AWS_S3_MAX_UPLOAD_SIZE_IN_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=(
+                    "The file is too large. The maximum size is "
+                    f"{settings.AWS_S3_MAX_UPLOAD_SIZE_IN_BYTES // (1024 * 1024)} MB."
+                ),
+            )
 
+        try:
             unique_filename = (
                 f"{uuid.uuid4()}{os.path.splitext(file.filename)[1]}"
             )
             key = f"{folder}/{unique_filename}"
 
-            self.s3_resource.Bucket(settings.AWS_S3_BUCKET_NAME).put_object(
-                Key=key, Body=file_content
+            await file.seek(0)
+            await run_in_threadpool(
+                self.s3_resource.meta.client.upload_fileobj,
+                file.file,
+                settings.AWS_S3_BUCKET_NAME,
+                key,
+                ExtraArgs=(
+                    {"ContentType": file.content_type}
+                    if file.content_type
+                    else None
+                ),
+                Config=transfer_config,
             )
 
-            file_url = f"https://{settings.AWS_S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
-
-            return file_url
+            return self._get_file_url(key)
         except (NoCredentialsError, PartialCredentialsError) as e:
             self._handle_exception(
                 "AWS credentials not found or incomplete.", e
@@ -75,28 +128,211 @@ class S3Service:
         except Exception as e:
             self._handle_exception("An unexpected error occurred.", e)
 
-    def download_file_to_local(self, filename: str) -> str:
+    def create_presigned_upload(
+        self, user_id: int, payload: S3PresignedUploadRequest
+    ) -> S3PresignedUploadResponse:
         """
-        Download a file from AWS S3.
+        Create a presigned POST that lets the client upload a file directly to AWS S3.
+
+        The policy only accepts a file of the requested content type, up to the maximum upload size, tagged with the
+        user's ID, so the upload can be attributed to the user when it is confirmed.
 
         Args:
-            filename (str): The name of the file to download.
+            user_id (int): The user's ID.
+            payload (S3PresignedUploadRequest): The folder, the filename and the content type of the file.
+
+        Raises:
+            HTTPException: Raised with status code 500 if the presigned POST cannot be created.
 
         Returns:
-            str: The path to the downloaded file.
+            S3PresignedUploadResponse: The URL and the form fields to upload the file with and the file's key.
         """
 
         try:
-            download_path = (
-                Path(settings.AWS_S3_DOWNLOAD_PATH) / Path(filename).name
+            unique_filename = (
+                f"{uuid.uuid4()}{os.path.splitext(payload.filename)[1]}"
+            )
+            key = f"{payload.folder}/{unique_filename}"
+            fields = {
+                "Content-Type": payload.content_type,
+                "x-amz-meta-user-id": str(user_id),
+            }
+
+            presigned_post = (
+                self.s3_resource.meta.client.generate_presigned_post(
+                    Bucket=settings.AWS_S3_BUCKET_NAME,
+                    Key=key,
+                    Fields=fields,
+                    Conditions=[
+                        {"Content-Type": payload.content_type},
+                        {"x-amz-meta-user-id": str(user_id)},
+                        [
+                            "content-length-range",
+                            1,
+                            settings.AWS_S3_MAX_UPLOAD_SIZE_IN_BYTES,
+                        ],
+                    ],
+                    ExpiresIn=settings.AWS_S3_PRESIGNED_UPLOAD_EXPIRE_IN_SEC,
+                )
+            )
+
+            return S3PresignedUploadResponse(
+                url=presigned_post["url"],
+                fields=presigned_post["fields"],
+                key=key,
+            )
+        except (NoCredentialsError, PartialCredentialsError) as e:
+            self._handle_exception(
+                "AWS credentials not found or incomplete.", e
             )
-            download_path.parent.mkdir(parents=True, exist_ok=True)
+        except NoRegionError as e:
+            self._handle_exception(
+                "AWS region not found. Please check your configuration.", e
+            )
+        except Exception as e:
+            self._handle_exception("An unexpected error occurred.", e)
+
+    async def confirm_upload(
+        self, user_id: int, key: str, folders: tuple[S3UploadFolder, ...]
+    ) -> str:
+        """
+        Confirm that a file was uploaded directly to AWS S3 by the user and return its URL.
+
+        Args:
+            user_id (int): The user's ID.
+            key (str): The file's key returned along with the presigned POST.
+            folders (tuple[S3UploadFolder, ...]): The folders the file is allowed to be in.
+
+        Raises:
+            HTTPException: Raised with status code 404 if the file does not exist or was not uploaded by the user.
+            HTTPException: Raised with status code 500 if the file cannot be checked.
 
-            self.s3_resource.Bucket(settings.AWS_S3_BUCKET_NAME).download_file(
-                filename, str(download_path)
+        Returns:
+            str: The URL of the uploaded file.
+        """
+
+        not_found_exception = HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found."
+        )
+
+        if key.split("/", 1)[0] not in folders:
+            raise not_found_exception
+
+        try:
+            file_metadata = await run_in_threadpool(
+                self.s3_resource.meta.client.head_object,
+                Bucket=settings.AWS_S3_BUCKET_NAME,
+                Key=key,
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise not_found_exception
+            self._handle_exception("An unexpected error occurred.", e)
+        except (NoCredentialsError, PartialCredentialsError) as e:
+            self._handle_exception(
+                "AWS credentials not found or incomplete.", e
             )
+        except NoRegionError as e:
+            self._handle_exception(
+                "AWS region not found. Please check your configuration.", e
+            )
+        except Exception as e:
+            self._handle_exception("An unexpected error occurred.", e)
+
+        if file_metadata["Metadata"].get("user-id") != str(user_id):
+            raise not_found_exception
+
+        return self._get_file_url(key)
+
+    @staticmethod
+    def _get_file_url(key: str) -> str:
+        """
+        Get the public URL of a file in AWS S3.
+
+        Args:
+            key (str): The file's key.
+
+        Returns:
+            str: The URL of the file.
+        """
+
+        return f"https://{settings.AWS_S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+    @staticmethod
+    def _get_file_size(file: BinaryIO) -> int:
+        """
+        Get the size of a seekable file without reading it.
+
+        Args:
+            file (BinaryIO): The file.
+
+        Returns:
+            int: The size of the file in bytes.
+        """
+
+        file.seek(0, os.SEEK_END)
+        file_size = file.tell()
+        file.seek(0)
+
+        return file_size
+
+    def download_file_to_memory(
+        self, key: str, max_size: int = settings.AWS_S3_MAX_UPLOAD_SIZE_IN_BYTES
+    ) -> tuple[io.BytesIO, str | None]:
+        """
+        Download a file from AWS S3 into memory, without touching the local disk.
+
+        Args:
+            key (str): The key of the file to download.
+            max_size (int): The maximum size of the file in bytes. Defaults to the maximum upload size.
 
-            return str(download_path)
+        Raises:
+            HTTPException: Raised with status code 404 if the file does not exist.
+            HTTPException: Raised with status code 413 if the file is larger than the maximum size.
+            HTTPException: Raised with status code 500 if the download fails.
+
+        Returns:
+            tuple[io.BytesIO, str | None]: The file's content and its content type if it is known.
+        """
+
+        too_large_exception = HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="The file is too large.",
+        )
+
+        try:
+            s3_object = self.s3_resource.meta.client.get_object(
+                Bucket=settings.AWS_S3_BUCKET_NAME, Key=key
+            )
+            body = s3_object["Body"]
+
+            try:
+                if s3_object["ContentLength"] > max_size:
+                    raise too_large_exception
+
+                # The body is read in chunks and the size is checked again, in case the reported length is wrong.
+                file_content = io.BytesIO()
+
+                for chunk in body.iter_chunks(chunk_size=1024 * 1024):
+                    file_content.write(chunk)
+
+                    if file_content.tell() > max_size:
+                        raise too_large_exception
+            finally:
+                body.close()
+
+            file_content.seek(0)
+
+            return file_content, s3_object.get("ContentType")
+        except HTTPException:
+            raise
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="File not found.",
+                )
+            self._handle_exception("An unexpected error occurred.", e)
         except (NoCredentialsError, PartialCredentialsError) as e:
             self._handle_exception(
                 "AWS credentials not found or incomplete.", e
@@ -140,20 +376,6 @@ class S3Service:
         except Exception as e:
             self._handle_exception("An unexpected error occurred.", e)
 
-    def delete_local_file(self, local_path: str) -> None:
-        """
-        Delete a local file from the specified download path.
-
-        Args:
-            local_path (str): The path to the local file to delete.
-        """
-
-        try:
-            file_path = Path(local_path)
-            file_path.unlink(missing_ok=True)
-        except Exception as e:
-            self._handle_exception("Failed to delete local file {filename}.", e)
-
     @staticmethod
     def extract_s3_key_from_url(file_url: str) -> str:
         """
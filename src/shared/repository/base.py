@@ -1,7 +1,8 @@
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm import load_only
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class BaseRepository[T]:
@@ -11,12 +12,12 @@ class BaseRepository[T]:
     All repositories should inherit from this class.
     """
 
-    def __init__(self, db: Session, model: type[T]) -> None:
+    def __init__(self, db: AsyncSession, model: type[T]) -> None:
         """
         Initialize the repository with a database session.
 
         Args:
-            db (Session): Database session.
+            db (AsyncSession): Database session.
 
         Returns:
             None
@@ -25,7 +26,7 @@ class BaseRepository[T]:
         self.db = db
         self.model = model
 
-    def create(self, payload: dict) -> None:
+    async def create(self, payload: dict) -> None:
         """
         Create a new record in the database.
 
@@ -37,9 +38,9 @@ class BaseRepository[T]:
         """
 
         self.db.add(self.model(**payload))
-        self.db.commit()
+        await self.db.commit()
 
-    def get_one_by_id(self, entity_id: int) -> T:
+    async def get_one_by_id(self, entity_id: int) -> T:
         """
         Get an entity from the database by its ID.
 
@@ -50,9 +51,9 @@ class BaseRepository[T]:
             T: The entity retrieved from the database.
         """
 
-        return self.db.get_one(self.model, entity_id)
+        return await self.db.get_one(self.model, entity_id)
 
-    def get_one_with_selected_attributes_by_condition(
+    async def get_one_with_selected_attributes_by_condition(
         self,
         attributes_to_fetch: list[str],
         filter_attribute: str,
@@ -75,13 +76,13 @@ class BaseRepository[T]:
         ]
         filter_column = getattr(self.model, filter_attribute)
 
-        return self.db.scalar(
+        return await self.db.scalar(
             select(self.model)
             .options(load_only(*selected_attributes, raiseload=True))
             .where(filter_column == filter_value)
         )
 
-    def delete_by_id(self, entity_id: int | UUID) -> None:
+    async def delete_by_id(self, entity_id: int | UUID) -> None:
         """
         Delete an entity from the database by its ID.
 
@@ -92,5 +93,5 @@ class BaseRepository[T]:
             None
         """
 
-        self.db.delete(self.db.get_one(self.model, entity_id))
-        self.db.commit()
+        await self.db.delete(await self.db.get_one(self.model, entity_id))
+        await self.db.commit()
@@ -38,3 +38,11 @@ class ChatHistoryCompletionResponse(BaseModel):
     message: str
     room_uuid: Annotated[UUID, Field(serialization_alias="roomUuid")]
     api_provider_id: Annotated[int, Field(serialization_alias="apiProviderId")]
+
+
+class ChatHistoryCompletionChunk(BaseModel):
+    message: str
+
+
+class ChatHistoryCompletionStreamError(BaseModel):
+    detail: str
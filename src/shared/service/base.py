@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from sqlalchemy.exc import NoResultFound
 
 from fastapi import HTTPException, status, UploadFile
+from fastapi.responses import StreamingResponse
 
 from src.shared.repository.base import BaseRepository
 from src.shared.schemas import (
@@ -35,7 +36,7 @@ class BaseService[T: BaseRepository]:
         self.repository = repository
 
     # TODO: Add type hints for the return type
-    def get_one_by_id(self, entity_id: int):
+    async def get_one_by_id(self, entity_id: int):
         """
         Get an entity by its ID.
 
@@ -47,14 +48,14 @@ class BaseService[T: BaseRepository]:
         """
 
         try:
-            return self.repository.get_one_by_id(entity_id)
+            return await self.repository.get_one_by_id(entity_id)
         except NoResultFound:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Entity with ID {entity_id} not found",
             )
 
-    def delete_by_id(self, entity_id: int) -> None:
+    async def delete_by_id(self, entity_id: int) -> None:
         """
         Delete an entity by its ID.
 
@@ -69,7 +70,7 @@ class BaseService[T: BaseRepository]:
         """
 
         try:
-            self.repository.delete_by_id(entity_id)
+            await self.repository.delete_by_id(entity_id)
         except NoResultFound:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -81,30 +82,31 @@ class BaseAiService(ABC):
     """
     Base abstract class for AI services.
 
-    All AI services should inherit from this class.
+    All AI services should inherit from this class and be registered in `src.ai_provider.registry`.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, s3_service, redis_service) -> None:
         """
         Initialize the service.
 
+        Args:
+            s3_service: The S3 service dependency.
+            redis_service: The Redis service dependency.
+
         Returns:
             None
         """
 
+        self.s3_service = s3_service
+        self.redis_service = redis_service
+
     @staticmethod
-    @abstractmethod
-    async def get_api_key(auth, redis_service, api_provider_name: str) -> str:
+    async def close_clients() -> None:
         """
-        Retrieve an API key for a user based on the API provider name.
-
-        Args:
-            auth: The authentication dependency.
-            redis_service: The Redis service dependency.
-            api_provider_name (str): The name of the API provider.
+        Close the API provider's clients that are shared between requests.
 
         Returns:
-            str: The API key for the user.
+            None
         """
 
         pass
@@ -149,3 +151,26 @@ class BaseAiService(ABC):
         """
 
         pass
+
+    @abstractmethod
+    async def chat_stream(
+        self,
+        user_id: int,
+        api_key: str,
+        chat_room_service,
+        payload: ChatHistoryCompletionRequest,
+    ) -> StreamingResponse:
+        """
+        Send a message to one of the available API provider's model and stream its response as server-sent events.
+
+        Args:
+            user_id (int): The user's ID.
+            api_key (str): The API provider's authentication key.
+            chat_room_service: The chat room service dependency.
+            payload (ChatHistoryCompletionRequest): The request payload.
+
+        Returns:
+            StreamingResponse: The server-sent events stream of the API provider's response.
+        """
+
+        pass
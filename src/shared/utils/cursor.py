@@ -0,0 +1,61 @@
+import json
+import base64
+import binascii
+
+from fastapi import HTTPException, status
+
+
+class CursorUtil:
+    """
+    A utility class for encoding and decoding opaque pagination cursors.
+    """
+
+    @staticmethod
+    def encode_cursor(values: list[str]) -> str:
+        """
+        Encodes the values of the last item on a page into a cursor.
+
+        Args:
+            values (list[str]): The values of the keyset columns, e.g. the timestamp and the ID of the last item.
+
+        Returns:
+            str: The URL-safe cursor.
+        """
+
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, length: int) -> list[str]:
+        """
+        Decodes a cursor back into the values of the keyset columns.
+
+        Args:
+            cursor (str): The cursor to decode.
+            length (int): The expected number of values in the cursor.
+
+        Raises:
+            HTTPException: Raised with status code 400 if the cursor is malformed.
+
+        Returns:
+            list[str]: The values of the keyset columns.
+        """
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError):
+            values = None
+
+        if (
+            not isinstance(values, list)
+            or len(values) != length
+            or not all(isinstance(value, str) for value in values)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor.",
+            )
+
+        return values
+
+
+cursor_util = CursorUtil()
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from src.metrics.service import metrics
+
+
+class BoundedExecutor:
+    """
+    A thread pool with a fixed number of workers for CPU-heavy work that has to be kept off the event loop.
+
+    Work waiting for a free worker, work being run and the time spent waiting are reported to the metrics registry
+    under the executor's name, so saturation of the pool is visible. Optionally, new work is rejected once too much
+    of it is waiting, so a burst of requests fails fast instead of piling up behind the workers.
+    """
+
+    def __init__(
+        self, name: str, max_workers: int, max_pending: int | None = None
+    ) -> None:
+        """
+        Initializes the executor.
+
+        Args:
+            name (str): The name of the executor used in the metric names and worker thread names.
+            max_workers (int): The maximum number of tasks run concurrently.
+            max_pending (int | None): The maximum number of tasks queued or running at once, or None for no limit.
+                Defaults to None.
+
+        Returns:
+            None
+        """
+
+        self.name = name
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+
+    async def run[T](self, func: Callable[..., T], *args) -> T:
+        """
+        Run a function in the executor and wait for its result without blocking the event loop.
+
+        Args:
+            func (Callable[..., T]): The function to run.
+            *args: The positional arguments passed to the function.
+
+        Raises:
+            HTTPException: Raised with status code 503 if the executor already has the maximum number of pending tasks.
+
+        Returns:
+            T: The function's return value.
+        """
+
+        queued = metrics.gauge(f"executor.{self.name}.queued")
+        running = metrics.gauge(f"executor.{self.name}.running")
+
+        if (
+            self.max_pending is not None
+            and queued.value + running.value >= self.max_pending
+        ):
+            metrics.counter(f"executor.{self.name}.rejected").inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The server is busy. Please try again in a moment.",
+                headers={"Retry-After": "1"},
+            )
+
+        submitted_at = time.perf_counter()
+
+        def run_func() -> T:
+            queued.dec()
+            running.inc()
+            metrics.timer(f"executor.{self.name}.wait_latency").observe(
+                time.perf_counter() - submitted_at
+            )
+
+            try:
+                return func(*args)
+            finally:
+                running.dec()
+
+        queued.inc()
+
+        try:
+            future = self._executor.submit(run_func)
+        except RuntimeError:
+            queued.dec()
+            raise
+
+        # Work cancelled before a worker picked it up never runs, so it has to leave the queue here.
+        future.add_done_callback(
+            lambda done: queued.dec() if done.cancelled() else None
+        )
+
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """
+        Stop accepting new work and wait for the submitted work to finish.
+
+        Returns:
+            None
+        """
+
+        self._executor.shutdown(wait=True, cancel_futures=False)
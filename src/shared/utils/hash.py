@@ -1,14 +1,21 @@
 from passlib.context import CryptContext
 
+from src.core.config import settings
+
+from .executor import BoundedExecutor
+
 
 class HashUtil:
     """
     A utility class for hashing and verifying secrets.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, executor: BoundedExecutor) -> None:
         """
-        Initializes the hash utility class with the bcrypt context.
+        Initializes the hash utility class with the bcrypt context and the executor used for hashing.
+
+        Args:
+            executor (BoundedExecutor): The executor running the hashing off the event loop.
 
         Returns:
             None
@@ -17,6 +24,7 @@ class HashUtil:
         self.bcrypt_context = CryptContext(
             schemes=["bcrypt"], deprecated="auto"
         )
+        self.executor = executor
 
     def create_hash(self, secret: str) -> str:
         """
@@ -45,5 +53,44 @@ class HashUtil:
 
         return self.bcrypt_context.verify(secret, compare_hash)
 
+    async def create_hash_async(self, secret: str) -> str:
+        """
+        Creates a hash from a secret in the hashing executor, without blocking the event loop.
+
+        Args:
+            secret (str): The secret to hash.
+
+        Raises:
+            HTTPException: Raised with status code 503 if too many secrets are being hashed at the moment.
+
+        Returns:
+            str: The hashed secret.
+        """
+
+        return await self.executor.run(self.create_hash, secret)
+
+    async def verify_hash_async(self, secret: str, compare_hash: str) -> bool:
+        """
+        Verifies a secret against a hash in the hashing executor, without blocking the event loop.
+
+        Args:
+            secret (str): The secret to verify.
+            compare_hash (str): The hash to compare the secret against.
+
+        Raises:
+            HTTPException: Raised with status code 503 if too many secrets are being hashed at the moment.
+
+        Returns:
+            bool: Whether the secret matches the hash.
+        """
+
+        return await self.executor.run(self.verify_hash, secret, compare_hash)
+
 
-hash_util = HashUtil()
+hash_util = HashUtil(
+    BoundedExecutor(
+        "bcrypt",
+        max_workers=settings.BCRYPT_MAX_WORKERS,
+        max_pending=settings.BCRYPT_MAX_PENDING,
+    )
+)
@@ -1,12 +1,13 @@
 import os
 import base64
 import string
+import hashlib
 import secrets
 import binascii
 
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from src.core.config import settings
+
+from .executor import BoundedExecutor
 
 
 class PassphraseUtil:
@@ -15,6 +16,19 @@ class PassphraseUtil:
     salts, converting bytes to hex and vice versa.
     """
 
+    def __init__(self, executor: BoundedExecutor) -> None:
+        """
+        Initializes the passphrase utility class with the executor used for key derivation.
+
+        Args:
+            executor (BoundedExecutor): The executor running the key derivation off the event loop.
+
+        Returns:
+            None
+        """
+
+        self.executor = executor
+
     @staticmethod
     def convert_bytes_to_hex(data: bytes) -> str:
         """
@@ -80,25 +94,50 @@ class PassphraseUtil:
         return salt
 
     @staticmethod
-    def generate_fernet_key(passphrase: bytes, salt: bytes) -> Fernet:
+    def derive_key(passphrase: bytes, salt: bytes) -> bytes:
         """
-        Generates a Fernet key from a passphrase and salt.
+        Derives a URL-safe base64-encoded Fernet key from a passphrase and salt.
 
         Args:
-            passphrase (bytes): The passphrase to generate the key from.
-            salt (bytes): The salt to use in the key generation.
+            passphrase (bytes): The passphrase to derive the key from.
+            salt (bytes): The salt to use in the key derivation.
 
         Returns:
-            bytes: The generated key.
+            bytes: The derived key.
         """
 
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(), length=32, salt=salt, iterations=600000
+        # hashlib releases the GIL while deriving the key, so concurrent derivations in threads run in parallel.
+        key = base64.urlsafe_b64encode(
+            hashlib.pbkdf2_hmac(
+                "sha256", passphrase, salt, iterations=600000, dklen=32
+            )
         )
-        key = base64.urlsafe_b64encode(kdf.derive(passphrase))
 
-        f_key = Fernet(key)
-        return f_key
+        return key
+
+    async def derive_key_async(self, passphrase: bytes, salt: bytes) -> bytes:
+        """
+        Derives a URL-safe base64-encoded Fernet key from a passphrase and salt in the key derivation executor, without
+        blocking the event loop.
+
+        Args:
+            passphrase (bytes): The passphrase to derive the key from.
+            salt (bytes): The salt to use in the key derivation.
+
+        Raises:
+            HTTPException: Raised with status code 503 if too many keys are being derived at the moment.
+
+        Returns:
+            bytes: The derived key.
+        """
+
+        return await self.executor.run(self.derive_key, passphrase, salt)
 
 
-passphrase_util = PassphraseUtil()
+passphrase_util = PassphraseUtil(
+    BoundedExecutor(
+        "pbkdf2",
+        max_workers=settings.PBKDF2_MAX_WORKERS,
+        max_pending=settings.PBKDF2_MAX_PENDING,
+    )
+)
@@ -1,5 +1,5 @@
 from sqlalchemy import update
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Depends
 
@@ -16,12 +16,12 @@ class UserRepository(BaseRepository[User]):
     Repository for user database related operations.
     """
 
-    def __init__(self, db: Session = Depends(get_db)) -> None:
+    def __init__(self, db: AsyncSession = Depends(get_db)) -> None:
         """
         Initialize the repository with a database session.
 
         Args:
-            db (Session): Database session.
+            db (AsyncSession): Database session.
 
         Returns:
             None
@@ -29,7 +29,7 @@ class UserRepository(BaseRepository[User]):
 
         super().__init__(db, User)
 
-    def update_password_by_id(
+    async def update_password_by_id(
         self, user_id: int, hashed_new_password: str
     ) -> None:
         """
@@ -43,14 +43,14 @@ class UserRepository(BaseRepository[User]):
             None
         """
 
-        self.db.execute(
+        await self.db.execute(
             update(self.model)
             .where(self.model.id == user_id)
             .values({self.model.password: hashed_new_password})
         )
-        self.db.commit()
+        await self.db.commit()
 
-    def update_profile_by_id(self, user_id: int, payload: dict) -> None:
+    async def update_profile_by_id(self, user_id: int, payload: dict) -> None:
         """
         Update the user's profile by user id.
 
@@ -62,12 +62,14 @@ class UserRepository(BaseRepository[User]):
             None
         """
 
-        self.db.execute(
+        await self.db.execute(
             update(self.model).where(self.model.id == user_id).values(payload)
         )
-        self.db.commit()
+        await self.db.commit()
 
-    def update_passphrase_by_id(self, user_id: int, payload: dict) -> None:
+    async def update_passphrase_by_id(
+        self, user_id: int, payload: dict
+    ) -> None:
         """
         Update the user's passphrase and salt by user id.
 
@@ -79,7 +81,7 @@ class UserRepository(BaseRepository[User]):
             None
         """
 
-        self.db.execute(
+        await self.db.execute(
             update(self.model).where(self.model.id == user_id).values(payload)
         )
-        self.db.commit()
+        await self.db.commit()
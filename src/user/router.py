@@ -7,6 +7,7 @@ from src.api_key.dependencies import ApiKeyServiceDependency
 from src.redis.dependencies import RedisServiceDependency
 from .dependencies import UserServiceDependency
 
+from src.s3.schemas import S3ConfirmUploadRequest
 from .schemas import (
     UserUpdatePasswordRequest,
     UserUpdateProfileRequest,
@@ -30,7 +31,7 @@ async def get_user_profile(
     Get the user's profile by user ID.
     """
 
-    return user_service.get_profile(auth.user_id)
+    return await user_service.get_profile(auth.user_id)
 
 
 # TODO: Validate image file
@@ -48,6 +49,21 @@ async def upload_user_avatar(
     return await user_service.upload_user_avatar(auth.user_id, avatar)
 
 
+@router.post("/confirm-avatar-upload", response_model=UserUploadAvatarResponse)
+async def confirm_user_avatar_upload(
+    auth: AuthDependency,
+    user_service: UserServiceDependency,
+    payload: S3ConfirmUploadRequest,
+):
+    """
+    Confirm the user's avatar uploaded directly to S3 with a presigned POST and return its URL.
+    """
+
+    return await user_service.confirm_user_avatar_upload(
+        auth.user_id, payload.key
+    )
+
+
 @router.patch("/update-password", response_model=UserUpdatePasswordResponse)
 async def update_user_password(
     auth: AuthDependency,
@@ -58,7 +74,7 @@ async def update_user_password(
     Update the user's password by user ID.
     """
 
-    return user_service.update_user_password(auth.user_id, payload)
+    return await user_service.update_user_password(auth.user_id, payload)
 
 
 @router.patch("/update-profile", response_model=UserUpdateProfileResponse)
@@ -86,9 +102,10 @@ async def update_user_passphrase(
     generated passphrase for the user so that they can save it in a secure place.
     """
 
-    passphrase = user_service.update_user_passphrase(auth.user_id)
+    passphrase = await user_service.update_user_passphrase(auth.user_id)
 
-    api_key_service.delete_user_api_keys(auth.user_id)
+    await api_key_service.delete_user_api_keys(auth.user_id)
     await redis_service.delete_user_api_keys_from_cache(auth.uuid)
+    await redis_service.delete_user_derived_key_from_cache(auth.uuid)
 
     return passphrase
@@ -1,6 +1,7 @@
 from sqlalchemy.exc import IntegrityError
 
 from fastapi import Depends, HTTPException, status, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from src.shared.utils.hash import hash_util
 from src.shared.utils.passphrase import passphrase_util
@@ -43,7 +44,7 @@ class UserService(BaseService[UserRepository]):
         super().__init__(repository)
         self.s3_service = s3_service
 
-    def get_profile(self, user_id: int) -> UserProfileResponse:
+    async def get_profile(self, user_id: int) -> UserProfileResponse:
         """
         Get a user's profile by ID.
 
@@ -54,8 +55,10 @@ class UserService(BaseService[UserRepository]):
             UserProfileResponse: The user's profile response containing the user's email, name, avatar and passphrase.
         """
 
-        user = self.repository.get_one_with_selected_attributes_by_condition(
-            ["email", "name", "avatar", "passphrase"], "id", user_id
+        user = (
+            await self.repository.get_one_with_selected_attributes_by_condition(
+                ["email", "name", "avatar", "passphrase"], "id", user_id
+            )
         )
 
         if not user:
@@ -86,8 +89,10 @@ class UserService(BaseService[UserRepository]):
             UserUploadAvatarResponse: The response containing the URL of the uploaded avatar.
         """
 
-        user = self.repository.get_one_with_selected_attributes_by_condition(
-            ["avatar"], "id", user_id
+        user = (
+            await self.repository.get_one_with_selected_attributes_by_condition(
+                ["avatar"], "id", user_id
+            )
         )
 
         if not user:
@@ -96,13 +101,55 @@ class UserService(BaseService[UserRepository]):
             )
 
         if user.avatar:
-            self.s3_service.delete_file(user.avatar)
+            await run_in_threadpool(self.s3_service.delete_file, user.avatar)
 
         avatar_url = await self.s3_service.upload_file(avatar, "avatars")
 
         return UserUploadAvatarResponse(avatar=avatar_url)
 
-    def update_user_password(
+    async def confirm_user_avatar_upload(
+        self, user_id: int, key: str
+    ) -> UserUploadAvatarResponse:
+        """
+        Confirm a user's avatar uploaded directly to S3, save it as the user's avatar and delete the previous one.
+
+        Args:
+            user_id (int): The ID of the user to update.
+            key (str): The avatar's key returned along with the presigned POST.
+
+        Raises:
+            HTTPException: Raised with status code 404 if the user or the uploaded avatar is not found.
+
+        Returns:
+            UserUploadAvatarResponse: The response containing the URL of the uploaded avatar.
+        """
+
+        user = (
+            await self.repository.get_one_with_selected_attributes_by_condition(
+                ["avatar"], "id", user_id
+            )
+        )
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found."
+            )
+
+        avatar_url = await self.s3_service.confirm_upload(
+            user_id, key, ("avatars",)
+        )
+
+        await self.repository.update_profile_by_id(
+            user_id, {"avatar": avatar_url}
+        )
+
+        # The previous avatar is deleted only once the new one is saved, so the user is never left without one.
+        if user.avatar and user.avatar != avatar_url:
+            await run_in_threadpool(self.s3_service.delete_file, user.avatar)
+
+        return UserUploadAvatarResponse(avatar=avatar_url)
+
+    async def update_user_password(
         self, user_id: int, payload: UserUpdatePasswordRequest
     ) -> UserUpdatePasswordResponse:
         """
@@ -121,15 +168,17 @@ class UserService(BaseService[UserRepository]):
                 Message can be customized, but defaults to the one in the schema.
         """
 
-        user = self.repository.get_one_with_selected_attributes_by_condition(
-            ["password"], "id", user_id
+        user = (
+            await self.repository.get_one_with_selected_attributes_by_condition(
+                ["password"], "id", user_id
+            )
         )
 
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found."
             )
-        if not hash_util.verify_hash(
+        if not await hash_util.verify_hash_async(
             payload.current_password.get_secret_value(), user.password
         ):
             raise HTTPException(
@@ -137,11 +186,13 @@ class UserService(BaseService[UserRepository]):
                 detail="Please check your credentials and try again.",
             )
 
-        hashed_new_password = hash_util.create_hash(
+        hashed_new_password = await hash_util.create_hash_async(
             payload.new_password.get_secret_value()
         )
 
-        self.repository.update_password_by_id(user_id, hashed_new_password)
+        await self.repository.update_password_by_id(
+            user_id, hashed_new_password
+        )
         return UserUpdatePasswordResponse()
 
     async def update_user_profile(
@@ -163,8 +214,10 @@ class UserService(BaseService[UserRepository]):
             UserUpdateProfileResponse: The response containing a message of the operation status and the updated fields.
         """
 
-        user = self.repository.get_one_with_selected_attributes_by_condition(
-            ["name", "email"], "id", user_id
+        user = (
+            await self.repository.get_one_with_selected_attributes_by_condition(
+                ["name", "email"], "id", user_id
+            )
         )
 
         if not user:
@@ -189,7 +242,9 @@ class UserService(BaseService[UserRepository]):
 
         if is_updated:
             try:
-                self.repository.update_profile_by_id(user_id, updated_fields)
+                await self.repository.update_profile_by_id(
+                    user_id, updated_fields
+                )
             except IntegrityError:
                 # Pass the exception to prevent leaking sensitive information like already existing email
                 pass
@@ -205,7 +260,7 @@ class UserService(BaseService[UserRepository]):
 
         return UserUpdateProfileResponse(**updated_fields)
 
-    def update_user_passphrase(
+    async def update_user_passphrase(
         self, user_id: int
     ) -> UserUpdatePassphraseResponse:
         """
@@ -223,9 +278,9 @@ class UserService(BaseService[UserRepository]):
         passphrase_salt = passphrase_util.convert_bytes_to_hex(
             passphrase_util.generate_salt()
         )
-        hashed_passphrase = hash_util.create_hash(passphrase)
+        hashed_passphrase = await hash_util.create_hash_async(passphrase)
 
-        self.repository.update_passphrase_by_id(
+        await self.repository.update_passphrase_by_id(
             user_id,
             {
                 "passphrase": hashed_passphrase,
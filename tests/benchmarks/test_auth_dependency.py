@@ -0,0 +1,75 @@
+"""
+Microbenchmark of the authentication dependency run by every authenticated request.
+
+The previous implementation decoded and verified the JWT with python-jose on every request. A token that was already
+validated is now served from the token cache.
+"""
+
+import timeit
+
+import pytest
+
+from jose import jwt
+
+from src.core.config import settings
+from src.auth import service as auth_service_module
+from src.auth.schemas import AuthCurrentUser
+from src.auth.service import AuthService
+from src.auth.token import TokenCache
+
+
+# python-jose calls datetime.utcnow() on every decode.
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning:jose")
+
+
+def run_coroutine(coroutine):
+    # The dependency does not await anything, so driving the coroutine by hand keeps the event loop out of the timing.
+    try:
+        coroutine.send(None)
+    except StopIteration as e:
+        return e.value
+
+    raise RuntimeError("The coroutine was suspended.")
+
+
+# The implementation before the change.
+async def get_current_user_without_cache(token: str) -> AuthCurrentUser:
+    payload = jwt.decode(
+        token, settings.JWT_AUTH_SECRET_KEY, algorithms=[settings.ALGORITHM]
+    )
+
+    return AuthCurrentUser(user_id=int(payload["sub"]), uuid=payload["uuid"])
+
+
+def test_jose_decode_of_every_token(benchmark):
+    token = AuthService._create_access_token(1)
+
+    current_user = benchmark(
+        lambda: run_coroutine(get_current_user_without_cache(token))
+    )
+
+    assert current_user.user_id == 1
+
+
+def test_cached_token_lookup(benchmark, monkeypatch):
+    monkeypatch.setattr(
+        auth_service_module, "token_cache", TokenCache(maxsize=8)
+    )
+    token = AuthService._create_access_token(1)
+
+    # The first request validates the token and caches it.
+    run_coroutine(AuthService.get_current_user(token))
+
+    current_user = benchmark(
+        lambda: run_coroutine(AuthService.get_current_user(token))
+    )
+    decode_time = min(
+        timeit.repeat(
+            lambda: run_coroutine(get_current_user_without_cache(token)),
+            number=200,
+            repeat=5,
+        )
+    )
+
+    assert current_user.user_id == 1
+    assert benchmark.stats.stats.min < decode_time / 200 / 5
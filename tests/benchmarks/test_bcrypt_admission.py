@@ -0,0 +1,98 @@
+"""
+Load test of a login burst mixed with chat traffic.
+
+The previous implementation verified the passwords on the event loop, so every chat request handled by the worker
+waited for the whole burst. The bounded bcrypt executor keeps the event loop free and rejects the logins above its
+admission limit with 503, instead of queueing them.
+"""
+
+import time
+import asyncio
+
+import pytest
+
+from fastapi import HTTPException, status
+
+from src.shared.utils.hash import HashUtil
+from src.shared.utils.executor import BoundedExecutor
+
+
+PASSWORD = "password"
+LOGINS = 24
+CHATS = 20
+CHAT_DURATION_IN_SEC = 0.05
+MAX_WORKERS = 2
+MAX_PENDING = 8
+
+
+@pytest.fixture
+def hash_util():
+    executor = BoundedExecutor(
+        "bcrypt-load-test", max_workers=MAX_WORKERS, max_pending=MAX_PENDING
+    )
+
+    yield HashUtil(executor)
+
+    executor.shutdown()
+
+
+@pytest.fixture
+def password_hash(hash_util) -> str:
+    # Fewer rounds than the default keep the test short, while a verification still takes tens of milliseconds.
+    return hash_util.bcrypt_context.hash(PASSWORD, rounds=10)
+
+
+async def chat(arrived_at: float) -> float:
+    # Stands in for a chat request awaiting the LLM provider's response.
+    await asyncio.sleep(CHAT_DURATION_IN_SEC)
+
+    return time.perf_counter() - arrived_at
+
+
+async def run_mixed_load(login) -> tuple[list, list[float]]:
+    # The logins and the chats arrive at the same time.
+    arrived_at = time.perf_counter()
+    logins = [asyncio.create_task(login()) for _ in range(LOGINS)]
+    chat_latencies = await asyncio.gather(
+        *(chat(arrived_at) for _ in range(CHATS))
+    )
+    login_results = await asyncio.gather(*logins, return_exceptions=True)
+
+    return login_results, chat_latencies
+
+
+async def test_blocking_logins_stall_chat_traffic(hash_util, password_hash):
+    # The implementation before the change.
+    async def login() -> bool:
+        return hash_util.verify_hash(PASSWORD, password_hash)
+
+    start = time.perf_counter()
+    login_results, chat_latencies = await run_mixed_load(login)
+    burst_elapsed = time.perf_counter() - start
+
+    assert all(login_results)
+    assert min(chat_latencies) > burst_elapsed / 2
+
+
+async def test_bcrypt_admission_keeps_chat_traffic_responsive(
+    hash_util, password_hash
+):
+    async def login() -> bool:
+        return await hash_util.verify_hash_async(PASSWORD, password_hash)
+
+    login_results, chat_latencies = await run_mixed_load(login)
+    rejected = [
+        result for result in login_results if isinstance(result, HTTPException)
+    ]
+
+    assert login_results[:MAX_PENDING] == [True] * MAX_PENDING
+    assert len(rejected) == LOGINS - MAX_PENDING
+    assert all(
+        result.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        and result.headers == {"Retry-After": "1"}
+        for result in rejected
+    )
+    assert max(chat_latencies) < CHAT_DURATION_IN_SEC * 3
+
+    # Once the admitted logins are done, new ones are accepted again.
+    assert await hash_util.verify_hash_async(PASSWORD, password_hash)
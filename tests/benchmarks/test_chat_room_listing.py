@@ -0,0 +1,115 @@
+"""
+Benchmark of listing a user's chat rooms with 500 rooms × 1,000 messages.
+
+The previous implementation joinedloaded the whole chat history of every room to read its last message. The lateral
+query fetches only the last message of the rooms on the requested page.
+"""
+
+import time
+
+import pytest
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.chat_room.models import ChatRoom
+from src.chat_room.repository import ChatRoomRepository
+
+
+ROOMS = 500
+MESSAGES_PER_ROOM = 1000
+PAGE_SIZE = 50
+
+
+@pytest.fixture
+async def seeded_database(migrated_database_url):
+    engine = create_async_engine(migrated_database_url)
+
+    async with engine.begin() as connection:
+        user_id = await connection.scalar(
+            text(
+                "INSERT INTO users (name, email, password, is_email_verified, is_password_reset_requested) "
+                "VALUES ('Benchmark', 'benchmark@example.com', 'password', false, false) RETURNING id"
+            )
+        )
+        api_provider_id = await connection.scalar(
+            text(
+                "INSERT INTO api_providers (name, lowercase_name, ai_models) "
+                "VALUES ('OpenAI', 'openai', ARRAY['gpt-4o']) RETURNING id"
+            )
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO chat_rooms (room_uuid, user_id) "
+                "SELECT gen_random_uuid(), :user_id FROM generate_series(1, :rooms)"
+            ),
+            {"user_id": user_id, "rooms": ROOMS},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO chat_history "
+                "(room_uuid, api_provider_id, role, ai_model, custom_instructions, message, sent_at) "
+                "SELECT room.room_uuid, :api_provider_id, "
+                "CASE WHEN n % 2 = 0 THEN 'assistant' ELSE 'user' END::roleenum, "
+                "'gpt_4o'::aimodelenum, 'You are a helpful assistant.', repeat('x', 200), "
+                "now() - random() * interval '30 days' "
+                "FROM chat_rooms AS room CROSS JOIN generate_series(1, :messages) AS n"
+            ),
+            {"api_provider_id": api_provider_id, "messages": MESSAGES_PER_ROOM},
+        )
+
+        await connection.execute(text("ANALYZE"))
+
+    yield engine, user_id
+
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "TRUNCATE users, api_providers, chat_rooms, chat_history CASCADE"
+            )
+        )
+
+    await engine.dispose()
+
+
+async def test_lateral_room_listing_is_faster_than_loading_the_history(
+    seeded_database,
+):
+    engine, user_id = seeded_database
+
+    async with AsyncSession(engine) as db:
+        # The implementation before the change.
+        start = time.perf_counter()
+        chat_rooms = (
+            (
+                await db.scalars(
+                    select(ChatRoom)
+                    .options(joinedload(ChatRoom.chat_history))
+                    .where(ChatRoom.user_id == user_id)
+                )
+            )
+            .unique()
+            .all()
+        )
+        last_messages = [chat_room.chat_history[-1] for chat_room in chat_rooms]
+        joinedload_elapsed = time.perf_counter() - start
+
+    async with AsyncSession(engine) as db:
+        start = time.perf_counter()
+        page = await ChatRoomRepository(db).get_page_by_user_id(
+            user_id, PAGE_SIZE
+        )
+        lateral_elapsed = time.perf_counter() - start
+
+        newest_message_sent_at = await db.scalar(
+            text("SELECT max(sent_at) FROM chat_history")
+        )
+
+    assert len(last_messages) == ROOMS
+    assert len(page) == PAGE_SIZE
+    assert page[0].sent_at == newest_message_sent_at
+    assert [row.sent_at for row in page] == sorted(
+        (row.sent_at for row in page), reverse=True
+    )
+    assert lateral_elapsed < joinedload_elapsed / 10
@@ -0,0 +1,62 @@
+"""
+Throughput comparison of the synchronous and the asynchronous database layer under concurrent load.
+
+Every simulated request runs a query that takes `QUERY_DURATION_IN_SEC` on the server. A blocking query stalls the
+event loop, so the requests handled by one worker run one at a time, while the awaited queries overlap.
+"""
+
+import time
+import asyncio
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+CONCURRENT_REQUESTS = 20
+QUERY_DURATION_IN_SEC = 0.05
+QUERY = text(f"SELECT pg_sleep({QUERY_DURATION_IN_SEC})")
+
+
+async def test_async_engine_serves_concurrent_requests_in_parallel(
+    database_url,
+):
+    sync_engine = create_engine(database_url, pool_size=CONCURRENT_REQUESTS)
+    async_engine = create_async_engine(
+        database_url, pool_size=CONCURRENT_REQUESTS
+    )
+
+    # The implementation before the change: a blocking query inside an async route.
+    async def sync_request() -> None:
+        with sync_engine.connect() as connection:
+            connection.execute(QUERY)
+
+    async def async_request() -> None:
+        async with async_engine.connect() as connection:
+            await connection.execute(QUERY)
+
+    try:
+        # Open the pools' connections up front, so only the queries are measured.
+        await asyncio.gather(
+            *(async_request() for _ in range(CONCURRENT_REQUESTS))
+        )
+        await asyncio.gather(
+            *(sync_request() for _ in range(CONCURRENT_REQUESTS))
+        )
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(sync_request() for _ in range(CONCURRENT_REQUESTS))
+        )
+        sync_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(async_request() for _ in range(CONCURRENT_REQUESTS))
+        )
+        async_elapsed = time.perf_counter() - start
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+    assert sync_elapsed >= CONCURRENT_REQUESTS * QUERY_DURATION_IN_SEC
+    assert async_elapsed < sync_elapsed / 4
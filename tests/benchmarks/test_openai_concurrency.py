@@ -0,0 +1,142 @@
+"""
+Load benchmark of OpenAI chat completions against a local fake OpenAI server.
+
+Every completion takes `RESPONSE_DELAY_IN_SEC` on the fake server. With the blocking client the completions of
+concurrent chats run one at a time, with the cached asynchronous client they overlap and reuse the connections.
+"""
+
+import time
+import socket
+import asyncio
+import threading
+
+import pytest
+import uvicorn
+
+from fastapi import FastAPI, Request
+
+from openai import OpenAI
+
+from src.shared.schemas import ChatHistoryCompletionRequest
+from src.openai import service as openai_service_module
+from src.openai.client import OpenAiClientCache
+from src.openai.service import OpenAiService
+
+
+CONCURRENT_CHATS = 10
+RESPONSE_DELAY_IN_SEC = 0.2
+
+
+def create_fake_openai_app(connections: set[tuple[str, int]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/chat/completions")
+    async def create_chat_completion(request: Request):
+        connections.add((request.client.host, request.client.port))
+        body = await request.json()
+        await asyncio.sleep(RESPONSE_DELAY_IN_SEC)
+
+        return {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "Hello!"},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def fake_openai_server():
+    connections: set[tuple[str, int]] = set()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(create_fake_openai_app(connections), log_level="warning")
+    )
+    thread = threading.Thread(
+        target=server.run, kwargs={"sockets": [sock]}, daemon=True
+    )
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.01)
+
+    yield f"http://127.0.0.1:{port}/v1", connections
+
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.fixture
+def payload() -> ChatHistoryCompletionRequest:
+    return ChatHistoryCompletionRequest.model_validate(
+        {
+            "apiProviderId": 1,
+            "aiModel": "gpt-4o-mini",
+            "messages": [{"role": "user", "message": "Hi!"}],
+        }
+    )
+
+
+async def test_blocking_client_runs_concurrent_chats_one_at_a_time(
+    fake_openai_server, payload
+):
+    base_url, _ = fake_openai_server
+
+    # The implementation before the change: a new synchronous client per request, called from the event loop.
+    async def chat() -> None:
+        client = OpenAI(api_key="sk-test", base_url=base_url)
+        client.chat.completions.create(
+            model=payload.ai_model,
+            messages=[{"role": "user", "content": "Hi!"}],
+        )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(chat() for _ in range(CONCURRENT_CHATS)))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= CONCURRENT_CHATS * RESPONSE_DELAY_IN_SEC
+
+
+async def test_cached_async_client_runs_concurrent_chats_in_parallel(
+    fake_openai_server, payload, monkeypatch
+):
+    base_url, connections = fake_openai_server
+    monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+    client_cache = OpenAiClientCache(maxsize=8)
+    monkeypatch.setattr(
+        openai_service_module, "openai_client_cache", client_cache
+    )
+    service = OpenAiService(s3_service=None, redis_service=None)
+    connections.clear()
+
+    try:
+        # Creates the client first, so the timed rounds measure the chats only.
+        await service._create_completion("sk-test", payload)
+
+        for _ in range(2):
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    service._create_completion("sk-test", payload)
+                    for _ in range(CONCURRENT_CHATS)
+                )
+            )
+            elapsed = time.perf_counter() - start
+
+            assert elapsed < CONCURRENT_CHATS * RESPONSE_DELAY_IN_SEC / 3
+    finally:
+        await client_cache.close()
+
+    # The second round of chats reused the connections opened by the first one.
+    assert len(connections) <= CONCURRENT_CHATS
@@ -0,0 +1,130 @@
+"""
+Benchmark of fetching a user's API key from Redis with a simulated network round trip time.
+
+The previous implementation checked that the key exists, fetched the whole JSON document and extended its lifetime in
+three round trips. The pipelined implementation fetches only the provider's entry and extends the lifetime in one.
+"""
+
+import time
+import asyncio
+
+import pytest
+
+from fakeredis import aioredis as fake_redis
+
+from src.core.config import settings
+from src.api_key.schemas import ApiKey, ApiKeysResponse
+from src.redis import service as redis_service_module
+from src.redis.cache import ApiKeyLocalCache
+from src.redis.keys import get_redis_key
+from src.redis.service import RedisService, master_fernet_key
+
+
+ROUND_TRIP_TIME_IN_SEC = 0.005
+FETCHES = 50
+USER_UUID = "3f1c7a2e-4b9d-4e51-9a3b-0c6d2f8e7a10"
+
+
+class RoundTripCounter:
+    def __init__(self) -> None:
+        self.round_trips = 0
+
+
+@pytest.fixture
+def round_trip_counter(monkeypatch) -> RoundTripCounter:
+    counter = RoundTripCounter()
+    send_packed_command = (
+        fake_redis.FakeAsyncRedisConnection.send_packed_command
+    )
+
+    # Every command or pipeline is written to the socket at once, so each send is one round trip.
+    async def send_with_latency(self, *args, **kwargs):
+        counter.round_trips += 1
+        await asyncio.sleep(ROUND_TRIP_TIME_IN_SEC)
+
+        return await send_packed_command(self, *args, **kwargs)
+
+    monkeypatch.setattr(
+        fake_redis.FakeAsyncRedisConnection,
+        "send_packed_command",
+        send_with_latency,
+    )
+
+    return counter
+
+
+@pytest.fixture
+async def redis_service(monkeypatch) -> RedisService:
+    # Disables the local cache, so every fetch reaches Redis.
+    monkeypatch.setattr(
+        redis_service_module,
+        "api_key_local_cache",
+        ApiKeyLocalCache(maxsize=1, ttl=0),
+    )
+    redis_client = fake_redis.FakeRedis()
+    service = RedisService(redis_client=redis_client)
+
+    await service.set_user_api_keys_in_cache(
+        USER_UUID,
+        ApiKeysResponse(
+            api_keys=[
+                ApiKey(
+                    id=provider_id,
+                    key=f"sk-{provider}",
+                    api_provider_id=provider_id,
+                    api_provider_name=provider.title(),
+                    api_provider_lowercase_name=provider,
+                )
+                for provider_id, provider in enumerate(("openai", "gemini"), 1)
+            ]
+        ),
+    )
+
+    yield service
+
+    await redis_client.aclose()
+
+
+async def test_pipelined_api_key_fetch_makes_one_round_trip(
+    redis_service, round_trip_counter
+):
+    redis_client = redis_service.redis_client
+    redis_key = get_redis_key("user", USER_UUID)
+
+    # The implementation before the change.
+    async def fetch_api_key() -> str:
+        if await redis_client.exists(redis_key) != 1:
+            raise AssertionError("The API keys are not cached.")
+
+        api_keys = await redis_client.json().get(redis_key)
+        api_key = api_keys["apiKeys"]["openai"]["key"]
+        await redis_client.expire(
+            redis_key, settings.REDIS_API_KEYS_EXPIRE_IN_SEC
+        )
+
+        return master_fernet_key.decrypt(api_key).decode()
+
+    start = time.perf_counter()
+
+    for _ in range(FETCHES):
+        assert await fetch_api_key() == "sk-openai"
+
+    sequential_elapsed = time.perf_counter() - start
+    sequential_round_trips = round_trip_counter.round_trips
+    round_trip_counter.round_trips = 0
+
+    start = time.perf_counter()
+
+    for _ in range(FETCHES):
+        api_key = await redis_service.get_user_specific_api_key_from_cache(
+            USER_UUID, "OpenAI"
+        )
+
+        assert api_key == "sk-openai"
+
+    pipelined_elapsed = time.perf_counter() - start
+
+    assert sequential_round_trips == 3 * FETCHES
+    assert round_trip_counter.round_trips == FETCHES
+    assert pipelined_elapsed < sequential_elapsed / 2
+    assert await redis_client.ttl(redis_key) > 0
@@ -0,0 +1,214 @@
+import json
+
+from typing import AsyncGenerator
+
+import pytest
+
+from fastapi import HTTPException, status
+
+from src.shared.schemas import ChatHistoryCompletionRequest
+from src.chat_history import stream as stream_module
+from src.chat_history.stream import stream_chat_completion
+
+
+class FakeProviderStream:
+    """
+    Stands in for an API provider's stream and records whether it was closed.
+    """
+
+    def __init__(self, chunks: list[str], error: Exception | None = None):
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    async def iterate(self) -> AsyncGenerator[str, None]:
+        try:
+            for chunk in self.chunks:
+                yield chunk
+
+            if self.error:
+                raise self.error
+        finally:
+            self.closed = True
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeChatRoomService:
+    def __init__(self, repository):
+        pass
+
+    async def handle_room_uuid(self, user_id, payload):
+        return payload, None
+
+
+def create_chat_history_service(error: Exception | None):
+    class FakeChatHistoryService:
+        stored: list[str] = []
+
+        def __init__(self, repository):
+            pass
+
+        async def store_chat_history(self, assistant_message, payload, room):
+            if error:
+                raise error
+
+            self.stored.append(assistant_message)
+
+    return FakeChatHistoryService
+
+
+@pytest.fixture
+def payload() -> ChatHistoryCompletionRequest:
+    return ChatHistoryCompletionRequest.model_validate(
+        {
+            "roomUuid": "6f1d3a5e-3f5e-4c9b-9a76-3bb1f1f0b0a1",
+            "apiProviderId": 1,
+            "aiModel": "gpt-4o",
+            "messages": [
+                {"role": "user", "message": "Hi!"},
+                {"role": "assistant", "message": "Hello!"},
+                {"role": "user", "message": "How are you?"},
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def patch_storage(monkeypatch):
+    def patch(error: Exception | None = None):
+        service = create_chat_history_service(error)
+        monkeypatch.setattr(stream_module, "SessionLocal", FakeSession)
+        monkeypatch.setattr(
+            stream_module, "ChatRoomRepository", lambda db: None
+        )
+        monkeypatch.setattr(
+            stream_module, "ChatHistoryRepository", lambda db: None
+        )
+        monkeypatch.setattr(
+            stream_module, "ChatRoomService", FakeChatRoomService
+        )
+        monkeypatch.setattr(stream_module, "ChatHistoryService", service)
+
+        return service
+
+    return patch
+
+
+def parse_events(events: list[str]) -> list[tuple[str, dict]]:
+    parsed = []
+
+    for event in events:
+        lines = event.strip().split("\n")
+        name = "message"
+
+        if lines[0].startswith("event: "):
+            name = lines.pop(0).removeprefix("event: ")
+
+        parsed.append((name, json.loads(lines[0].removeprefix("data: "))))
+
+    return parsed
+
+
+async def test_stream_ends_with_done_and_stores_the_response(
+    payload, patch_storage
+):
+    service = patch_storage()
+    provider_stream = FakeProviderStream(["Fine, ", "thanks!"])
+
+    events = parse_events(
+        [
+            event
+            async for event in stream_chat_completion(
+                1, provider_stream.iterate(), payload
+            )
+        ]
+    )
+
+    assert [name for name, _ in events] == ["message", "message", "done"]
+    assert events[-1][1]["message"] == "Fine, thanks!"
+    assert service.stored == ["Fine, thanks!"]
+    assert provider_stream.closed
+
+
+async def test_stream_ends_with_error_when_the_provider_fails(
+    payload, patch_storage
+):
+    service = patch_storage()
+    provider_stream = FakeProviderStream(
+        ["Fine, "],
+        HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Provider failed.",
+        ),
+    )
+
+    events = parse_events(
+        [
+            event
+            async for event in stream_chat_completion(
+                1, provider_stream.iterate(), payload
+            )
+        ]
+    )
+
+    assert events[-1] == ("error", {"detail": "Provider failed."})
+    assert service.stored == []
+    assert provider_stream.closed
+
+
+@pytest.mark.parametrize(
+    "error, detail",
+    [
+        (
+            HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Chat room not found.",
+            ),
+            "Chat room not found.",
+        ),
+        (
+            RuntimeError("connection lost"),
+            "Something went wrong while saving the response.",
+        ),
+    ],
+)
+async def test_stream_ends_with_error_when_storing_fails(
+    payload, patch_storage, error, detail
+):
+    patch_storage(error)
+    provider_stream = FakeProviderStream(["Fine, ", "thanks!"])
+
+    events = parse_events(
+        [
+            event
+            async for event in stream_chat_completion(
+                1, provider_stream.iterate(), payload
+            )
+        ]
+    )
+
+    assert [name for name, _ in events] == ["message", "message", "error"]
+    assert events[-1][1] == {"detail": detail}
+    assert provider_stream.closed
+
+
+async def test_provider_stream_is_closed_when_the_client_disconnects(
+    payload, patch_storage
+):
+    service = patch_storage()
+    provider_stream = FakeProviderStream(["Fine, ", "thanks!"])
+    events = stream_chat_completion(1, provider_stream.iterate(), payload)
+
+    await anext(events)
+    # Starlette closes the generator when the client disconnects.
+    await events.aclose()
+
+    assert provider_stream.closed
+    assert service.stored == []
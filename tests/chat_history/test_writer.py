@@ -0,0 +1,219 @@
+import time
+import uuid
+import asyncio
+
+import pytest
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.chat_room.schemas import ChatRoomInDb
+from src.chat_history import writer as writer_module
+from src.chat_history.schemas import ChatHistoryInDb
+from src.chat_history.writer import ChatHistoryWriter
+
+
+class FakeDatabase:
+    """
+    Stands in for the chat_rooms and chat_history tables. Every write is a transaction that fails as a whole.
+    """
+
+    def __init__(self) -> None:
+        self.chat_rooms: set[uuid.UUID] = set()
+        self.chat_histories: list[dict] = []
+        # The number of writes that fail with a transient error, or -1 if every write does.
+        self.transient_failures = 0
+
+    def create_repository(self, db) -> "FakeDatabase":
+        return self
+
+    async def create_bulk_with_chat_rooms(
+        self, chat_rooms: list[dict], chat_histories: list[dict]
+    ) -> None:
+        if self.transient_failures:
+            self.transient_failures = max(self.transient_failures - 1, -1)
+            raise OperationalError("INSERT", {}, Exception("server closed"))
+
+        room_uuids = self.chat_rooms | {
+            room["room_uuid"] for room in chat_rooms
+        }
+
+        for chat_history in chat_histories:
+            if chat_history["room_uuid"] not in room_uuids:
+                raise IntegrityError(
+                    "INSERT", {}, Exception("foreign key violation")
+                )
+
+        self.chat_rooms = room_uuids
+        self.chat_histories.extend(chat_histories)
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *args):
+        return False
+
+
+@pytest.fixture
+def database(monkeypatch) -> FakeDatabase:
+    database = FakeDatabase()
+    monkeypatch.setattr(writer_module, "SessionLocal", FakeSession)
+    monkeypatch.setattr(
+        writer_module, "ChatHistoryRepository", database.create_repository
+    )
+
+    return database
+
+
+@pytest.fixture
+def writer() -> ChatHistoryWriter:
+    return ChatHistoryWriter(
+        batch_size=100,
+        flush_interval=0.05,
+        max_queue_size=1000,
+        retry_max_delay=0.04,
+        shutdown_timeout=1,
+        retry_base_delay=0.01,
+    )
+
+
+def create_chat_turn(
+    room_uuid: uuid.UUID, user_id: int | None = None
+) -> tuple[ChatRoomInDb | None, list[ChatHistoryInDb]]:
+    chat_room = (
+        ChatRoomInDb(room_uuid=room_uuid, user_id=user_id) if user_id else None
+    )
+    chat_histories = [
+        ChatHistoryInDb(
+            ai_model="gpt-4o",
+            role=role,
+            room_uuid=room_uuid,
+            message="Hi!",
+            api_provider_id=1,
+            custom_instructions="You are a helpful assistant.",
+        )
+        for role in ("user", "assistant")
+    ]
+
+    return chat_room, chat_histories
+
+
+async def test_only_the_chat_turn_that_cannot_be_written_is_dropped(
+    database, writer
+):
+    rooms = [uuid.uuid4() for _ in range(10)]
+    deleted_room = uuid.uuid4()
+    writer.start()
+
+    for index, room_uuid in enumerate(rooms):
+        await writer.enqueue(*create_chat_turn(room_uuid, user_id=1))
+
+        if index == 4:
+            # A chat turn of a room that was deleted while the turn was queued.
+            await writer.enqueue(*create_chat_turn(deleted_room))
+
+    await writer.stop()
+
+    assert database.chat_rooms == set(rooms)
+    assert len(database.chat_histories) == 2 * len(rooms)
+    assert not writer.is_chat_room_pending(rooms[0], 1)
+
+
+async def test_follow_up_turns_are_written_after_their_new_chat_room(
+    database, writer
+):
+    room_uuid = uuid.uuid4()
+    writer.start()
+
+    await writer.enqueue(*create_chat_turn(room_uuid, user_id=1))
+    await writer.enqueue(*create_chat_turn(room_uuid))
+    await writer.enqueue(*create_chat_turn(uuid.uuid4()))
+    await writer.stop()
+
+    assert database.chat_rooms == {room_uuid}
+    assert len(database.chat_histories) == 4
+
+
+async def test_transient_errors_are_retried_with_backoff(
+    database, writer, monkeypatch
+):
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(writer_module.asyncio, "sleep", record_sleep)
+    database.transient_failures = 4
+    room_uuid = uuid.uuid4()
+
+    await writer._flush([create_chat_turn(room_uuid, user_id=1)])
+
+    assert delays == [0.01, 0.02, 0.04, 0.04]
+    assert database.chat_rooms == {room_uuid}
+
+
+async def test_stop_writes_every_queued_turn_despite_transient_errors(
+    database, writer
+):
+    rooms = [uuid.uuid4() for _ in range(5)]
+    database.transient_failures = 3
+    writer.start()
+
+    for room_uuid in rooms:
+        await writer.enqueue(*create_chat_turn(room_uuid, user_id=1))
+
+    await writer.stop()
+
+    assert database.chat_rooms == set(rooms)
+    assert len(database.chat_histories) == 2 * len(rooms)
+
+
+async def test_waiting_for_a_chat_room_returns_once_its_turns_are_written(
+    database, writer
+):
+    room_uuid = uuid.uuid4()
+    writer.start()
+
+    await writer.enqueue(*create_chat_turn(room_uuid, user_id=1))
+    await writer.enqueue(*create_chat_turn(room_uuid))
+
+    assert writer.is_chat_room_pending(room_uuid, 1)
+    assert room_uuid not in database.chat_rooms
+
+    await asyncio.wait_for(writer.wait_for_chat_room(room_uuid), 1)
+
+    assert not writer.is_chat_room_pending(room_uuid, 1)
+    assert len(database.chat_histories) == 4
+
+    await writer.stop()
+
+
+async def test_stop_gives_up_on_an_unavailable_database_and_logs_the_lost_turns(
+    database, writer, caplog
+):
+    rooms = [uuid.uuid4() for _ in range(3)]
+    database.transient_failures = -1
+    writer.shutdown_timeout = 0.2
+    writer.start()
+
+    for room_uuid in rooms:
+        await writer.enqueue(*create_chat_turn(room_uuid, user_id=1))
+
+    await writer.enqueue(*create_chat_turn(rooms[0]))
+
+    started_at = time.perf_counter()
+    await writer.stop()
+
+    assert time.perf_counter() - started_at < 1
+    assert database.chat_histories == []
+
+    [record] = [
+        record
+        for record in caplog.records
+        if record.getMessage().startswith("Stopped writing")
+    ]
+    assert "4 chat turn(s) were not written" in record.getMessage()
+    assert all(str(room_uuid) in record.getMessage() for room_uuid in rooms)
@@ -0,0 +1,156 @@
+import uuid
+
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy.exc import NoResultFound
+
+from fastapi import HTTPException
+
+from src.core.config import settings
+from src.chat_room import service as chat_room_service_module
+from src.chat_room.schemas import ChatRoomInDb
+from src.chat_room.service import ChatRoomService
+from src.chat_history.schemas import ChatHistoryInDb
+from src.chat_history.writer import ChatHistoryWriter
+
+
+USER_ID = 1
+
+
+class FakeChatRoomRepository:
+    """
+    Stands in for the chat_rooms table, which the writer fills in when it flushes.
+    """
+
+    def __init__(self) -> None:
+        self.chat_rooms: dict[uuid.UUID, int] = {}
+
+    async def get_one_with_selected_attributes_by_condition(
+        self, attributes, filter_attribute, filter_value
+    ):
+        user_id = self.chat_rooms.get(uuid.UUID(filter_value))
+
+        return SimpleNamespace(user_id=user_id) if user_id else None
+
+    async def delete_by_id(self, room_uuid: uuid.UUID) -> None:
+        if room_uuid not in self.chat_rooms:
+            raise NoResultFound()
+
+        del self.chat_rooms[room_uuid]
+
+    async def create_bulk_with_chat_rooms(self, chat_rooms, chat_histories):
+        for chat_room in chat_rooms:
+            self.chat_rooms[chat_room["room_uuid"]] = chat_room["user_id"]
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *args):
+        return False
+
+
+@pytest.fixture
+def repository(monkeypatch) -> FakeChatRoomRepository:
+    repository = FakeChatRoomRepository()
+    monkeypatch.setattr(settings, "CHAT_HISTORY_WRITE_BEHIND", True)
+    monkeypatch.setattr(
+        "src.chat_history.writer.SessionLocal", FakeSession, raising=True
+    )
+    monkeypatch.setattr(
+        "src.chat_history.writer.ChatHistoryRepository",
+        lambda db: repository,
+    )
+
+    return repository
+
+
+def create_writer() -> ChatHistoryWriter:
+    return ChatHistoryWriter(
+        batch_size=100,
+        flush_interval=0.05,
+        max_queue_size=100,
+        retry_max_delay=0.1,
+        shutdown_timeout=1,
+    )
+
+
+async def enqueue_new_chat_room(writer: ChatHistoryWriter) -> uuid.UUID:
+    room_uuid = uuid.uuid4()
+    await writer.enqueue(
+        ChatRoomInDb(room_uuid=room_uuid, user_id=USER_ID),
+        [
+            ChatHistoryInDb(
+                ai_model="gpt-4o",
+                role="user",
+                room_uuid=room_uuid,
+                message="Hi!",
+                api_provider_id=1,
+                custom_instructions="You are a helpful assistant.",
+            )
+        ],
+    )
+
+    return room_uuid
+
+
+async def test_deleting_a_queued_chat_room_writes_it_first(
+    repository, monkeypatch
+):
+    writer = create_writer()
+    monkeypatch.setattr(chat_room_service_module, "chat_history_writer", writer)
+    writer.start()
+    room_uuid = await enqueue_new_chat_room(writer)
+
+    await ChatRoomService(repository).delete_chat_room(USER_ID, room_uuid)
+
+    assert room_uuid not in repository.chat_rooms
+    assert not writer.is_chat_room_pending(room_uuid, USER_ID)
+
+    await writer.stop()
+
+
+async def test_queued_chat_room_is_not_found_by_other_workers(
+    repository, monkeypatch
+):
+    # The limitation of the in-process queue: another worker process has its own, empty queue.
+    writer, other_worker_writer = create_writer(), create_writer()
+    writer.start()
+    room_uuid = await enqueue_new_chat_room(writer)
+    service = ChatRoomService(repository)
+
+    monkeypatch.setattr(chat_room_service_module, "chat_history_writer", writer)
+    await service.verify_chat_room_exists(USER_ID, room_uuid)
+
+    monkeypatch.setattr(
+        chat_room_service_module, "chat_history_writer", other_worker_writer
+    )
+
+    with pytest.raises(HTTPException) as e:
+        await service.verify_chat_room_exists(USER_ID, room_uuid)
+
+    assert e.value.status_code == 404
+
+    # Once the chat room is written, every worker finds it.
+    await writer.wait_for_chat_room(room_uuid)
+    await service.verify_chat_room_exists(USER_ID, room_uuid)
+
+    await writer.stop()
+
+
+async def test_deleting_a_missing_chat_room_responds_with_not_found(
+    repository, monkeypatch
+):
+    room_uuid = uuid.uuid4()
+    # The chat room's turn was queued here, but could not be written.
+    writer = create_writer()
+    writer._pending_chat_rooms[room_uuid] = USER_ID
+    monkeypatch.setattr(chat_room_service_module, "chat_history_writer", writer)
+
+    with pytest.raises(HTTPException) as e:
+        await ChatRoomService(repository).delete_chat_room(USER_ID, room_uuid)
+
+    assert e.value.status_code == 404
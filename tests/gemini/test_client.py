@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+import google.ai.generativelanguage as glm
+
+from google.generativeai.types import AsyncGenerateContentResponse
+
+from src.gemini import client as gemini_client_module
+from src.gemini.client import GeminiClientCache
+from src.gemini.service import GeminiService
+
+
+API_KEYS = ("first-api-key", "second-api-key")
+MODEL_NAME = "gemini-1.5-flash"
+
+
+def create_response(text: str) -> glm.GenerateContentResponse:
+    return glm.GenerateContentResponse(
+        candidates=[
+            glm.Candidate(
+                content=glm.Content(role="model", parts=[glm.Part(text=text)])
+            )
+        ]
+    )
+
+
+class FakeGenerativeServiceAsyncClient:
+    """
+    Stands in for the public GAPIC client, answering every request with the API key it was created with.
+    """
+
+    def __init__(self, client_options: dict) -> None:
+        self.api_key = client_options["api_key"]
+        self.requests: list[glm.GenerateContentRequest] = []
+
+    async def generate_content(
+        self, request: glm.GenerateContentRequest
+    ) -> glm.GenerateContentResponse:
+        self.requests.append(request)
+        # Lets the requests of the other API key run in between.
+        await asyncio.sleep(0)
+
+        return create_response(self.api_key)
+
+
+class FakeStream:
+    """
+    Stands in for a streaming call whose consumer stops reading after the first chunks.
+    """
+
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> glm.GenerateContentResponse:
+        return create_response("chunk")
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+@pytest.fixture
+def gemini_client_cache(monkeypatch) -> GeminiClientCache:
+    monkeypatch.setattr(
+        gemini_client_module.glm,
+        "GenerativeServiceAsyncClient",
+        FakeGenerativeServiceAsyncClient,
+    )
+
+    return GeminiClientCache(maxsize=8)
+
+
+async def test_concurrent_api_keys_never_share_a_client(gemini_client_cache):
+    async def generate_content(api_key: str) -> str:
+        response = await gemini_client_cache.get_client(
+            api_key
+        ).generate_content(MODEL_NAME, [{"role": "user", "parts": ["Hello."]}])
+
+        return response.text
+
+    api_keys = API_KEYS * 20
+    responses = await asyncio.gather(
+        *(generate_content(api_key) for api_key in api_keys)
+    )
+
+    first_client, second_client = (
+        gemini_client_cache.get_client(api_key) for api_key in API_KEYS
+    )
+
+    assert responses == list(api_keys)
+    assert first_client is not second_client
+    assert first_client.generative_client.api_key == API_KEYS[0]
+    assert second_client.generative_client.api_key == API_KEYS[1]
+    assert len(first_client.generative_client.requests) == 20
+    assert len(second_client.generative_client.requests) == 20
+
+
+async def test_request_is_built_with_the_public_api(gemini_client_cache):
+    gemini_client = gemini_client_cache.get_client(API_KEYS[0])
+
+    await gemini_client.generate_content(
+        MODEL_NAME,
+        [
+            {
+                "role": "user",
+                "parts": [
+                    "Describe the image.",
+                    {
+                        "file_data": {
+                            "mime_type": "image/png",
+                            "file_uri": "https://gemini/files/image",
+                        }
+                    },
+                ],
+            }
+        ],
+        system_instruction="Answer briefly.",
+    )
+
+    [request] = gemini_client.generative_client.requests
+    [content] = request.contents
+
+    assert request.model == f"models/{MODEL_NAME}"
+    assert request.system_instruction.parts[0].text == "Answer briefly."
+    assert content.role == "user"
+    assert content.parts[0].text == "Describe the image."
+    assert content.parts[1].file_data.file_uri == "https://gemini/files/image"
+    assert content.parts[1].file_data.mime_type == "image/png"
+
+
+async def test_stream_is_cancelled_when_the_iteration_stops():
+    stream = FakeStream()
+    response = await AsyncGenerateContentResponse.from_aiterator(stream)
+    chunks = GeminiService(s3_service=None, redis_service=None)._iterate_stream(
+        response, stream
+    )
+
+    assert await anext(chunks) == "chunk"
+
+    await chunks.aclose()
+
+    assert stream.cancelled
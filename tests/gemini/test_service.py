@@ -0,0 +1,289 @@
+import io
+import asyncio
+import tempfile
+
+from types import SimpleNamespace
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from fakeredis import aioredis as fake_redis
+from fastapi import HTTPException, status
+from google.api_core.exceptions import PermissionDenied
+
+from src.core.config import settings
+from src.gemini import service as gemini_service_module
+from src.gemini.service import GeminiService
+from src.redis.service import RedisGeminiFile, RedisService
+from src.s3.service import S3Service
+from src.shared.enums import RoleEnum
+from src.shared.schemas import ChatHistoryCompletionMessage
+
+
+API_KEY = "api-key"
+
+
+def create_messages(*image_urls: str) -> list[ChatHistoryCompletionMessage]:
+    return [
+        ChatHistoryCompletionMessage(
+            message="Describe the image.",
+            imageUrl=image_url,
+            role=RoleEnum.user,
+        )
+        for image_url in image_urls
+    ]
+
+
+@pytest.fixture
+def gemini_service() -> GeminiService:
+    return GeminiService(s3_service=None, redis_service=None)
+
+
+async def test_failing_image_cancels_the_other_images(
+    gemini_service, monkeypatch
+):
+    cancelled_image_urls = []
+
+    async def get_gemini_file(api_key: str, image_url: str) -> RedisGeminiFile:
+        if image_url == "missing.png":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled_image_urls.append(image_url)
+            raise
+
+    monkeypatch.setattr(gemini_service, "_get_gemini_file", get_gemini_file)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await gemini_service._format_messages(
+            API_KEY, create_messages("slow.png", "missing.png")
+        )
+
+    assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+    assert cancelled_image_urls == ["slow.png"]
+
+
+async def test_slow_image_times_out(gemini_service, monkeypatch):
+    async def get_gemini_file(api_key: str, image_url: str) -> RedisGeminiFile:
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(gemini_service, "_get_gemini_file", get_gemini_file)
+    monkeypatch.setattr(
+        settings, "GEMINI_IMAGE_RESOLUTION_TIMEOUT_IN_SEC", 0.01
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await gemini_service._format_messages(API_KEY, create_messages("a.png"))
+
+    assert exc_info.value.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+
+
+async def test_repeated_image_is_resolved_once(gemini_service, monkeypatch):
+    resolved_image_urls = []
+
+    async def get_gemini_file(api_key: str, image_url: str) -> RedisGeminiFile:
+        resolved_image_urls.append(image_url)
+
+        return {"uri": f"https://gemini/{image_url}", "mime_type": "image/png"}
+
+    monkeypatch.setattr(gemini_service, "_get_gemini_file", get_gemini_file)
+
+    formatted_messages = await gemini_service._format_messages(
+        API_KEY, create_messages("a.png", "b.png", "a.png")
+    )
+
+    assert resolved_image_urls == ["a.png", "b.png"]
+    assert len(formatted_messages) == 3
+
+
+class FakeGeminiClient:
+    """
+    Stands in for a Gemini client, keeping the files uploaded through it.
+    """
+
+    def __init__(self, expires_in: timedelta = timedelta(days=2)) -> None:
+        self.expires_in = expires_in
+        self.files: dict[str, SimpleNamespace] = {}
+        self.uploads: list[tuple[object, str | None]] = []
+        self.get_file_calls = 0
+
+    def get_file(self, name: str, timeout: float | None = None):
+        self.get_file_calls += 1
+
+        if name not in self.files:
+            raise PermissionDenied("The file does not exist.")
+
+        return self.files[name]
+
+    def upload_file(self, file, mime_type, name, display_name):
+        self.uploads.append((file, mime_type))
+        self.files[name] = SimpleNamespace(
+            uri=f"https://gemini/files/{name}",
+            mime_type=mime_type,
+            expiration_time=datetime.now(UTC) + self.expires_in,
+        )
+
+        return self.files[name]
+
+
+@pytest.fixture
+def gemini_client(monkeypatch) -> FakeGeminiClient:
+    gemini_client = FakeGeminiClient()
+    monkeypatch.setattr(
+        gemini_service_module,
+        "gemini_client_cache",
+        SimpleNamespace(get_client=lambda api_key: gemini_client),
+    )
+
+    return gemini_client
+
+
+@pytest.fixture
+def s3_gemini_service(s3_bucket, tmp_path, monkeypatch) -> GeminiService:
+    # Any temporary file would be created in the test's own directory.
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    return GeminiService(
+        s3_service=S3Service(),
+        redis_service=RedisService(redis_client=fake_redis.FakeRedis()),
+    )
+
+
+def put_image(s3_bucket, key: str, content_type: str | None) -> str:
+    extra_args = {"ContentType": content_type} if content_type else {}
+    s3_bucket.put_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME, Key=key, Body=b"image", **extra_args
+    )
+
+    return S3Service._get_file_url(key)
+
+
+@pytest.mark.parametrize(
+    "key, content_type, mime_type",
+    [
+        ("chat-images/stored.jpg", "image/webp", "image/webp"),
+        ("chat-images/guessed.png", None, "image/png"),
+    ],
+)
+async def test_image_is_uploaded_from_memory_with_its_mime_type(
+    s3_bucket,
+    s3_gemini_service,
+    gemini_client,
+    tmp_path,
+    key,
+    content_type,
+    mime_type,
+):
+    image_url = put_image(s3_bucket, key, content_type)
+
+    gemini_file = await s3_gemini_service._get_gemini_file(API_KEY, image_url)
+
+    [(uploaded_file, uploaded_mime_type)] = gemini_client.uploads
+    assert isinstance(uploaded_file, io.BytesIO)
+    assert uploaded_file.getvalue() == b"image"
+    assert uploaded_mime_type == mime_type
+    assert gemini_file["mime_type"] == mime_type
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_image_without_an_image_mime_type_is_rejected(
+    s3_bucket, s3_gemini_service, gemini_client
+):
+    image_url = put_image(s3_bucket, "chat-images/image", None)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await s3_gemini_service._get_gemini_file(API_KEY, image_url)
+
+    assert exc_info.value.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    assert gemini_client.uploads == []
+
+
+async def get_cache_ttl(gemini_service: GeminiService, image_url: str) -> int:
+    return await gemini_service.redis_service.redis_client.ttl(
+        RedisService._get_gemini_file_redis_key(
+            API_KEY, S3Service.extract_s3_key_from_url(image_url)
+        )
+    )
+
+
+async def test_cached_image_skips_gemini_and_s3(
+    s3_bucket, s3_gemini_service, gemini_client, monkeypatch
+):
+    image_url = put_image(s3_bucket, "chat-images/cached.png", "image/png")
+    cached_file = {
+        "uri": "https://gemini/files/cached",
+        "mime_type": "image/png",
+    }
+    await s3_gemini_service.redis_service.set_gemini_file_in_cache(
+        API_KEY, "chat-images/cached.png", cached_file, 60
+    )
+
+    def download_file_to_memory(*args, **kwargs):
+        raise AssertionError("The image was downloaded from S3.")
+
+    monkeypatch.setattr(
+        s3_gemini_service.s3_service,
+        "download_file_to_memory",
+        download_file_to_memory,
+    )
+
+    gemini_file = await s3_gemini_service._get_gemini_file(API_KEY, image_url)
+
+    assert gemini_file == cached_file
+    assert gemini_client.get_file_calls == 0
+    assert gemini_client.uploads == []
+
+
+async def test_image_missing_from_s3_is_cached_as_missing(
+    s3_gemini_service, gemini_client
+):
+    image_url = S3Service._get_file_url("chat-images/missing.png")
+
+    assert await s3_gemini_service._get_gemini_file(API_KEY, image_url) == {}
+    assert await s3_gemini_service._get_gemini_file(API_KEY, image_url) == {}
+
+    # The second lookup is answered from the cache.
+    assert gemini_client.get_file_calls == 1
+    assert (
+        0
+        < await get_cache_ttl(s3_gemini_service, image_url)
+        <= settings.GEMINI_MISSING_FILE_CACHE_EXPIRE_IN_SEC
+    )
+
+
+async def test_uploaded_image_is_cached_until_gemini_deletes_it(
+    s3_bucket, s3_gemini_service, gemini_client
+):
+    gemini_client.expires_in = timedelta(hours=1)
+    image_url = put_image(s3_bucket, "chat-images/uploaded.png", "image/png")
+
+    gemini_file = await s3_gemini_service._get_gemini_file(API_KEY, image_url)
+
+    # A minute before the file expires, well below the configured expiration.
+    assert (
+        3600 - 60 - 5
+        <= await get_cache_ttl(s3_gemini_service, image_url)
+        <= 3600 - 60
+    )
+    assert (
+        await s3_gemini_service._get_gemini_file(API_KEY, image_url)
+        == gemini_file
+    )
+    assert gemini_client.get_file_calls == 1
+
+
+async def test_image_expiring_within_a_minute_is_not_cached(
+    s3_bucket, s3_gemini_service, gemini_client
+):
+    gemini_client.expires_in = timedelta(seconds=30)
+    image_url = put_image(s3_bucket, "chat-images/expiring.png", "image/png")
+
+    await s3_gemini_service._get_gemini_file(API_KEY, image_url)
+    # The file now exists in Gemini, so it is found there instead of being uploaded again.
+    await s3_gemini_service._get_gemini_file(API_KEY, image_url)
+
+    assert await get_cache_ttl(s3_gemini_service, image_url) == -2
+    assert gemini_client.get_file_calls == 2
+    assert len(gemini_client.uploads) == 1
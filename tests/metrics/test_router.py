@@ -0,0 +1,49 @@
+import pytest
+
+from pydantic import SecretStr
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+from src.metrics.router import router
+from src.metrics.service import metrics
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+
+    return TestClient(app)
+
+
+def test_metrics_are_not_served_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_AUTH_TOKEN", None)
+
+    response = client.get(
+        "/metrics", headers={"Authorization": "Bearer anything"}
+    )
+
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}])
+def test_metrics_require_the_token(client, monkeypatch, headers):
+    monkeypatch.setattr(settings, "METRICS_AUTH_TOKEN", SecretStr("secret"))
+
+    response = client.get("/metrics", headers=headers)
+
+    assert response.status_code == 401
+
+
+def test_metrics_are_served_with_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_AUTH_TOKEN", SecretStr("secret"))
+    metrics.counter("test.requests").inc()
+
+    response = client.get(
+        "/metrics", headers={"Authorization": "Bearer secret"}
+    )
+
+    assert response.status_code == 200
+    assert "test.requests" in response.json()
@@ -0,0 +1,266 @@
+import gc
+import os
+import tempfile
+import threading
+import tracemalloc
+
+import pytest
+
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+from moto.core.botocore_stubber import BotocoreStubber
+
+from src.core.config import settings
+from src.s3.service import S3Service, transfer_config
+from src.s3.middleware import (
+    MULTIPART_OVERHEAD_IN_BYTES,
+    UploadSizeLimitMiddleware,
+)
+
+
+MAX_FILE_SIZE = 1024 * 1024
+LARGE_FILE_SIZE = 64 * 1024 * 1024
+LARGE_BLOCK_SIZE = 64 * 1024
+# The smallest part size S3 accepts, so the file spans many parts.
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture
+def upload_app() -> tuple[FastAPI, list[int]]:
+    uploaded_sizes: list[int] = []
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_file_size=MAX_FILE_SIZE)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile):
+        uploaded_sizes.append(file.size)
+
+    return app, uploaded_sizes
+
+
+def create_upload_file(size: int) -> UploadFile:
+    # Written in 1 MB chunks, so the whole content is never held in memory at once.
+    spooled_file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    chunk = os.urandom(1024 * 1024)
+
+    for _ in range(size // len(chunk)):
+        spooled_file.write(chunk)
+
+    spooled_file.seek(0)
+
+    return UploadFile(
+        spooled_file,
+        size=size,
+        filename="image.png",
+        headers=Headers({"content-type": "image/png"}),
+    )
+
+
+async def test_upload_with_too_large_content_length_is_rejected_unread():
+    responses = []
+
+    async def app(scope, receive, send):
+        raise AssertionError("The request reached the application.")
+
+    async def receive():
+        raise AssertionError("The request body was read.")
+
+    async def send(message):
+        responses.append(message)
+
+    middleware = UploadSizeLimitMiddleware(app, max_file_size=MAX_FILE_SIZE)
+    await middleware(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/upload",
+            "headers": [
+                (b"content-type", b"multipart/form-data; boundary=x"),
+                (b"content-length", str(2 * MAX_FILE_SIZE).encode()),
+            ],
+        },
+        receive,
+        send,
+    )
+
+    assert responses[0]["status"] == 413
+
+
+def test_upload_without_content_length_is_rejected_while_received(upload_app):
+    app, uploaded_sizes = upload_app
+    boundary = "boundary"
+
+    # A generator body is sent chunked, without a Content-Length.
+    def body():
+        yield (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="image.png"\r\n'
+            "Content-Type: image/png\r\n\r\n"
+        ).encode()
+
+        for _ in range(4):
+            yield b"x" * MAX_FILE_SIZE
+
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    response = TestClient(app).post(
+        "/upload",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert response.status_code == 413
+    assert response.json() == {
+        "detail": "The file is too large. The maximum size is 1 MB."
+    }
+    assert uploaded_sizes == []
+
+
+def test_upload_within_the_limit_is_accepted(upload_app):
+    app, uploaded_sizes = upload_app
+
+    response = TestClient(app).post(
+        "/upload", files={"file": ("image.png", b"x" * 1024, "image/png")}
+    )
+
+    assert response.status_code == 200
+    assert uploaded_sizes == [1024]
+
+
+def test_app_rejects_too_large_uploads_before_authentication():
+    from src.main import app
+
+    response = TestClient(app).post(
+        "/api/user/upload-avatar",
+        files={
+            "avatar": (
+                "avatar.png",
+                b"x"
+                * (
+                    settings.AWS_S3_MAX_UPLOAD_SIZE_IN_BYTES
+                    + MULTIPART_OVERHEAD_IN_BYTES
+                ),
+                "image/png",
+            )
+        },
+    )
+
+    assert response.status_code == 413
+
+
+async def test_uploaded_file_keeps_its_content_type(s3_bucket):
+    file_url = await S3Service().upload_file(
+        create_upload_file(MAX_FILE_SIZE), "avatars"
+    )
+
+    s3_object = s3_bucket.head_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME,
+        Key=S3Service.extract_s3_key_from_url(file_url),
+    )
+
+    assert s3_object["ContentType"] == "image/png"
+    assert s3_object["ContentLength"] == MAX_FILE_SIZE
+
+
+class ClientMemoryProfiler:
+    """
+    Samples the memory held in large blocks by everything but moto whenever a request reaches the mocked S3.
+
+    moto keeps the uploaded objects in memory, so the peak of the whole process would measure moto instead of the
+    upload. The client holds the most memory right when it sends a request, and the file's content is held in blocks
+    of at least `LARGE_BLOCK_SIZE`. Unreachable objects are collected first, so only the memory kept alive by the upload
+    is counted. The parts are sent from several threads, so one sample is taken at a time and the snapshots themselves
+    are not counted.
+    """
+
+    def __init__(self) -> None:
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.peak = 0
+        tracemalloc.start(8)
+
+    def stop(self) -> int:
+        tracemalloc.stop()
+
+        return self.peak
+
+    def sample(self) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return
+
+            gc.collect()
+            # moto parses the requests with werkzeug.
+            excluded_files = ("/moto/", "/werkzeug/", tracemalloc.__file__)
+            size = sum(
+                trace.size
+                for trace in tracemalloc.take_snapshot().traces
+                if trace.size >= LARGE_BLOCK_SIZE
+                and not any(
+                    excluded_file in frame.filename
+                    for frame in trace.traceback
+                    for excluded_file in excluded_files
+                )
+            )
+            self.peak = max(self.peak, size)
+
+
+@pytest.fixture
+def client_memory_profiler(s3_bucket, monkeypatch):
+    profiler = ClientMemoryProfiler()
+    process_request = BotocoreStubber.__call__
+
+    def profile_request(self, *args, **kwargs):
+        profiler.sample()
+
+        return process_request(self, *args, **kwargs)
+
+    monkeypatch.setattr(BotocoreStubber, "__call__", profile_request)
+    monkeypatch.setattr(
+        settings, "AWS_S3_MAX_UPLOAD_SIZE_IN_BYTES", LARGE_FILE_SIZE
+    )
+    monkeypatch.setattr(transfer_config, "multipart_threshold", PART_SIZE)
+    monkeypatch.setattr(transfer_config, "multipart_chunksize", PART_SIZE)
+
+    yield profiler
+
+    # Stops tracing if the test failed while it was on.
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+async def test_large_upload_holds_only_a_few_chunks_in_memory(
+    client_memory_profiler,
+):
+    s3_service = S3Service()
+    s3_client = s3_service.s3_resource.meta.client
+    # Loads the S3 service model before the memory is traced.
+    s3_client.head_bucket(Bucket=settings.AWS_S3_BUCKET_NAME)
+
+    # The implementation before the change.
+    upload_file = create_upload_file(LARGE_FILE_SIZE)
+    client_memory_profiler.start()
+    s3_client.put_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME,
+        Key="avatars/previous.png",
+        Body=await upload_file.read(),
+        ContentType=upload_file.content_type,
+    )
+    read_peak = client_memory_profiler.stop()
+
+    upload_file = create_upload_file(LARGE_FILE_SIZE)
+    client_memory_profiler.start()
+    await s3_service.upload_file(upload_file, "avatars")
+    streamed_peak = client_memory_profiler.stop()
+
+    # One part per upload thread, one more being read by the thread submitting the parts and one just sent whose
+    # buffer is being released, along with the 1 MB block each upload thread reads its part in to checksum it.
+    max_streamed_size = (
+        transfer_config.max_in_memory_upload_chunks + 2
+    ) * PART_SIZE + transfer_config.max_request_concurrency * (1024 * 1024)
+
+    assert read_peak >= LARGE_FILE_SIZE
+    assert streamed_peak <= max_streamed_size < LARGE_FILE_SIZE / 1.5
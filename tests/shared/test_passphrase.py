@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from fastapi import HTTPException, status
+
+from src.core.config import settings
+from src.shared.utils.executor import BoundedExecutor
+from src.shared.utils.passphrase import PassphraseUtil, passphrase_util
+
+
+PASSPHRASE = b"passphrase"
+SALT = b"salt" * 4
+MAX_PENDING = 2
+
+
+@pytest.fixture
+def bounded_passphrase_util():
+    executor = BoundedExecutor(
+        "pbkdf2-test", max_workers=1, max_pending=MAX_PENDING
+    )
+
+    yield PassphraseUtil(executor)
+
+    executor.shutdown()
+
+
+def test_key_derivation_executor_is_bounded():
+    assert passphrase_util.executor.max_pending == settings.PBKDF2_MAX_PENDING
+
+
+async def test_derivations_above_the_limit_are_rejected(
+    bounded_passphrase_util,
+):
+    results = await asyncio.gather(
+        *(
+            bounded_passphrase_util.derive_key_async(PASSPHRASE, SALT)
+            for _ in range(MAX_PENDING + 2)
+        ),
+        return_exceptions=True,
+    )
+    rejected = results[MAX_PENDING:]
+
+    assert (
+        results[:MAX_PENDING]
+        == [PassphraseUtil.derive_key(PASSPHRASE, SALT)] * MAX_PENDING
+    )
+    assert all(
+        isinstance(result, HTTPException)
+        and result.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        and result.headers == {"Retry-After": "1"}
+        for result in rejected
+    )
+
+    # Once the admitted derivations are done, new ones are accepted again.
+    assert await bounded_passphrase_util.derive_key_async(
+        PASSPHRASE, SALT
+    ) == PassphraseUtil.derive_key(PASSPHRASE, SALT)
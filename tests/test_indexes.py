@@ -0,0 +1,178 @@
+"""
+EXPLAIN-based regression tests of the chat history page and the chat room listing queries.
+
+The queries are captured while the repositories run them and then explained with the same parameters, so the tests
+fail if a query stops matching the indexes created by the migrations.
+"""
+
+import json
+import uuid
+import datetime
+
+import pytest
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.chat_room.repository import ChatRoomRepository
+from src.chat_history.repository import ChatHistoryRepository
+
+
+USERS = 50
+ROOMS_PER_USER = 20
+MESSAGES_PER_ROOM = 100
+# The greatest possible UUID, so a cursor with it does not skip any room sent at the same time.
+MAX_ROOM_UUID = uuid.UUID(int=(1 << 128) - 1)
+
+
+@pytest.fixture
+async def seeded_engine(migrated_database_url):
+    engine = create_async_engine(migrated_database_url)
+
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO users (name, email, password, is_email_verified, is_password_reset_requested) "
+                "SELECT 'User', 'user' || n || '@example.com', 'password', false, false "
+                "FROM generate_series(1, :users) AS n"
+            ),
+            {"users": USERS},
+        )
+        api_provider_id = await connection.scalar(
+            text(
+                "INSERT INTO api_providers (name, lowercase_name, ai_models) "
+                "VALUES ('OpenAI', 'openai', ARRAY['gpt-4o']) RETURNING id"
+            )
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO chat_rooms (room_uuid, user_id) "
+                "SELECT gen_random_uuid(), users.id "
+                "FROM users CROSS JOIN generate_series(1, :rooms)"
+            ),
+            {"rooms": ROOMS_PER_USER},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO chat_history "
+                "(room_uuid, api_provider_id, role, ai_model, custom_instructions, message, sent_at) "
+                "SELECT room.room_uuid, :api_provider_id, 'user'::roleenum, 'gpt_4o'::aimodelenum, "
+                "'You are a helpful assistant.', 'Hi!', now() - n * interval '1 minute' "
+                "FROM chat_rooms AS room CROSS JOIN generate_series(1, :messages) AS n"
+            ),
+            {
+                "api_provider_id": api_provider_id,
+                "messages": MESSAGES_PER_ROOM,
+            },
+        )
+        await connection.execute(text("ANALYZE"))
+
+    yield engine
+
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "TRUNCATE users, api_providers, chat_rooms, chat_history CASCADE"
+            )
+        )
+
+    await engine.dispose()
+
+
+class QueryCapture:
+    """
+    Records the SQL statements run by an engine along with their parameters.
+    """
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self.queries: list[tuple[str, dict]] = []
+
+    def __enter__(self) -> "QueryCapture":
+        event.listen(
+            self.engine.sync_engine, "before_cursor_execute", self._capture
+        )
+        return self
+
+    def __exit__(self, *args) -> None:
+        event.remove(
+            self.engine.sync_engine, "before_cursor_execute", self._capture
+        )
+
+    def _capture(self, conn, cursor, statement, parameters, context, many):
+        self.queries.append((statement, parameters))
+
+
+async def get_used_indexes(
+    engine, statement: str, parameters: dict
+) -> set[str]:
+    async with engine.connect() as connection:
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar_one()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    indexes = set()
+    nodes = [plan[0]["Plan"]]
+
+    while nodes:
+        node = nodes.pop()
+
+        if "Index Name" in node:
+            indexes.add(node["Index Name"])
+
+        nodes.extend(node.get("Plans", []))
+
+    return indexes
+
+
+async def test_chat_history_page_uses_the_room_uuid_sent_at_id_index(
+    seeded_engine,
+):
+    async with AsyncSession(seeded_engine) as db:
+        room_uuid = await db.scalar(text("SELECT room_uuid FROM chat_rooms"))
+        repository = ChatHistoryRepository(db)
+
+        with QueryCapture(seeded_engine) as capture:
+            first_page = await repository.get_chat_history_page_by_room_uuid(
+                room_uuid, 51
+            )
+            await repository.get_chat_history_page_by_room_uuid(
+                room_uuid,
+                51,
+                (first_page[-1].sent_at, first_page[-1].id),
+            )
+
+    assert len(capture.queries) == 2
+
+    for statement, parameters in capture.queries:
+        assert "ix_chat_history_room_uuid_sent_at_id" in await get_used_indexes(
+            seeded_engine, statement, parameters
+        )
+
+
+async def test_chat_room_listing_uses_the_user_id_and_history_indexes(
+    seeded_engine,
+):
+    async with AsyncSession(seeded_engine) as db:
+        user_id = await db.scalar(text("SELECT min(id) FROM users"))
+        repository = ChatRoomRepository(db)
+
+        with QueryCapture(seeded_engine) as capture:
+            await repository.get_page_by_user_id(user_id, 11)
+            await repository.get_page_by_user_id(
+                user_id,
+                11,
+                (datetime.datetime.now(datetime.UTC), MAX_ROOM_UUID),
+            )
+
+    assert len(capture.queries) == 2
+
+    for statement, parameters in capture.queries:
+        assert {
+            "ix_chat_rooms_user_id",
+            "ix_chat_history_room_uuid_sent_at_id",
+        } <= await get_used_indexes(seeded_engine, statement, parameters)
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.config import settings
+from src.s3.service import S3Service
+from src.user.service import UserService
+
+
+USER_ID = 1
+PREVIOUS_AVATAR_KEY = "avatars/previous.png"
+AVATAR_KEY = "avatars/new.png"
+
+
+class FakeUserRepository:
+    """
+    Stands in for the users table with a single user.
+    """
+
+    def __init__(self, avatar: str | None) -> None:
+        self.avatar = avatar
+
+    async def get_one_with_selected_attributes_by_condition(
+        self, attributes, filter_attribute, filter_value
+    ):
+        return SimpleNamespace(avatar=self.avatar)
+
+    async def update_profile_by_id(self, user_id: int, payload: dict) -> None:
+        self.avatar = payload.get("avatar", self.avatar)
+
+
+@pytest.fixture
+def s3_service(s3_bucket) -> S3Service:
+    for key, user_id in ((PREVIOUS_AVATAR_KEY, USER_ID), (AVATAR_KEY, USER_ID)):
+        s3_bucket.put_object(
+            Bucket=settings.AWS_S3_BUCKET_NAME,
+            Key=key,
+            Body=b"avatar",
+            Metadata={"user-id": str(user_id)},
+        )
+
+    return S3Service()
+
+
+def get_keys(s3_bucket) -> set[str]:
+    objects = s3_bucket.list_objects_v2(Bucket=settings.AWS_S3_BUCKET_NAME)
+
+    return {s3_object["Key"] for s3_object in objects.get("Contents", [])}
+
+
+async def test_confirmed_avatar_is_saved_and_the_previous_one_is_deleted(
+    s3_bucket, s3_service
+):
+    repository = FakeUserRepository(
+        avatar=s3_service._get_file_url(PREVIOUS_AVATAR_KEY)
+    )
+    user_service = UserService(s3_service=s3_service, repository=repository)
+
+    response = await user_service.confirm_user_avatar_upload(
+        USER_ID, AVATAR_KEY
+    )
+
+    assert response.avatar == s3_service._get_file_url(AVATAR_KEY)
+    assert repository.avatar == response.avatar
+    assert get_keys(s3_bucket) == {AVATAR_KEY}
+
+
+async def test_confirming_the_current_avatar_again_keeps_it(
+    s3_bucket, s3_service
+):
+    repository = FakeUserRepository(avatar=s3_service._get_file_url(AVATAR_KEY))
+    user_service = UserService(s3_service=s3_service, repository=repository)
+
+    await user_service.confirm_user_avatar_upload(USER_ID, AVATAR_KEY)
+
+    assert repository.avatar == s3_service._get_file_url(AVATAR_KEY)
+    assert get_keys(s3_bucket) == {PREVIOUS_AVATAR_KEY, AVATAR_KEY}